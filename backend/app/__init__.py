@@ -5,21 +5,95 @@ from flask_cors import CORS
 from sqlalchemy import text
 from flasgger import Swagger
 
-from app.extensions import db, migrate, login_manager
+from app.extensions import db, migrate, login_manager, response_cache, bundle_cache, user_cache, replica_router, metrics, query_guard
 from app.routes import register_routes
-from app.models import User
+from app.cli import cms_cli
+from app.models import User, UserRole
 from app.swagger import swagger_template
+from app.utils.request_body import BodyError, LimitedRequest, check_body_limit
+from app.utils.db_pool import engine_options, init_pool_telemetry, pool_status
+from app.utils.auth import admin_required
 
 load_dotenv()
 
 
 def create_app():
     app = Flask(__name__)
+    app.request_class = LimitedRequest
 
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev-secret")
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+    # pool konekcija iz env-a (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    # DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS, DB_PGBOUNCER); vidi app/utils/db_pool.py
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+
+    # replike za čitanje (zarezom odvojeni URL-ovi); GET zahtevi čitaju sa njih, upisi idu na primarnu
+    app.config["DATABASE_REPLICA_URLS"] = os.getenv("DATABASE_REPLICA_URLS", "")
+    app.config["REPLICA_STICKY_SECONDS"] = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    app.config["REPLICA_MAX_LAG_SECONDS"] = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+    app.config["REPLICA_CHECK_INTERVAL"] = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
+
+    # "timestamp" (ETag iz updated_at, 304 bez učitavanja sadržaja) ili "hash" (ETag iz tela odgovora)
+    app.config["ETAG_MODE"] = os.getenv("ETAG_MODE", "timestamp")
+
+    # in-process LRU ne invalidira keš u drugim workerima, pa je sa više gunicorn workera
+    # podrazumevani backend deljeni FileBackend u CACHE_DIR (app.utils.cache:LRUBackend ga vraća)
+    workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+    shared_backend = "app.utils.cache:FileBackend" if workers > 1 else None
+    app.config["CACHE_DIR"] = os.getenv("CACHE_DIR") or None
+
+    # keš javnih (published) slug odgovora; RESPONSE_CACHE_BACKEND="modul:Klasa" za drugi backend
+    app.config["RESPONSE_CACHE_ENABLED"] = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+    app.config["RESPONSE_CACHE_MAX_ENTRIES"] = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+    app.config["RESPONSE_CACHE_TTL"] = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    app.config["RESPONSE_CACHE_BACKEND"] = os.getenv("RESPONSE_CACHE_BACKEND") or shared_backend
+
+    # keš render paketa (/api/sites/<slug>/bundle/<slug>) ispred tabele render_bundles
+    app.config["BUNDLE_CACHE_ENABLED"] = os.getenv("BUNDLE_CACHE_ENABLED", "1") == "1"
+    app.config["BUNDLE_CACHE_MAX_ENTRIES"] = int(os.getenv("BUNDLE_CACHE_MAX_ENTRIES", "2048"))
+    app.config["BUNDLE_CACHE_TTL"] = float(os.getenv("BUNDLE_CACHE_TTL", "60"))
+    app.config["BUNDLE_CACHE_BACKEND"] = os.getenv("BUNDLE_CACHE_BACKEND") or app.config["RESPONSE_CACHE_BACKEND"]
+
+    # sitemap.xml: apsolutni URL-ovi frontenda (inače host zahteva) i najviše URL-ova po fajlu
+    app.config["PUBLIC_BASE_URL"] = os.getenv("PUBLIC_BASE_URL") or None
+    app.config["SITEMAP_MAX_URLS"] = int(os.getenv("SITEMAP_MAX_URLS", "50000"))
+
+    # identitet i uloga ulogovanog korisnika, da user_loader ne čita bazu pri svakom zahtevu
+    app.config["USER_CACHE_ENABLED"] = os.getenv("USER_CACHE_ENABLED", "1") == "1"
+    app.config["USER_CACHE_TTL"] = float(os.getenv("USER_CACHE_TTL", "30"))
+    app.config["USER_CACHE_MAX_ENTRIES"] = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+    app.config["USER_CACHE_BACKEND"] = os.getenv("USER_CACHE_BACKEND") or shared_backend
+
+    # metrike po endpointu na /metrics (Prometheus); Server-Timing zaglavlje je opciono
+    app.config["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "1") == "1"
+    app.config["METRICS_SERVER_TIMING"] = os.getenv("METRICS_SERVER_TIMING", "0") == "1"
+    # privatan direktorijum gde workeri upisuju metrike, /metrics vraća njihov zbir (gunicorn.conf.py)
+    app.config["METRICS_DIR"] = os.getenv("METRICS_DIR") or None
+
+    # razvoj/testovi: "warn" loguje, "raise" obara zahtev kad endpoint pređe @query_budget ili ima N+1
+    app.config["QUERY_GUARD"] = os.getenv("QUERY_GUARD", "off")
+    app.config["QUERY_GUARD_N1_THRESHOLD"] = int(os.getenv("QUERY_GUARD_N1_THRESHOLD", "3"))
+
+    # najveći broj stavki u jednom /bulk zahtevu (veći uvoz se šalje u više zahteva)
+    app.config["BULK_MAX_ITEMS"] = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+    # granice za stablo blokova u content-u (proverava block_schema pri svakom upisu)
+    app.config["CONTENT_MAX_BLOCKS"] = int(os.getenv("CONTENT_MAX_BLOCKS", "500"))
+    app.config["CONTENT_MAX_DEPTH"] = int(os.getenv("CONTENT_MAX_DEPTH", "4"))
+    app.config["CONTENT_MAX_BYTES"] = int(os.getenv("CONTENT_MAX_BYTES", str(256 * 1024)))
+
+    # granice veličine tela zahteva; po endpointu važi ključ iz @body_limit (inače REQUEST_BODY_MAX_BYTES),
+    # i za Content-Length i dok se chunked telo čita (LimitedRequest); MAX_CONTENT_LENGTH je gornja granica za sve
+    app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", str(512 * 1024 * 1024)))
+    app.config["REQUEST_BODY_MAX_BYTES"] = int(os.getenv("REQUEST_BODY_MAX_BYTES", str(256 * 1024)))
+    app.config["CONTENT_BODY_MAX_BYTES"] = int(os.getenv("CONTENT_BODY_MAX_BYTES", str(1024 * 1024)))
+    app.config["BULK_BODY_MAX_BYTES"] = int(os.getenv("BULK_BODY_MAX_BYTES", str(16 * 1024 * 1024)))
+    app.config["IMPORT_MAX_BYTES"] = int(os.getenv("IMPORT_MAX_BYTES", str(512 * 1024 * 1024)))
+    app.config["JSON_MAX_DEPTH"] = int(os.getenv("JSON_MAX_DEPTH", "32"))
+    app.config["JSON_MAX_NODES"] = int(os.getenv("JSON_MAX_NODES", "100000"))
+
     app.config["SESSION_COOKIE_HTTPONLY"] = True
     app.config["SESSION_COOKIE_SAMESITE"] = os.getenv("COOKIE_SAMESITE", "Lax")
     app.config["SESSION_COOKIE_SECURE"] = os.getenv("COOKIE_SECURE", "0") == "1"
@@ -29,21 +103,44 @@ def create_app():
     Swagger(app, template=swagger_template())
 
     db.init_app(app)
+    init_pool_telemetry(app, db)
+    replica_router.init_app(app)
+    metrics.init_app(app)
+    query_guard.init_app(app)
     migrate.init_app(app, db)
+    response_cache.init_app(app)
+    bundle_cache.init_app(app)
+    user_cache.init_app(app, role_type=UserRole)
 
     login_manager.init_app(app)
     login_manager.login_view = None  
     login_manager.session_protection = "strong"
 
+    def fetch_user(user_id: int):
+        # rezultat ide u user_cache (uloga = autorizacija), pa se čita sa primarne
+        with replica_router.primary():
+            return db.session.get(User, user_id)
+
     @login_manager.user_loader
     def load_user(user_id: str):
-        return db.session.get(User, int(user_id))
+        return user_cache.load(int(user_id), fetch_user)
     
     @login_manager.unauthorized_handler
     def unauthorized():
         return jsonify({"error": "Unauthorized"}), 401
 
+    app.before_request(check_body_limit)
+
+    @app.errorhandler(BodyError)
+    def body_error(e):
+        return jsonify({"error": str(e)}), e.status
+
+    @app.errorhandler(413)
+    def request_too_large(e):
+        return jsonify({"error": "Request body too large"}), 413
+
     register_routes(app)
+    app.cli.add_command(cms_cli)
 
     @app.get("/health")
     def health():
@@ -58,4 +155,28 @@ def create_app():
         except Exception as e:
             return jsonify({"status": "error", "service": "db", "message": str(e)}), 500
 
+    @app.get("/health/db/pool")
+    def health_db_pool():
+        return jsonify({
+            "status": "ok",
+            "service": "db-pool",
+            "pool": pool_status(db.engine, app.extensions["pool_stats"]),
+        }), 200
+
+    @app.get("/health/db/replicas")
+    @admin_required
+    def health_db_replicas():
+        replica_router.refresh(force=True)
+        return jsonify({"status": "ok", "service": "db-replicas", **replica_router.status()}), 200
+
+    @app.get("/health/cache")
+    def health_cache():
+        return jsonify({
+            "status": "ok",
+            "service": "cache",
+            "responseCache": response_cache.stats(),
+            "bundleCache": bundle_cache.stats(),
+            "userCache": user_cache.stats(),
+        }), 200
+
     return app
\ No newline at end of file
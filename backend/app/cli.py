@@ -0,0 +1,59 @@
+import os
+
+import click
+from flask.cli import AppGroup
+
+from app.models import Site
+from app.utils import bundles, sitemap, stats, static_build
+
+
+cms_cli = AppGroup("cms", help="CMS maintenance commands.")
+
+
+@cms_cli.command("rebuild-stats")
+def rebuild_stats():
+    """Recompute dashboard counters (site_stats, stat_counters) from source tables."""
+    result = stats.rebuild()
+    click.echo(f"Rebuilt stats for {result['sites']} sites.")
+    for name, value in sorted(result["counters"].items()):
+        click.echo(f"  {name}: {value}")
+
+
+@cms_cli.command("build-bundles")
+@click.option("--site", "slug", default=None, help="Only this site (default: all sites).")
+def build_bundles(slug):
+    """Rebuild stored render bundles (render_bundles) for published pages and posts."""
+    site = None
+    if slug:
+        site = Site.query.filter_by(slug=slug).first()
+        if site is None:
+            raise click.ClickException(f"Site '{slug}' not found")
+    result = bundles.rebuild(site)
+    click.echo(f"Built {result['bundles']} bundles for {result['sites']} sites.")
+
+
+@cms_cli.command("rebuild-sitemaps")
+def rebuild_sitemaps():
+    """Recompute the sitemap index (sitemap_entries) from published pages and posts."""
+    result = sitemap.rebuild()
+    click.echo(f"Rebuilt sitemaps for {result['sites']} sites.")
+
+
+@cms_cli.command("build-site")
+@click.argument("slug")
+@click.option("--out", "out_dir", default=None, help="Output directory (default: build/<slug>).")
+@click.option("--workers", type=int, default=None, help="Render processes (default: CPU count, 1 = no pool).")
+@click.option("--force", is_flag=True, help="Ignore the manifest and re-render everything.")
+def build_site(slug, out_dir, workers, force):
+    """Pre-render published pages and posts of a site to static HTML."""
+    site = Site.query.filter_by(slug=slug).first()
+    if site is None:
+        raise click.ClickException(f"Site '{slug}' not found")
+
+    out_dir = out_dir or os.path.join("build", site.slug)
+    result = static_build.build_site(site, out_dir, workers=workers, force=force)
+    click.echo(
+        f"Built {site.slug} -> {out_dir}: {result['items']} items, "
+        f"{result['rendered']} rendered ({result['written']} written), "
+        f"{result['unchanged']} unchanged, {result['removed']} removed in {result['seconds']}s."
+    )
@@ -1,12 +1,17 @@
 import enum
+from datetime import datetime
+
 from flask import request, jsonify
-from sqlalchemy import func
 
-from app.extensions import db
+from app.extensions import db, user_cache
 from flask_login import current_user
 
-from app.models import User, UserRole, Site, Page, Post
+from app.models import User, UserRole, Site, SiteStat, StatCounter
+from app.utils import stats
 from app.utils.auth import admin_required
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT, CursorError, decode_token, encode_token, sort_key
+from app.utils.planner import estimated_count
+from app.utils.query_guard import query_budget
 
 
 def _user_to_dict(u: User):
@@ -97,13 +102,46 @@ def set_user_role(user_id: int):
     if current_user.is_authenticated and current_user.id == u.id and next_role != UserRole.ADMIN:
         return jsonify({"error": "You cannot remove your own admin role."}), 400
 
+    stats.user_role_changed(u.role, next_role)
     u.role = next_role  
     db.session.commit()
+    user_cache.invalidate(u.id)
 
     return jsonify({"message": "Role updated", "user": _user_to_dict(u)}), 200
 
 
+# sort -> (kolona, opadajuće); keyset kursor je (vrednost kolone, id)
+USER_SORTS = {
+    "createdAt_desc": (User.created_at, True),
+    "createdAt_asc": (User.created_at, False),
+    "name_asc": (User.name, False),
+    "name_desc": (User.name, True),
+}
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _user_cursor(u: User, column):
+    value = getattr(u, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_token([value, u.id])
+
+
+def _decode_user_cursor(raw: str, column):
+    try:
+        value, row_id = decode_token(raw)
+        if column is User.created_at:
+            value = datetime.fromisoformat(value)
+        return value, int(row_id)
+    except (TypeError, ValueError):
+        raise CursorError("Invalid cursor")
+
+
 @admin_required
+@query_budget(3)
 def list_users():
     """
     List users (admin)
@@ -117,7 +155,14 @@ def list_users():
         name: q
         type: string
         required: false
-        description: Search by name/email (contains)
+        description: Search by name/email
+      - in: query
+        name: mode
+        type: string
+        required: false
+        enum: ["contains", "prefix"]
+        default: "contains"
+        description: prefix = typeahead (name or email starts with q)
       - in: query
         name: role
         type: string
@@ -129,6 +174,16 @@ def list_users():
         required: false
         enum: ["createdAt_desc", "createdAt_asc", "name_asc", "name_desc"]
         default: "createdAt_desc"
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: nextCursor from the previous response (same q/mode/role/sort)
     responses:
       200:
         description: Users list
@@ -139,6 +194,14 @@ def list_users():
               type: array
               items:
                 $ref: '#/definitions/UserPublic'
+            nextCursor:
+              type: string
+            estimatedTotal:
+              type: integer
+              description: Planner row estimate for the filter (null when unavailable)
+      400:
+        description: Invalid cursor
+        schema: { $ref: '#/definitions/Error' }
       401:
         description: Not authenticated
         schema: { $ref: '#/definitions/Error' }
@@ -147,17 +210,25 @@ def list_users():
         schema: { $ref: '#/definitions/Error' }
     """
     q = (request.args.get("q") or "").strip()
+    mode = (request.args.get("mode") or "contains").strip().lower()
     role = (request.args.get("role") or "").strip().lower()
     sort = (request.args.get("sort") or "createdAt_desc").strip()
+    limit = max(1, min(request.args.get("limit", type=int) or DEFAULT_LIMIT, MAX_LIMIT))
+    raw_cursor = (request.args.get("cursor") or "").strip()
+
+    column, descending = USER_SORTS.get(sort, USER_SORTS["createdAt_desc"])
 
     query = User.query
 
     if q:
-        like = f"%{q}%"
+        # ILIKE koristi GIN trigram indekse (pg_trgm) i za '%q%' i za 'q%'
+        pattern = _like_escape(q) + "%"
+        if mode != "prefix":
+            pattern = "%" + pattern
         query = query.filter(
             db.or_(
-                User.name.ilike(like),
-                User.email.ilike(like),
+                User.name.ilike(pattern, escape="\\"),
+                User.email.ilike(pattern, escape="\\"),
             )
         )
 
@@ -165,20 +236,37 @@ def list_users():
         target = UserRole.ADMIN if role == "admin" else UserRole.USER
         query = query.filter(User.role == target)
 
-    if sort == "createdAt_asc":
-        query = query.order_by(User.created_at.asc())
-    elif sort == "name_asc":
-        query = query.order_by(User.name.asc())
-    elif sort == "name_desc":
-        query = query.order_by(User.name.desc())
+    estimated_total = estimated_count(query) if not raw_cursor else None
+
+    if raw_cursor:
+        try:
+            cursor = _decode_user_cursor(raw_cursor, column)
+        except CursorError as e:
+            return jsonify({"error": str(e)}), 400
+        key = db.tuple_(sort_key(column), User.id)
+        after = db.tuple_(sort_key(column, cursor[0]), cursor[1])
+        query = query.filter(key < after if descending else key > after)
+
+    if descending:
+        query = query.order_by(sort_key(column).desc(), User.id.desc())
     else:
-        query = query.order_by(User.created_at.desc())
+        query = query.order_by(sort_key(column).asc(), User.id.asc())
 
-    users = query.all()
-    return jsonify({"users": [_user_to_dict(u) for u in users]}), 200
+    users = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = _user_cursor(users[-1], column)
+
+    return jsonify({
+        "users": [_user_to_dict(u) for u in users],
+        "nextCursor": next_cursor,
+        "estimatedTotal": estimated_total,
+    }), 200
 
 
 @admin_required
+@query_budget(3)
 def overview():
     """
     Admin overview (dashboard stats)
@@ -199,56 +287,42 @@ def overview():
         description: Forbidden (not admin)
         schema: { $ref: '#/definitions/Error' }
     """
-    total_users = db.session.query(func.count(User.id)).scalar() or 0
-    total_sites = db.session.query(func.count(Site.id)).scalar() or 0
-    total_pages = db.session.query(func.count(Page.id)).scalar() or 0
-    total_posts = db.session.query(func.count(Post.id)).scalar() or 0
-
-    users_by_role_rows = (
-        db.session.query(User.role, func.count(User.id))
-        .group_by(User.role)
-        .all()
-    )
-    users_by_role = [
-        {
-            "role": (r.value if hasattr(r, "value") else str(r)),
-            "count": int(c),
+    # brojači se održavaju pri svakom upisu (app/utils/stats.py),
+    # pa overview čita nekoliko redova bez obzira na količinu podataka
+    counters = {c.name: int(c.value) for c in StatCounter.query.all()}
+
+    def by_prefix(prefix):
+        return {
+            name[len(prefix):]: value
+            for name, value in counters.items()
+            if name.startswith(prefix) and value > 0
         }
-        for r, c in users_by_role_rows
-    ]
 
-    pages_by_status_rows = (
-        db.session.query(Page.status, func.count(Page.id))
-        .group_by(Page.status)
-        .all()
-    )
-    pages_by_status = [{"status": s, "count": int(c)} for s, c in pages_by_status_rows]
+    users = by_prefix("users:")
+    pages = by_prefix("pages:")
+    posts = by_prefix("posts:")
 
-    posts_by_status_rows = (
-        db.session.query(Post.status, func.count(Post.id))
-        .group_by(Post.status)
-        .all()
-    )
-    posts_by_status = [{"status": s, "count": int(c)} for s, c in posts_by_status_rows]
+    total_users = sum(users.values())
+    total_sites = counters.get("sites", 0)
+    total_pages = sum(pages.values())
+    total_posts = sum(posts.values())
+
+    users_by_role = [{"role": r, "count": c} for r, c in users.items()]
+    pages_by_status = [{"status": s, "count": c} for s, c in pages.items()]
+    posts_by_status = [{"status": s, "count": c} for s, c in posts.items()]
 
     top_sites_rows = (
-        db.session.query(
-            Site.id,
-            Site.name,
-            Site.slug,
-            func.count(func.distinct(Page.id)).label("pagesCount"),
-            func.count(func.distinct(Post.id)).label("postsCount"),
-        )
-        .outerjoin(Page, Page.site_id == Site.id)
-        .outerjoin(Post, Post.site_id == Site.id)
-        .group_by(Site.id)
-        .order_by((func.count(func.distinct(Page.id)) + func.count(func.distinct(Post.id))).desc())
+        db.session.query(Site.id, Site.name, Site.slug, SiteStat)
+        .join(SiteStat, SiteStat.site_id == Site.id)
+        .order_by(SiteStat.total.desc())
         .limit(5)
         .all()
     )
 
     top_sites = []
-    for sid, name, slug, pc, poc in top_sites_rows:
+    for sid, name, slug, stat in top_sites_rows:
+        pc = stat.pages_draft + stat.pages_published
+        poc = stat.posts_draft + stat.posts_published
         top_sites.append(
             {
                 "siteId": sid,
@@ -3,8 +3,9 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from email_validator import validate_email, EmailNotValidError
 from flask_login import login_user, logout_user, current_user
 
-from app.extensions import db
+from app.extensions import db, user_cache
 from app.models import User, UserRole
+from app.utils import stats
 
 
 def register():
@@ -62,6 +63,7 @@ def register():
     )
 
     db.session.add(user)
+    stats.user_created(user.role)
     db.session.commit()
 
     login_user(user)
@@ -144,6 +146,7 @@ def logout():
             message: { type: string }
     """
     if current_user.is_authenticated:
+        user_cache.invalidate(current_user.id)
         logout_user()
     return jsonify({"message": "Logged out."}), 200
 
@@ -0,0 +1,70 @@
+from flask import Response, request, jsonify
+
+from app.extensions import bundle_cache
+from app.utils import bundles
+from app.utils.http_cache import precondition, conditional
+from app.utils.query_guard import query_budget
+
+
+def _respond(kind: str, item_id: int, version, body: str):
+    etag_kind = f"bundle-{kind}"
+    return precondition(etag_kind, item_id, version) or conditional(
+        Response(body, mimetype="application/json"), etag_kind, item_id, version
+    )
+
+
+@query_budget(3)
+def get_bundle(site_slug: str, slug: str):
+    """
+    Render bundle: published page or post with its template and site config
+    ---
+    tags:
+      - Sites
+    parameters:
+      - in: path
+        name: site_slug
+        required: true
+        type: string
+      - in: path
+        name: slug
+        required: true
+        type: string
+      - in: query
+        name: kind
+        type: string
+        required: false
+        enum: ["page", "post"]
+        description: Defaults to page
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+    responses:
+      200:
+        description: Precomputed bundle (stored in render_bundles, served from cache when possible)
+        schema: { $ref: '#/definitions/RenderBundle' }
+      304:
+        description: Not modified
+      400:
+        description: Invalid kind
+        schema: { $ref: '#/definitions/Error' }
+      404:
+        description: Site or published item not found
+        schema: { $ref: '#/definitions/Error' }
+    """
+    kind = (request.args.get("kind") or "page").strip().lower()
+    if kind not in bundles.KINDS:
+        return jsonify({"error": "Invalid kind. Allowed: ['page', 'post']"}), 400
+
+    cached = bundle_cache.get(kind, site_slug, slug)
+    if cached:
+        return _respond(kind, *cached)
+
+    # sačuvan paket (jedan upit), inače se pravi iz stavke/šablona/sajta i upisuje
+    bundle = bundles.lookup(site_slug, kind, slug) or bundles.build(site_slug, kind, slug)
+    if bundle is None:
+        return jsonify({"error": "Not found"}), 404
+
+    item_id, version, body = bundle
+    bundle_cache.set(kind, site_slug, slug, (item_id, version, body))
+    return _respond(kind, item_id, version, body)
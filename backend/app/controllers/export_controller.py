@@ -0,0 +1,141 @@
+from flask import Response, current_app, request, jsonify, stream_with_context
+from flask_login import current_user
+
+from app.extensions import db
+from app.models import Site
+from app.utils.auth import admin_required
+from app.utils.content_events import content_changed
+from app.utils.request_body import body_limit
+from app.utils.serializers import site_to_dict
+from app.utils.site_transfer import TransferError, export_records, import_records, ndjson_chunks, ndjson_lines
+
+
+@admin_required
+def export_site(site_id: int):
+    """
+    Export site as NDJSON (admin)
+    ---
+    tags:
+      - Sites
+    security:
+      - cookieAuth: []
+    produces:
+      - application/x-ndjson
+      - application/gzip
+    parameters:
+      - in: path
+        name: site_id
+        required: true
+        type: integer
+      - in: query
+        name: gzip
+        type: integer
+        enum: [0, 1]
+        required: false
+        description: 1 = gzip compressed download (.ndjson.gz)
+    responses:
+      200:
+        description: >
+          One JSON object per line. First {"type":"site"}, then {"type":"template"} for every template
+          used by the site, then {"type":"page"} and {"type":"post"} records. Streamed with constant memory.
+      401:
+        schema: { $ref: '#/definitions/Error' }
+      403:
+        schema: { $ref: '#/definitions/Error' }
+      404:
+        description: Site not found
+        schema: { $ref: '#/definitions/Error' }
+    """
+    site = db.session.get(Site, site_id)
+    if not site:
+        return jsonify({"error": "Site not found"}), 404
+
+    compress = request.args.get("gzip", default=0, type=int) == 1
+    filename = f"site-{site.slug}.ndjson" + (".gz" if compress else "")
+
+    resp = Response(
+        stream_with_context(ndjson_chunks(export_records(site), compress)),
+        mimetype="application/gzip" if compress else "application/x-ndjson",
+    )
+    resp.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return resp
+
+
+@admin_required
+@body_limit("IMPORT_MAX_BYTES")
+def import_site():
+    """
+    Import site from NDJSON (admin)
+    ---
+    tags:
+      - Sites
+    security:
+      - cookieAuth: []
+    consumes:
+      - application/x-ndjson
+      - application/gzip
+    parameters:
+      - in: query
+        name: slug
+        type: string
+        required: false
+        description: Import under a different site slug
+      - in: body
+        name: body
+        required: true
+        description: >
+          Output of GET /api/sites/{site_id}/export. Gzip is accepted with
+          Content-Type application/gzip or Content-Encoding gzip.
+        schema:
+          type: string
+    responses:
+      201:
+        description: Imported
+        schema:
+          type: object
+          properties:
+            message: { type: string }
+            site: { $ref: '#/definitions/Site' }
+            imported:
+              type: object
+              properties:
+                pages: { type: integer }
+                posts: { type: integer }
+      400:
+        description: Invalid NDJSON record
+        schema: { $ref: '#/definitions/Error' }
+      401:
+        schema: { $ref: '#/definitions/Error' }
+      403:
+        schema: { $ref: '#/definitions/Error' }
+      409:
+        description: Site slug already exists / duplicate slug in file
+        schema: { $ref: '#/definitions/Error' }
+    """
+    compressed = (
+        request.mimetype == "application/gzip"
+        or request.headers.get("Content-Encoding", "").lower() == "gzip"
+    )
+
+    try:
+        site, totals = import_records(
+            ndjson_lines(request.stream, compressed, current_app.config.get("CONTENT_BODY_MAX_BYTES")),
+            current_user.id,
+            request.args.get("slug", type=str),
+        )
+        db.session.commit()
+    except TransferError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), e.status
+    except (OSError, EOFError):
+        db.session.rollback()
+        return jsonify({"error": "Invalid gzip stream"}), 400
+
+    for kind in ("page", "post"):
+        content_changed(kind, site.id)
+
+    return jsonify({
+        "message": "Site imported",
+        "site": site_to_dict(site),
+        "imported": {"pages": totals["page"], "posts": totals["post"]},
+    }), 201
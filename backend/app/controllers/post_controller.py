@@ -1,33 +1,82 @@
 import re
-import json
-from flask import request, jsonify
+from flask import Response, request, jsonify
 from flask_login import current_user
 
-from app.extensions import db
+from app.extensions import db, replica_router, response_cache
 from app.models import Post, Site, Template, UserRole
+from app.utils.pagination import page_args, keyset_page, CursorError
+from app.utils.projection import parse_fields, load_fields, project, FieldsError
+from app.utils.expand import (
+    ExpandError, parse_expand, expand_options, expand_columns, expanded, expanded_version, etag_kind,
+)
+from app.utils.content_queries import has_block_type
+from app.utils.json_response import RawJSON, EMPTY_BLOCK_TREE, json_response, stream_list
+from app.utils.http_cache import precondition, conditional
+from app.utils.content_events import content_changed
+from app.utils.block_schema import ContentError, validate_content
+from app.utils.request_body import body_limit, read_json
+from app.utils import stats, bulk
 from app.utils.auth import login_required_json
+from app.utils.query_guard import query_budget
 
 
 ALLOWED_STATUS = {"draft", "published"}
 
+POST_FIELDS = {
+    "id": "id",
+    "siteId": "site_id",
+    "templateId": "template_id",
+    "authorId": "author_id",
+    "title": "title",
+    "slug": "slug",
+    "content": "content_text",
+    "status": "status",
+    "createdAt": "created_at",
+    "updatedAt": "updated_at",
+}
+
 def _slugify(value: str) -> str:
     value = (value or "").strip().lower()
     value = re.sub(r"[^a-z0-9]+", "-", value)
     return value.strip("-")
 
-def _post_to_dict(p: Post):
-    return {
+def _post_to_dict(p: Post, fields=None, expand=()):
+    if fields is not None:
+        data = project(p, POST_FIELDS, fields)
+        if "content" in data:
+            data["content"] = RawJSON(p.content_text or EMPTY_BLOCK_TREE)
+        data.update(expanded(p, expand))
+        return data
+
+    data = {
         "id": p.id,
         "siteId": p.site_id,
         "templateId": p.template_id,
         "authorId": p.author_id,
         "title": p.title,
         "slug": p.slug,
-        "content": json.loads(p.content) if p.content else {"version": 1, "blocks": []},
+        "content": RawJSON(p.content_text or EMPTY_BLOCK_TREE),
         "status": p.status,
         "createdAt": p.created_at.isoformat() if p.created_at else None,
         "updatedAt": p.updated_at.isoformat() if p.updated_at else None,
     }
+    data.update(expanded(p, expand))
+    return data
+
+def _expanded_response(q, expand):
+    """
+    ?expand=: stavka i veze u jednom upitu (joinedload). ETag prati i izmene veza,
+    pa se 304 proverava tek posle učitavanja.
+    """
+    p = q.options(*expand_options(Post, expand, many=False)).first()
+    if not p:
+        return jsonify({"error": "Post not found"}), 404
+
+    kind = etag_kind("post", expand)
+    version = expanded_version(p, expand)
+    return precondition(kind, p.id, version) or conditional(
+        json_response({"post": _post_to_dict(p, expand=expand)}, 200), kind, p.id, version
+    )
 
 def _can_edit(post: Post) -> bool:
     if not current_user.is_authenticated:
@@ -37,6 +86,7 @@ def _can_edit(post: Post) -> bool:
     return current_user.id == post.author_id
 
 
+@query_budget(2, per_expand=1)
 def list_posts():
     """
     List posts
@@ -44,6 +94,11 @@ def list_posts():
     tags:
       - Posts
     parameters:
+      - in: query
+        name: expand
+        type: string
+        required: false
+        description: Comma separated related objects to embed (site, template, author), loaded in the same request
       - in: query
         name: siteId
         type: integer
@@ -57,15 +112,45 @@ def list_posts():
         type: string
         required: false
         enum: ["draft", "published"]
+      - in: query
+        name: blockType
+        type: string
+        required: false
+        description: Only items whose content contains a block of this type (e.g. "hero")
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (max 200). Enables cursor pagination.
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: nextCursor from the previous response
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma separated list of fields to return (e.g. "title,slug,status")
+      - in: query
+        name: view
+        type: string
+        required: false
+        enum: ["full", "summary"]
+        description: summary returns every field except content
     responses:
       200:
         description: Posts list
         schema:
           $ref: '#/definitions/PostsListResponse'
+      400:
+        description: Invalid cursor, fields, view or expand
+        schema: { $ref: '#/definitions/Error' }
     """
     site_id = request.args.get("siteId", type=int)
     author_id = request.args.get("authorId", type=int)
     status = request.args.get("status", type=str)
+    block_type = (request.args.get("blockType") or "").strip()
 
     q = Post.query
     if site_id:
@@ -74,11 +159,26 @@ def list_posts():
         q = q.filter(Post.author_id == author_id)
     if status:
         q = q.filter(Post.status == status)
+    if block_type:
+        q = q.filter(has_block_type(Post, block_type))
+
+    try:
+        limit, cursor = page_args()
+        fields = parse_fields(POST_FIELDS)
+        expand = parse_expand()
+    except (CursorError, FieldsError, ExpandError) as e:
+        return jsonify({"error": str(e)}), 400
 
-    posts = q.order_by(Post.created_at.desc()).all()
-    return jsonify({"posts": [_post_to_dict(p) for p in posts]}), 200
+    if fields is not None:
+        q = q.options(load_fields(Post, POST_FIELDS, fields, extra=expand_columns(Post, expand)))
+    if expand:
+        q = q.options(*expand_options(Post, expand, many=True))
 
+    posts, next_cursor = keyset_page(q, Post, limit, cursor)
+    return stream_list("posts", posts, lambda p: _post_to_dict(p, fields, expand), extra={"nextCursor": next_cursor})
 
+
+@query_budget(2)
 def get_post(post_id: int):
     """
     Get post by id
@@ -86,10 +186,23 @@ def get_post(post_id: int):
     tags:
       - Posts
     parameters:
+      - in: query
+        name: expand
+        type: string
+        required: false
+        description: Comma separated related objects to embed (site, template, author), loaded in the same request
       - in: path
         name: post_id
         required: true
         type: integer
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+      - in: header
+        name: If-Modified-Since
+        type: string
+        required: false
     responses:
       200:
         description: Post
@@ -98,16 +211,35 @@ def get_post(post_id: int):
           properties:
             post:
               $ref: '#/definitions/Post'
+      304:
+        description: Not modified (If-None-Match / If-Modified-Since)
+      400:
+        description: Unknown expand
+        schema: { $ref: '#/definitions/Error' }
       404:
         description: Post not found
         schema: { $ref: '#/definitions/Error' }
     """
-    p = db.session.get(Post, post_id)
-    if not p:
+    try:
+        expand = parse_expand()
+    except ExpandError as e:
+        return jsonify({"error": str(e)}), 400
+    if expand:
+        return _expanded_response(Post.query.filter(Post.id == post_id), expand)
+
+    meta = db.session.query(Post.id, Post.updated_at).filter(Post.id == post_id).first()
+    if not meta:
         return jsonify({"error": "Post not found"}), 404
-    return jsonify({"post": _post_to_dict(p)}), 200
 
+    not_modified = precondition("post", meta.id, meta.updated_at)
+    if not_modified:
+        return not_modified
 
+    p = db.session.get(Post, post_id)
+    return conditional(json_response({"post": _post_to_dict(p)}, 200), "post", p.id, p.updated_at)
+
+
+@query_budget(2)
 def get_post_by_slug(site_id: int, slug: str):
     """
     Get post by site + slug
@@ -115,6 +247,11 @@ def get_post_by_slug(site_id: int, slug: str):
     tags:
       - Posts
     parameters:
+      - in: query
+        name: expand
+        type: string
+        required: false
+        description: Comma separated related objects to embed (site, template, author), loaded in the same request
       - in: path
         name: site_id
         required: true
@@ -123,6 +260,14 @@ def get_post_by_slug(site_id: int, slug: str):
         name: slug
         required: true
         type: string
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+      - in: header
+        name: If-Modified-Since
+        type: string
+        required: false
     responses:
       200:
         description: Post
@@ -131,18 +276,51 @@ def get_post_by_slug(site_id: int, slug: str):
           properties:
             post:
               $ref: '#/definitions/Post'
+      304:
+        description: Not modified (If-None-Match / If-Modified-Since)
+      400:
+        description: Unknown expand
+        schema: { $ref: '#/definitions/Error' }
       404:
         description: Post not found
         schema: { $ref: '#/definitions/Error' }
     """
     slug = _slugify(slug)
-    p = Post.query.filter_by(site_id=site_id, slug=slug).first()
-    if not p:
-        return jsonify({"error": "Post not found"}), 404
-    return jsonify({"post": _post_to_dict(p)}), 200
+
+    try:
+        expand = parse_expand()
+    except ExpandError as e:
+        return jsonify({"error": str(e)}), 400
+    if expand:
+        # prošireni odgovori ne idu u response_cache: zavise i od sajta/šablona/autora
+        return _expanded_response(Post.query.filter_by(site_id=site_id, slug=slug), expand)
+
+    cached = response_cache.get("post", site_id, slug)
+    if cached:
+        post_id, updated_at, body = cached
+        return precondition("post", post_id, updated_at) or conditional(
+            Response(body, mimetype="application/json"), "post", post_id, updated_at
+        )
+
+    # promašaj puni response_cache, pa se čita sa primarne (ne sa replike koja kasni)
+    with replica_router.primary():
+        meta = db.session.query(Post.id, Post.updated_at).filter_by(site_id=site_id, slug=slug).first()
+        if not meta:
+            return jsonify({"error": "Post not found"}), 404
+
+        not_modified = precondition("post", meta.id, meta.updated_at)
+        if not_modified:
+            return not_modified
+
+        p = db.session.get(Post, meta.id)
+    resp = json_response({"post": _post_to_dict(p)}, 200)
+    if p.status == "published":
+        response_cache.set("post", site_id, slug, (p.id, p.updated_at, resp.get_data(as_text=True)))
+    return conditional(resp, "post", p.id, p.updated_at)
 
 
 @login_required_json
+@body_limit("CONTENT_BODY_MAX_BYTES")
 def create_post():
     """
     Create post (auth)
@@ -190,7 +368,7 @@ def create_post():
         description: Slug already exists for this site
         schema: { $ref: '#/definitions/Error' }
     """
-    data = request.get_json(silent=True) or {}
+    data = read_json() or {}
 
     site_id = data.get("siteId")
     title = (data.get("title") or "").strip()
@@ -218,16 +396,17 @@ def create_post():
     if status not in ALLOWED_STATUS:
         return jsonify({"error": f"Invalid status. Allowed: {sorted(ALLOWED_STATUS)}"}), 400
 
-    if template_id is not None and not db.session.get(Template, int(template_id)):
+    template = db.session.get(Template, int(template_id)) if template_id is not None else None
+    if template_id is not None and not template:
         return jsonify({"error": "Template not found"}), 404
 
     if content is None:
         content = {"version": 1, "blocks": []}
 
-    if not isinstance(content, dict) or "blocks" not in content:
-        return jsonify({"error": "content must be an object with 'version' and 'blocks'"}), 400
-    if not isinstance(content.get("blocks"), list):
-        return jsonify({"error": "content.blocks must be a list"}), 400
+    try:
+        validate_content(content, template.id if template else None, template.updated_at if template else None)
+    except ContentError as e:
+        return jsonify({"error": str(e)}), 400
 
     exists = Post.query.filter_by(site_id=int(site_id), slug=slug).first()
     if exists:
@@ -239,16 +418,19 @@ def create_post():
         author_id=current_user.id,
         title=title,
         slug=slug,
-        content=json.dumps(content),
+        content=content,
         status=status,
     )
 
     db.session.add(p)
+    stats.content_created("post", p.site_id, p.status)
     db.session.commit()
-    return jsonify({"message": "Post created", "post": _post_to_dict(p)}), 201
+    content_changed("post", p.site_id, p.slug)
+    return json_response({"message": "Post created", "post": _post_to_dict(p)}, 201)
 
 
 @login_required_json
+@body_limit("CONTENT_BODY_MAX_BYTES")
 def update_post(post_id: int):
     """
     Update post (auth; author or admin)
@@ -310,7 +492,8 @@ def update_post(post_id: int):
     if not _can_edit(p):
         return jsonify({"error": "Forbidden"}), 403
 
-    data = request.get_json(silent=True) or {}
+    data = read_json() or {}
+    old_slug = p.slug
 
     if "title" in data:
         new_title = (data.get("title") or "").strip()
@@ -327,31 +510,36 @@ def update_post(post_id: int):
             return jsonify({"error": "Slug already exists for this site"}), 409
         p.slug = new_slug
 
+    template = None
     if "templateId" in data:
         tid = data.get("templateId")
         if tid is None:
             p.template_id = None
         else:
-            if not db.session.get(Template, int(tid)):
+            template = db.session.get(Template, int(tid))
+            if not template:
                 return jsonify({"error": "Template not found"}), 404
-            p.template_id = int(tid)
+            p.template_id = template.id
 
     if "status" in data:
         st = (data.get("status") or "").strip().lower()
         if st not in ALLOWED_STATUS:
             return jsonify({"error": f"Invalid status. Allowed: {sorted(ALLOWED_STATUS)}"}), 400
+        stats.content_status_changed("post", p.site_id, p.status, st)
         p.status = st
 
     if "content" in data:
         content = data.get("content")
-        if not isinstance(content, dict) or "blocks" not in content:
-            return jsonify({"error": "content must be an object with 'version' and 'blocks'"}), 400
-        if not isinstance(content.get("blocks"), list):
-            return jsonify({"error": "content.blocks must be a list"}), 400
-        p.content = json.dumps(content)
+        try:
+            # bez novog šablona u zahtevu verzija trenutnog se čita iz baze
+            validate_content(content, p.template_id, template.updated_at if template else None)
+        except ContentError as e:
+            return jsonify({"error": str(e)}), 400
+        p.content = content
 
     db.session.commit()
-    return jsonify({"message": "Post updated", "post": _post_to_dict(p)}), 200
+    content_changed("post", p.site_id, old_slug, p.slug)
+    return json_response({"message": "Post updated", "post": _post_to_dict(p)}, 200)
 
 
 @login_required_json
@@ -392,6 +580,167 @@ def delete_post(post_id: int):
     if not _can_edit(p):
         return jsonify({"error": "Forbidden"}), 403
 
+    site_id, slug = p.site_id, p.slug
     db.session.delete(p)
+    stats.content_deleted("post", site_id, p.status)
     db.session.commit()
+    content_changed("post", site_id, slug)
     return jsonify({"message": "Post deleted"}), 200
+
+
+@login_required_json
+@body_limit("BULK_BODY_MAX_BYTES")
+def bulk_create_posts():
+    """
+    Bulk create posts (auth)
+    ---
+    tags:
+      - Posts
+    security:
+      - cookieAuth: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required: [items]
+          properties:
+            items:
+              type: array
+              description: Same fields as POST /api/posts (max BULK_MAX_ITEMS per request)
+              items:
+                type: object
+                properties:
+                  siteId: { type: integer, example: 1 }
+                  title: { type: string, example: "Imported post" }
+                  slug: { type: string }
+                  templateId: { type: integer }
+                  status: { type: string, enum: ["draft", "published"] }
+                  content: { $ref: '#/definitions/BlockTree' }
+    responses:
+      200:
+        description: Per-item results (status 201 created, 400/404/409 rejected)
+        schema: { $ref: '#/definitions/BulkResponse' }
+      400:
+        description: items missing
+        schema: { $ref: '#/definitions/Error' }
+      401:
+        description: Unauthorized
+        schema: { $ref: '#/definitions/Error' }
+      409:
+        description: Concurrent slug conflict, nothing was created
+        schema: { $ref: '#/definitions/Error' }
+      413:
+        description: Too many items
+        schema: { $ref: '#/definitions/Error' }
+    """
+    data = read_json() or {}
+    try:
+        results = bulk.bulk_create(Post, "post", data.get("items"), {"author_id": current_user.id})
+    except bulk.BulkError as e:
+        return jsonify({"error": str(e)}), e.status
+    return jsonify(bulk.summarize(results)), 200
+
+
+@login_required_json
+@body_limit("BULK_BODY_MAX_BYTES")
+def bulk_update_posts():
+    """
+    Bulk update posts (auth; author or admin per item)
+    ---
+    tags:
+      - Posts
+    security:
+      - cookieAuth: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required: [items]
+          properties:
+            items:
+              type: array
+              description: Each item has an id plus the fields of PUT /api/posts/{post_id}
+              items:
+                type: object
+                required: [id]
+                properties:
+                  id: { type: integer, example: 1 }
+                  title: { type: string }
+                  slug: { type: string }
+                  templateId: { type: ["integer", "null"] }
+                  status: { type: string, enum: ["draft", "published"] }
+                  content: { $ref: '#/definitions/BlockTree' }
+    responses:
+      200:
+        description: Per-item results (status 200 updated, 400/403/404/409 rejected)
+        schema: { $ref: '#/definitions/BulkResponse' }
+      400:
+        description: items missing
+        schema: { $ref: '#/definitions/Error' }
+      401:
+        description: Unauthorized
+        schema: { $ref: '#/definitions/Error' }
+      409:
+        description: Concurrent slug conflict, nothing was updated
+        schema: { $ref: '#/definitions/Error' }
+      413:
+        description: Too many items
+        schema: { $ref: '#/definitions/Error' }
+    """
+    data = read_json() or {}
+    try:
+        results = bulk.bulk_update(Post, "post", data.get("items"), _can_edit)
+    except bulk.BulkError as e:
+        return jsonify({"error": str(e)}), e.status
+    return jsonify(bulk.summarize(results)), 200
+
+
+@login_required_json
+def bulk_delete_posts():
+    """
+    Bulk delete posts (auth; author or admin per item)
+    ---
+    tags:
+      - Posts
+    security:
+      - cookieAuth: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required: [ids]
+          properties:
+            ids:
+              type: array
+              items: { type: integer }
+              example: [1, 2, 3]
+    responses:
+      200:
+        description: Per-item results (status 200 deleted, 403/404 rejected)
+        schema: { $ref: '#/definitions/BulkResponse' }
+      400:
+        description: ids missing
+        schema: { $ref: '#/definitions/Error' }
+      401:
+        description: Unauthorized
+        schema: { $ref: '#/definitions/Error' }
+      413:
+        description: Too many ids
+        schema: { $ref: '#/definitions/Error' }
+    """
+    data = read_json() or {}
+    try:
+        results = bulk.bulk_delete(
+            Post, "post", data.get("ids"), "author_id",
+            is_admin=current_user.role == UserRole.ADMIN,
+            user_id=current_user.id,
+        )
+    except bulk.BulkError as e:
+        return jsonify({"error": str(e)}), e.status
+    return jsonify(bulk.summarize(results)), 200
@@ -0,0 +1,99 @@
+from flask import Response, request, jsonify
+from flask_login import current_user
+from sqlalchemy.orm import undefer
+
+from app.extensions import db
+from app.models import Site, Page, Post, UserRole
+from app.utils.http_cache import precondition, conditional
+from app.utils.render import plan_cache, render_document
+from app.utils.query_guard import query_budget
+from app.utils.slugs import slugify
+
+
+KINDS = {"page": Page, "post": Post}
+
+
+def _can_see_drafts() -> bool:
+    return current_user.is_authenticated and current_user.role == UserRole.ADMIN
+
+
+def _find(site_id: int, slug: str, kind: str):
+    kinds = (kind,) if kind else ("page", "post")
+    for k in kinds:
+        model = KINDS[k]
+        meta = (
+            db.session.query(model.id, model.updated_at, model.template_id, model.status)
+            .filter_by(site_id=site_id, slug=slug)
+            .first()
+        )
+        if meta:
+            return k, meta
+    return None, None
+
+
+@query_budget(6)
+def render_site_item(site_id: int, slug: str):
+    """
+    Server-rendered HTML for a page or post
+    ---
+    tags:
+      - Render
+    produces:
+      - text/html
+    parameters:
+      - in: path
+        name: site_id
+        required: true
+        type: integer
+      - in: path
+        name: slug
+        required: true
+        type: string
+      - in: query
+        name: kind
+        type: string
+        required: false
+        enum: ["page", "post"]
+        description: Defaults to page, falling back to post with the same slug
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+    responses:
+      200:
+        description: Full HTML document rendered with the item's template
+      304:
+        description: Not modified
+      400:
+        description: Invalid kind
+        schema: { $ref: '#/definitions/Error' }
+      404:
+        description: Site or item not found (drafts are visible to admins only)
+        schema: { $ref: '#/definitions/Error' }
+    """
+    slug = slugify(slug)
+    kind = (request.args.get("kind") or "").strip().lower()
+    if kind and kind not in KINDS:
+        return jsonify({"error": "Invalid kind. Allowed: ['page', 'post']"}), 400
+
+    site = db.session.get(Site, site_id)
+    if not site:
+        return jsonify({"error": "Site not found"}), 404
+
+    kind, meta = _find(site_id, slug, kind)
+    if meta is None or (meta.status != "published" and not _can_see_drafts()):
+        return jsonify({"error": "Not found"}), 404
+
+    plan, template_updated_at = plan_cache.get(meta.template_id)
+    # HTML zavisi od sadržaja, šablona i sajta (ime u <title>), pa verzija prati najnoviju izmenu
+    version = max(filter(None, (meta.updated_at, template_updated_at, site.updated_at)))
+
+    etag_kind = f"render-{kind}"
+    not_modified = precondition(etag_kind, meta.id, version)
+    if not_modified:
+        return not_modified
+
+    model = KINDS[kind]
+    item = db.session.get(model, meta.id, options=[undefer(model.content)])
+    resp = Response(render_document(kind, item, site, plan), mimetype="text/html")
+    return conditional(resp, etag_kind, meta.id, version)
@@ -0,0 +1,87 @@
+from flask import request, jsonify
+
+from app.utils.pagination import DEFAULT_LIMIT, MAX_LIMIT, CursorError
+from app.utils.search import decode_search_cursor, search as run_search
+from app.utils.query_guard import query_budget
+
+
+ALLOWED_KINDS = {"page", "post"}
+ALLOWED_STATUS = {"draft", "published"}
+
+
+@query_budget(3)
+def search():
+    """
+    Full-text search over pages and posts of a site
+    ---
+    tags:
+      - Search
+    parameters:
+      - in: query
+        name: siteId
+        type: integer
+        required: true
+      - in: query
+        name: q
+        type: string
+        required: true
+        description: Search terms (web search syntax, e.g. "hello world", "-draft", "\\"exact phrase\\"")
+      - in: query
+        name: kind
+        type: string
+        required: false
+        enum: ["page", "post"]
+      - in: query
+        name: status
+        type: string
+        required: false
+        enum: ["draft", "published"]
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (max 200)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: nextCursor from the previous response
+    responses:
+      200:
+        description: Results ordered by rank (title matches weigh more than block text)
+        schema:
+          $ref: '#/definitions/SearchResponse'
+      400:
+        description: Missing siteId/q, invalid kind, status or cursor
+        schema: { $ref: '#/definitions/Error' }
+    """
+    site_id = request.args.get("siteId", type=int)
+    q = (request.args.get("q") or "").strip()
+    kind = (request.args.get("kind") or "").strip().lower()
+    status = (request.args.get("status") or "").strip().lower() or None
+    limit = request.args.get("limit", type=int) or DEFAULT_LIMIT
+    raw_cursor = (request.args.get("cursor") or "").strip()
+
+    if not site_id:
+        return jsonify({"error": "siteId is required"}), 400
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+    if kind and kind not in ALLOWED_KINDS:
+        return jsonify({"error": f"Invalid kind. Allowed: {sorted(ALLOWED_KINDS)}"}), 400
+    if status and status not in ALLOWED_STATUS:
+        return jsonify({"error": f"Invalid status. Allowed: {sorted(ALLOWED_STATUS)}"}), 400
+
+    try:
+        cursor = decode_search_cursor(raw_cursor) if raw_cursor else None
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    items, next_cursor = run_search(
+        site_id,
+        q,
+        kinds=(kind,) if kind else ALLOWED_KINDS,
+        status=status,
+        limit=max(1, min(limit, MAX_LIMIT)),
+        cursor=cursor,
+    )
+    return jsonify({"results": items, "nextCursor": next_cursor}), 200
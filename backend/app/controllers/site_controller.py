@@ -1,11 +1,15 @@
 import re
-import json
 from flask import request, jsonify
 from flask_login import current_user
 
 from app.extensions import db
 from app.models import Site
+from app.utils.http_cache import precondition, conditional
+from app.utils.content_events import site_changed, site_removed
+from app.utils import stats
 from app.utils.auth import admin_required
+from app.utils.query_guard import query_budget
+from app.utils.serializers import site_to_dict
 
 
 def _slugify(value: str) -> str:
@@ -14,18 +18,7 @@ def _slugify(value: str) -> str:
     return value.strip("-")
 
 
-def _site_to_dict(site: Site):
-    return {
-        "id": site.id,
-        "name": site.name,
-        "slug": site.slug,
-        "createdById": site.created_by_id,
-        "config": json.loads(site.config) if site.config else None,
-        "createdAt": site.created_at.isoformat() if site.created_at else None,
-        "updatedAt": site.updated_at.isoformat() if site.updated_at else None,
-    }
-
-
+@query_budget(2)
 def list_sites():
     """
     List sites
@@ -39,9 +32,10 @@ def list_sites():
           $ref: '#/definitions/SitesListResponse'
     """
     sites = Site.query.order_by(Site.created_at.desc()).all()
-    return jsonify({"sites": [_site_to_dict(s) for s in sites]}), 200
+    return jsonify({"sites": [site_to_dict(s) for s in sites]}), 200
 
 
+@query_budget(2)
 def get_site(site_id: int):
     """
     Get site by id
@@ -53,6 +47,14 @@ def get_site(site_id: int):
         name: site_id
         required: true
         type: integer
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+      - in: header
+        name: If-Modified-Since
+        type: string
+        required: false
     responses:
       200:
         description: Site
@@ -60,14 +62,22 @@ def get_site(site_id: int):
           type: object
           properties:
             site: { $ref: '#/definitions/Site' }
+      304:
+        description: Not modified (If-None-Match / If-Modified-Since)
       404:
         description: Not found
         schema: { $ref: '#/definitions/Error' }
     """
-    site = db.session.get(Site, site_id)
-    if not site:
+    meta = db.session.query(Site.id, Site.updated_at).filter(Site.id == site_id).first()
+    if not meta:
         return jsonify({"error": "Site not found"}), 404
-    return jsonify({"site": _site_to_dict(site)}), 200
+
+    not_modified = precondition("site", meta.id, meta.updated_at)
+    if not_modified:
+        return not_modified
+
+    site = db.session.get(Site, site_id)
+    return conditional(jsonify({"site": site_to_dict(site)}), "site", site.id, site.updated_at)
 
 
 @admin_required
@@ -132,13 +142,15 @@ def create_site():
         name=name,
         slug=slug,
         created_by_id=current_user.id,
-        config=json.dumps(config) if config is not None else None,
+        config=config,
     )
 
     db.session.add(site)
+    db.session.flush()
+    stats.site_created(site.id)
     db.session.commit()
 
-    return jsonify({"message": "Site created", "site": _site_to_dict(site)}), 201
+    return jsonify({"message": "Site created", "site": site_to_dict(site)}), 201
 
 
 @admin_required
@@ -188,6 +200,7 @@ def update_site(site_id: int):
         return jsonify({"error": "Site not found"}), 404
 
     data = request.get_json(silent=True) or {}
+    old_slug = site.slug
 
     if "name" in data:
         site.name = (data.get("name") or "").strip() or site.name
@@ -202,10 +215,11 @@ def update_site(site_id: int):
         site.slug = new_slug
 
     if "config" in data:
-        site.config = json.dumps(data.get("config")) if data.get("config") is not None else None
+        site.config = data.get("config")
 
     db.session.commit()
-    return jsonify({"message": "Site updated", "site": _site_to_dict(site)}), 200
+    site_changed(site.id, old_slug, site.slug)
+    return jsonify({"message": "Site updated", "site": site_to_dict(site)}), 200
 
 
 @admin_required
@@ -240,6 +254,9 @@ def delete_site(site_id: int):
     if not site:
         return jsonify({"error": "Site not found"}), 404
 
+    slug = site.slug
+    stats.site_deleted(site_id)
     db.session.delete(site)
     db.session.commit()
+    site_removed(site_id, slug)
     return jsonify({"message": "Site deleted"}), 200
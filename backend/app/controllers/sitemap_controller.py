@@ -0,0 +1,147 @@
+import math
+
+from flask import Response, current_app, request, jsonify, stream_with_context
+
+from app.extensions import db
+from app.models import Site
+from app.utils import sitemap
+from app.utils.http_cache import precondition, conditional
+from app.utils.json_response import stream_list
+from app.utils.query_guard import query_budget
+
+
+def _entry_to_dict(row):
+    return {
+        "kind": row.kind,
+        "slug": row.slug,
+        "title": row.title,
+        "updatedAt": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+def _site(site_id: int):
+    return db.session.query(Site.id, Site.slug, Site.updated_at).filter(Site.id == site_id).first()
+
+
+def _version(site, kind=None):
+    """
+    (broj stavki, verzija): URL-ovi sadrže slug sajta, pa izmena sajta menja i sitemap.
+    """
+    count, changed_at = sitemap.version(site.id, kind)
+    return count, max(filter(None, (changed_at, site.updated_at)))
+
+
+@query_budget(3)
+def get_sitemap(site_id: int):
+    """
+    Site navigation: published pages and posts (slug, title, updatedAt only)
+    ---
+    tags:
+      - Sites
+    parameters:
+      - in: path
+        name: site_id
+        required: true
+        type: integer
+      - in: query
+        name: kind
+        type: string
+        required: false
+        enum: ["page", "post"]
+        description: Only pages or only posts (default both, pages first)
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+    responses:
+      200:
+        description: Streamed list ordered by kind and slug
+        schema: { $ref: '#/definitions/SitemapResponse' }
+      304:
+        description: Not modified
+      400:
+        description: Invalid kind
+        schema: { $ref: '#/definitions/Error' }
+      404:
+        description: Site not found
+        schema: { $ref: '#/definitions/Error' }
+    """
+    kind = (request.args.get("kind") or "").strip().lower() or None
+    if kind and kind not in sitemap.KINDS:
+        return jsonify({"error": "Invalid kind. Allowed: ['page', 'post']"}), 400
+
+    site = _site(site_id)
+    if not site:
+        return jsonify({"error": "Site not found"}), 404
+
+    count, updated_at = _version(site, kind)
+    etag_kind = f"sitemap-{site.slug}-{kind or 'all'}-{count}"
+    not_modified = precondition(etag_kind, site_id, updated_at)
+    if not_modified:
+        return not_modified
+
+    resp = stream_list(
+        "entries", sitemap.entries(site_id, kind), _entry_to_dict,
+        extra={"siteId": site.id, "siteSlug": site.slug, "total": count},
+    )
+    return conditional(resp, etag_kind, site_id, updated_at)
+
+
+@query_budget(3)
+def get_sitemap_xml(site_id: int):
+    """
+    sitemap.xml for published pages and posts
+    ---
+    tags:
+      - Sites
+    produces:
+      - application/xml
+    parameters:
+      - in: path
+        name: site_id
+        required: true
+        type: integer
+      - in: query
+        name: page
+        type: integer
+        required: false
+        description: Part of a sitemap index (sites with more than SITEMAP_MAX_URLS items)
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+    responses:
+      200:
+        description: urlset, or a sitemapindex pointing to ?page=N when the site is larger than one sitemap
+      304:
+        description: Not modified
+      404:
+        description: Site or sitemap page not found
+        schema: { $ref: '#/definitions/Error' }
+    """
+    site = _site(site_id)
+    if not site:
+        return jsonify({"error": "Site not found"}), 404
+
+    page = request.args.get("page", type=int)
+    count, updated_at = _version(site)
+    max_urls = int(current_app.config["SITEMAP_MAX_URLS"])
+    pages = max(1, math.ceil(count / max_urls))
+    if page is not None and not 1 <= page <= pages:
+        return jsonify({"error": "Sitemap page not found"}), 404
+
+    etag_kind = f"sitemap-xml-{site.slug}-{page or 0}-{count}"
+    not_modified = precondition(etag_kind, site_id, updated_at)
+    if not_modified:
+        return not_modified
+
+    if page is None and pages > 1:
+        urls = (f"{request.base_url}?page={n}" for n in range(1, pages + 1))
+        body = sitemap.sitemap_index(urls)
+    else:
+        base = (current_app.config["PUBLIC_BASE_URL"] or request.host_url).rstrip("/")
+        rows = sitemap.entries(site_id, offset=(page - 1) * max_urls, limit=max_urls) if page else sitemap.entries(site_id)
+        body = sitemap.urlset(rows, base, site.slug)
+
+    resp = Response(stream_with_context(body), mimetype="application/xml")
+    return conditional(resp, etag_kind, site_id, updated_at)
@@ -1,10 +1,12 @@
-import json
 from flask import request, jsonify
 from flask_login import current_user
 
 from app.extensions import db
 from app.models import Template
+from app.utils.http_cache import precondition, conditional
 from app.utils.auth import admin_required
+from app.utils.content_events import template_changed
+from app.utils.query_guard import query_budget
 
 
 ALLOWED_TYPES = {"page", "post", "both"}
@@ -15,13 +17,14 @@ def _template_to_dict(t: Template):
         "id": t.id,
         "name": t.name,
         "type": t.type,
-        "config": json.loads(t.config) if t.config else None,
+        "config": t.config,
         "createdById": t.created_by_id,
         "createdAt": t.created_at.isoformat() if t.created_at else None,
         "updatedAt": t.updated_at.isoformat() if t.updated_at else None,
     }
 
 
+@query_budget(2)
 def list_templates():
     """
     List templates
@@ -38,6 +41,7 @@ def list_templates():
     return jsonify({"templates": [_template_to_dict(t) for t in templates]}), 200
 
 
+@query_budget(2)
 def get_template(template_id: int):
     """
     Get template by id
@@ -49,6 +53,14 @@ def get_template(template_id: int):
         name: template_id
         required: true
         type: integer
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+      - in: header
+        name: If-Modified-Since
+        type: string
+        required: false
     responses:
       200:
         description: Template
@@ -57,15 +69,23 @@ def get_template(template_id: int):
           properties:
             template:
               $ref: '#/definitions/Template'
+      304:
+        description: Not modified (If-None-Match / If-Modified-Since)
       404:
         description: Template not found
         schema:
           $ref: '#/definitions/Error'
     """
-    t = db.session.get(Template, template_id)
-    if not t:
+    meta = db.session.query(Template.id, Template.updated_at).filter(Template.id == template_id).first()
+    if not meta:
         return jsonify({"error": "Template not found"}), 404
-    return jsonify({"template": _template_to_dict(t)}), 200
+
+    not_modified = precondition("template", meta.id, meta.updated_at)
+    if not_modified:
+        return not_modified
+
+    t = db.session.get(Template, template_id)
+    return conditional(jsonify({"template": _template_to_dict(t)}), "template", t.id, t.updated_at)
 
 
 @admin_required
@@ -136,7 +156,7 @@ def create_template():
     t = Template(
         name=name,
         type=ttype,
-        config=json.dumps(config) if config is not None else None,
+        config=config,
         created_by_id=current_user.id,
     )
 
@@ -223,9 +243,10 @@ def update_template(template_id: int):
         t.type = new_type
 
     if "config" in data:
-        t.config = json.dumps(data.get("config")) if data.get("config") is not None else None
+        t.config = data.get("config")
 
     db.session.commit()
+    template_changed(t.id)
     return jsonify({"message": "Template updated", "template": _template_to_dict(t)}), 200
 
 
@@ -266,4 +287,5 @@ def delete_template(template_id: int):
 
     db.session.delete(t)
     db.session.commit()
+    template_changed(template_id)
     return jsonify({"message": "Template deleted"}), 200
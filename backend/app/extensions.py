@@ -2,6 +2,18 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 
-db = SQLAlchemy()
+from app.utils.cache import ResponseCache
+from app.utils.user_cache import UserCache
+from app.utils.replicas import ReplicaRouter, RoutingSession
+from app.utils.metrics import Metrics
+from app.utils.query_guard import QueryGuard
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
+response_cache = ResponseCache()
+bundle_cache = ResponseCache(name="bundle")
+user_cache = UserCache()
+replica_router = ReplicaRouter()
+metrics = Metrics()
+query_guard = QueryGuard()
@@ -1,6 +1,33 @@
 from app.extensions import db
 import enum
+import json
 from flask_login import UserMixin
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class JSONDocument(db.TypeDecorator):
+    """
+    JSONB na PostgreSQL-u, JSON kao Text na ostalim bazama (SQLite u testovima).
+    U Python-u je vrednost uvek dict/list, pa kontroleri ne rade json.loads/json.dumps.
+    """
+
+    impl = db.Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(db.Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql" or not isinstance(value, str):
+            return value
+        return json.loads(value)
 
 
 class UserRole(enum.Enum):
@@ -54,6 +81,12 @@ class User(db.Model, UserMixin):
         nullable=False,
     )
 
+    __table_args__ = (
+        db.Index("ix_users_created_id", "created_at", "id"),
+        db.Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        db.Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
+
 class Site(db.Model):
     __tablename__ = "sites"
 
@@ -64,7 +97,7 @@ class Site(db.Model):
 
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     created_by = db.relationship("User", backref=db.backref("sites_created", lazy=True))
-    config = db.Column(db.Text, nullable=True)
+    config = db.Column(JSONDocument(), nullable=True)
 
     created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now(), nullable=False)
@@ -77,7 +110,7 @@ class Template(db.Model):
     name = db.Column(db.String(120), nullable=False, unique=True, index=True)
 
     type = db.Column(db.String(20), nullable=False, server_default="both", index=True)
-    config = db.Column(db.Text, nullable=True)
+    config = db.Column(JSONDocument(), nullable=True)
 
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     created_by = db.relationship("User", backref=db.backref("templates_created", lazy=True))
@@ -99,7 +132,10 @@ class Page(db.Model):
     title = db.Column(db.String(200), nullable=False)
     slug = db.Column(db.String(200), nullable=False, index=True)
 
-    content = db.Column(db.Text, nullable=False, server_default='{"version":1,"blocks":[]}')
+    # content (dict) se učitava tek kada zatreba; odgovori koriste content_text
+    # (jsonb::text na PostgreSQL-u) koji se ubacuje u JSON bez dekodiranja
+    content = db.deferred(db.Column(JSONDocument(), nullable=False, server_default='{"version":1,"blocks":[]}'))
+    content_text = db.column_property(db.cast(content.columns[0], db.Text))
 
     status = db.Column(db.String(20), nullable=False, server_default="draft", index=True)  # draft/published
 
@@ -111,6 +147,9 @@ class Page(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("site_id", "slug", name="uq_pages_site_slug"),
+        db.Index("ix_pages_site_created_id", "site_id", "created_at", "id"),
+        db.Index("ix_pages_site_status_created_id", "site_id", "status", "created_at", "id"),
+        db.Index("ix_pages_content_gin", "content", postgresql_using="gin", postgresql_ops={"content": "jsonb_path_ops"}),
     )
 
 class Post(db.Model):
@@ -130,7 +169,10 @@ class Post(db.Model):
     title = db.Column(db.String(200), nullable=False)
     slug = db.Column(db.String(200), nullable=False, index=True)
 
-    content = db.Column(db.Text, nullable=False, server_default='{"version":1,"blocks":[]}')
+    # content (dict) se učitava tek kada zatreba; odgovori koriste content_text
+    # (jsonb::text na PostgreSQL-u) koji se ubacuje u JSON bez dekodiranja
+    content = db.deferred(db.Column(JSONDocument(), nullable=False, server_default='{"version":1,"blocks":[]}'))
+    content_text = db.column_property(db.cast(content.columns[0], db.Text))
 
     status = db.Column(db.String(20), nullable=False, server_default="draft", index=True)  # draft/published
 
@@ -139,5 +181,88 @@ class Post(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("site_id", "slug", name="uq_posts_site_slug"),
+        db.Index("ix_posts_site_created_id", "site_id", "created_at", "id"),
+        db.Index("ix_posts_site_status_created_id", "site_id", "status", "created_at", "id"),
+        db.Index("ix_posts_content_gin", "content", postgresql_using="gin", postgresql_ops={"content": "jsonb_path_ops"}),
+    )
+
+
+class SiteStat(db.Model):
+    """
+    Brojači sadržaja po sajtu, održavaju ih create/update/delete kontroleri
+    (app/utils/stats.py). Admin overview čita top sajtove direktno odavde.
+    """
+    __tablename__ = "site_stats"
+
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="CASCADE"), primary_key=True)
+
+    pages_draft = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    pages_published = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    posts_draft = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    posts_published = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    total = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
+
+class StatCounter(db.Model):
+    """
+    Globalni brojači: "sites", "users:<role>", "pages:<status>", "posts:<status>".
+    """
+    __tablename__ = "stat_counters"
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+
+
+class RenderBundle(db.Model):
+    """
+    Unapred serijalizovan paket za javni prikaz (stavka + šablon + sajt), jedan red po
+    (site_id, kind, slug). Pravi se pri prvom čitanju, briše se kad se stavka, njen šablon
+    ili sajt promeni (app/utils/bundles.py).
+    """
+    __tablename__ = "render_bundles"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="CASCADE"), nullable=False)
+    kind = db.Column(db.String(10), nullable=False)  # page/post
+    slug = db.Column(db.String(200), nullable=False)
+
+    item_id = db.Column(db.Integer, nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey("templates.id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # gotov JSON odgovor i najnoviji updated_at stavke, šablona i sajta (ETag)
+    body = db.Column(db.Text, nullable=False)
+    version = db.Column(db.DateTime, nullable=False)
+
+    built_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("site_id", "kind", "slug", name="uq_render_bundles_site_kind_slug"),
     )
 
+
+class SitemapEntry(db.Model):
+    """
+    Kompaktan indeks objavljenih stavki sajta (bez content-a) za navigaciju i sitemap.xml.
+    Održava se posle svake izmene stavke (app/utils/sitemap.py), samo za izmenjene slug-ove.
+    """
+    __tablename__ = "sitemap_entries"
+
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="CASCADE"), primary_key=True)
+    kind = db.Column(db.String(10), primary_key=True)  # page/post
+    slug = db.Column(db.String(200), primary_key=True)
+
+    item_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+
+class SitemapVersion(db.Model):
+    """
+    Vreme poslednje izmene sitemap indeksa sajta (Last-Modified/ETag). Najnoviji updated_at
+    unosa nije dovoljan: uklanjanje starije stavke ga ne menja.
+    """
+    __tablename__ = "sitemap_versions"
+
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="CASCADE"), primary_key=True)
+    changed_at = db.Column(db.DateTime, nullable=False)
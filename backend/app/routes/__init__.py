@@ -4,6 +4,8 @@ from app.routes.template_routes import template_bp
 from app.routes.page_routes import page_bp
 from app.routes.post_routes import post_bp
 from app.routes.admin_routes import admin_bp
+from app.routes.search_routes import search_bp
+from app.routes.render_routes import render_bp
 
 def register_routes(app):
     app.register_blueprint(auth_bp)
@@ -12,3 +14,5 @@ def register_routes(app):
     app.register_blueprint(page_bp)
     app.register_blueprint(post_bp)
     app.register_blueprint(admin_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(render_bp)
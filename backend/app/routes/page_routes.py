@@ -1,6 +1,7 @@
 from flask import Blueprint
 from app.controllers.page_controller import (
-    list_pages, get_page, get_page_by_slug, create_page, update_page, delete_page
+    list_pages, get_page, get_page_by_slug, create_page, update_page, delete_page,
+    bulk_create_pages, bulk_update_pages, bulk_delete_pages,
 )
 
 page_bp = Blueprint("pages", __name__, url_prefix="/api/pages")
@@ -11,3 +12,7 @@ page_bp.get("/site/<int:site_id>/<string:slug>")(get_page_by_slug)
 page_bp.post("")(create_page)
 page_bp.put("/<int:page_id>")(update_page)
 page_bp.delete("/<int:page_id>")(delete_page)
+
+page_bp.post("/bulk")(bulk_create_pages)
+page_bp.put("/bulk")(bulk_update_pages)
+page_bp.delete("/bulk")(bulk_delete_pages)
@@ -1,6 +1,7 @@
 from flask import Blueprint
 from app.controllers.post_controller import (
-    list_posts, get_post, get_post_by_slug, create_post, update_post, delete_post
+    list_posts, get_post, get_post_by_slug, create_post, update_post, delete_post,
+    bulk_create_posts, bulk_update_posts, bulk_delete_posts,
 )
 
 post_bp = Blueprint("posts", __name__, url_prefix="/api/posts")
@@ -12,3 +13,7 @@ post_bp.get("/site/<int:site_id>/<string:slug>")(get_post_by_slug)
 post_bp.post("")(create_post)
 post_bp.put("/<int:post_id>")(update_post)
 post_bp.delete("/<int:post_id>")(delete_post)
+
+post_bp.post("/bulk")(bulk_create_posts)
+post_bp.put("/bulk")(bulk_update_posts)
+post_bp.delete("/bulk")(bulk_delete_posts)
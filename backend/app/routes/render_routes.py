@@ -0,0 +1,6 @@
+from flask import Blueprint
+from app.controllers.render_controller import render_site_item
+
+render_bp = Blueprint("render", __name__, url_prefix="/api/render")
+
+render_bp.get("/site/<int:site_id>/<slug>")(render_site_item)
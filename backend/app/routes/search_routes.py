@@ -0,0 +1,6 @@
+from flask import Blueprint
+from app.controllers.search_controller import search
+
+search_bp = Blueprint("search", __name__, url_prefix="/api/search")
+
+search_bp.get("")(search)
@@ -2,6 +2,9 @@ from flask import Blueprint
 from app.controllers.site_controller import (
     list_sites, get_site, create_site, update_site, delete_site
 )
+from app.controllers.export_controller import export_site, import_site
+from app.controllers.bundle_controller import get_bundle
+from app.controllers.sitemap_controller import get_sitemap, get_sitemap_xml
 
 site_bp = Blueprint("sites", __name__, url_prefix="/api/sites")
 
@@ -10,3 +13,8 @@ site_bp.get("/<int:site_id>")(get_site)
 site_bp.post("")(create_site)
 site_bp.put("/<int:site_id>")(update_site)
 site_bp.delete("/<int:site_id>")(delete_site)
+site_bp.get("/<int:site_id>/export")(export_site)
+site_bp.get("/<int:site_id>/sitemap")(get_sitemap)
+site_bp.get("/<int:site_id>/sitemap.xml")(get_sitemap_xml)
+site_bp.post("/import")(import_site)
+site_bp.get("/<site_slug>/bundle/<slug>")(get_bundle)
@@ -99,6 +99,10 @@ def swagger_template():
 
             "BlockTree": {
                 "type": "object",
+                "description": (
+                    "Validated on write: known block types only (and the template's blocks.allowed), "
+                    "typed props, children only on section blocks, limits on depth, block count and size."
+                ),
                 "properties": {
                     "version": {"type": "integer", "example": 1},
                     "blocks": {
@@ -109,6 +113,35 @@ def swagger_template():
                 },
             },
 
+            "ExpandedSite": {
+                "type": "object",
+                "description": "Only with ?expand=site",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "name": {"type": "string"},
+                    "slug": {"type": "string"},
+                    "config": {"type": ["object", "null"]},
+                },
+            },
+            "ExpandedTemplate": {
+                "type": ["object", "null"],
+                "description": "Only with ?expand=template (null when the item has no template)",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "name": {"type": "string"},
+                    "type": {"type": "string"},
+                    "config": {"type": ["object", "null"]},
+                },
+            },
+            "ExpandedAuthor": {
+                "type": "object",
+                "description": "Only with ?expand=author (post author, page creator)",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "name": {"type": "string"},
+                },
+            },
+
             "Page": {
                 "type": "object",
                 "properties": {
@@ -122,12 +155,16 @@ def swagger_template():
                     "createdById": {"type": "integer"},
                     "createdAt": {"type": ["string", "null"], "format": "date-time"},
                     "updatedAt": {"type": ["string", "null"], "format": "date-time"},
+                    "site": {"$ref": "#/definitions/ExpandedSite"},
+                    "template": {"$ref": "#/definitions/ExpandedTemplate"},
+                    "author": {"$ref": "#/definitions/ExpandedAuthor"},
                 },
             },
             "PagesListResponse": {
                 "type": "object",
                 "properties": {
                     "pages": {"type": "array", "items": {"$ref": "#/definitions/Page"}},
+                    "nextCursor": {"type": ["string", "null"]},
                 },
             },
 
@@ -144,12 +181,101 @@ def swagger_template():
                     "status": {"type": "string", "enum": ["draft", "published"]},
                     "createdAt": {"type": ["string", "null"], "format": "date-time"},
                     "updatedAt": {"type": ["string", "null"], "format": "date-time"},
+                    "site": {"$ref": "#/definitions/ExpandedSite"},
+                    "template": {"$ref": "#/definitions/ExpandedTemplate"},
+                    "author": {"$ref": "#/definitions/ExpandedAuthor"},
                 },
             },
             "PostsListResponse": {
                 "type": "object",
                 "properties": {
                     "posts": {"type": "array", "items": {"$ref": "#/definitions/Post"}},
+                    "nextCursor": {"type": ["string", "null"]},
+                },
+            },
+
+            "RenderBundle": {
+                "type": "object",
+                "description": "Everything needed to paint a published page or post",
+                "properties": {
+                    "kind": {"type": "string", "enum": ["page", "post"]},
+                    "page": {
+                        "type": "object",
+                        "description": "Present when kind is page (post: same fields plus authorId under \"post\")",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "templateId": {"type": ["integer", "null"]},
+                            "title": {"type": "string"},
+                            "slug": {"type": "string"},
+                            "content": {"$ref": "#/definitions/BlockTree"},
+                            "updatedAt": {"type": ["string", "null"], "format": "date-time"},
+                        },
+                    },
+                    "site": {"$ref": "#/definitions/ExpandedSite"},
+                    "template": {"$ref": "#/definitions/ExpandedTemplate"},
+                },
+            },
+
+            "SitemapResponse": {
+                "type": "object",
+                "properties": {
+                    "entries": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "kind": {"type": "string", "enum": ["page", "post"]},
+                                "slug": {"type": "string"},
+                                "title": {"type": "string"},
+                                "updatedAt": {"type": "string", "format": "date-time"},
+                            },
+                        },
+                    },
+                    "siteId": {"type": "integer"},
+                    "siteSlug": {"type": "string"},
+                    "total": {"type": "integer"},
+                },
+            },
+
+            "BulkResponse": {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "index": {"type": "integer"},
+                                "status": {"type": "integer"},
+                                "id": {"type": "integer"},
+                                "slug": {"type": "string"},
+                                "error": {"type": "string"},
+                            },
+                        },
+                    },
+                    "succeeded": {"type": "integer"},
+                    "failed": {"type": "integer"},
+                },
+            },
+
+            "SearchResponse": {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "kind": {"type": "string", "enum": ["page", "post"]},
+                                "id": {"type": "integer"},
+                                "title": {"type": "string"},
+                                "slug": {"type": "string"},
+                                "status": {"type": "string"},
+                                "rank": {"type": "number"},
+                            },
+                        },
+                    },
+                    "nextCursor": {"type": "string"},
                 },
             },
 
@@ -237,6 +363,8 @@ def swagger_template():
             {"name": "Templates", "description": "Templates CRUD"},
             {"name": "Pages", "description": "Pages CRUD"},
             {"name": "Posts", "description": "Posts CRUD"},
+            {"name": "Search", "description": "Full-text search over pages and posts"},
+            {"name": "Render", "description": "Server-side HTML rendering of pages and posts"},
             {"name": "Health", "description": "Health endpoints"},
         ],
     }
\ No newline at end of file
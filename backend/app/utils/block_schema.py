@@ -0,0 +1,221 @@
+from flask import current_app
+
+from app.extensions import db
+from app.models import Template
+from app.utils.cache import LRUBackend
+
+
+class ContentError(ValueError):
+    pass
+
+
+def _string(max_len: int):
+    def check(value):
+        if not isinstance(value, str):
+            return "must be a string"
+        if len(value) > max_len:
+            return f"must be at most {max_len} characters"
+        return None
+    return check
+
+
+def _integer(lo: int, hi: int):
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, int) or not lo <= value <= hi:
+            return f"must be an integer between {lo} and {hi}"
+        return None
+    return check
+
+
+def _choice(*options):
+    allowed = frozenset(options)
+
+    def check(value):
+        if value not in allowed:
+            return f"must be one of {sorted(allowed)}"
+        return None
+    return check
+
+
+# props po tipu bloka (isti tipovi kao frontend/src/components/builder/blockRegistry.js + image)
+BLOCK_SCHEMAS = {
+    "hero": {"title": _string(500), "subtitle": _string(1000), "align": _choice("left", "center")},
+    "section": {
+        "padding": _string(200),
+        "background": _string(200),
+        "rounded": _string(200),
+        "border": _string(200),
+    },
+    "heading": {"level": _integer(1, 3), "text": _string(500)},
+    "text": {"text": _string(20000)},
+    "quote": {"text": _string(5000)},
+    "code": {"code": _string(50000)},
+    "button": {"text": _string(200), "href": _string(2048), "variant": _choice("primary", "secondary")},
+    "image": {"src": _string(2048), "alt": _string(500), "caption": _string(1000)},
+}
+
+# tipovi koji smeju da imaju ugnježdene blokove (children)
+CONTAINER_TYPES = {"section"}
+BLOCK_KEYS = {"id", "type", "props", "children"}
+ROOT_KEYS = {"version", "blocks"}
+MAX_ID_LENGTH = 64
+# gruba procena veličine: dužina stringova + fiksni trošak po ključu/vrednosti
+NODE_OVERHEAD = 8
+
+
+class ContentValidator:
+    """
+    Validator preveden za jedan skup dozvoljenih tipova (šablon).
+    Jedan iterativni prolaz kroz stablo proverava oblik, props, dubinu, broj blokova i veličinu.
+    """
+
+    def __init__(self, allowed=None):
+        types = set(BLOCK_SCHEMAS)
+        # None = šablon ne ograničava tipove; prazna lista = nijedan tip nije dozvoljen
+        if allowed is not None:
+            types &= set(allowed)
+        self.types = frozenset(types)
+        self.schemas = {t: BLOCK_SCHEMAS[t] for t in self.types}
+
+    def validate(self, content):
+        config = current_app.config
+        max_blocks = config.get("CONTENT_MAX_BLOCKS", 500)
+        max_depth = config.get("CONTENT_MAX_DEPTH", 4)
+        max_bytes = config.get("CONTENT_MAX_BYTES", 256 * 1024)
+
+        if not isinstance(content, dict) or not isinstance(content.get("blocks"), list):
+            raise ContentError("content must be an object with 'version' and 'blocks' list")
+        extra = set(content) - ROOT_KEYS
+        if extra:
+            raise ContentError(f"content: unknown keys {sorted(extra)}")
+        if content.get("version", 1) != 1:
+            raise ContentError("content.version must be 1")
+
+        count = 0
+        size = 0
+        stack = [("content.blocks", content["blocks"], 1)]
+        while stack:
+            path, blocks, depth = stack.pop()
+            if depth > max_depth:
+                raise ContentError(f"{path}: nesting deeper than {max_depth} levels")
+
+            for i, block in enumerate(blocks):
+                where = f"{path}[{i}]"
+                count += 1
+                if count > max_blocks:
+                    raise ContentError(f"content has more than {max_blocks} blocks")
+                if not isinstance(block, dict):
+                    raise ContentError(f"{where}: block must be an object")
+
+                extra = set(block) - BLOCK_KEYS
+                if extra:
+                    raise ContentError(f"{where}: unknown keys {sorted(extra)}")
+
+                btype = block.get("type")
+                schema = self.schemas.get(btype)
+                if schema is None:
+                    if btype in BLOCK_SCHEMAS:
+                        raise ContentError(f"{where}: block type '{btype}' is not allowed by the template")
+                    raise ContentError(f"{where}: unknown block type {btype!r}")
+
+                block_id = block.get("id")
+                if block_id is not None and (not isinstance(block_id, str) or len(block_id) > MAX_ID_LENGTH):
+                    raise ContentError(f"{where}.id: must be a string of at most {MAX_ID_LENGTH} characters")
+
+                props = block.get("props", {})
+                if not isinstance(props, dict):
+                    raise ContentError(f"{where}.props: must be an object")
+                for key, value in props.items():
+                    check = schema.get(key)
+                    if check is None:
+                        raise ContentError(f"{where}.props: unknown prop '{key}' for '{btype}'")
+                    error = check(value)
+                    if error:
+                        raise ContentError(f"{where}.props.{key}: {error}")
+                    size += len(key) + NODE_OVERHEAD + (len(value) if isinstance(value, str) else 0)
+
+                size += len(btype) + len(block_id or "") + NODE_OVERHEAD * 3
+                if size > max_bytes:
+                    raise ContentError(f"content is larger than {max_bytes} bytes")
+
+                children = block.get("children")
+                if children is not None:
+                    if btype not in CONTAINER_TYPES:
+                        raise ContentError(f"{where}.children: '{btype}' blocks cannot have children")
+                    if not isinstance(children, list):
+                        raise ContentError(f"{where}.children: must be a list")
+                    stack.append((f"{where}.children", children, depth + 1))
+
+
+def _allowed_types(config):
+    blocks = config.get("blocks") if isinstance(config, dict) else None
+    allowed = blocks.get("allowed") if isinstance(blocks, dict) else None
+    return [t for t in allowed if isinstance(t, str)] if isinstance(allowed, list) else None
+
+
+class SchemaCache:
+    """
+    Prevedeni validatori po (template_id, updated_at), kao i planovi za render.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.backend = LRUBackend(max_entries=max_entries, ttl=0)
+        self.default = ContentValidator()
+
+    def get(self, template_id, updated_at=None) -> ContentValidator:
+        """
+        updated_at: verzija šablona koju pozivalac već ima (učitan šablon), pa pogodak ne ide u bazu.
+        Bez nje se čita samo updated_at; config tek kad validator za tu verziju nije u kešu.
+        """
+        if template_id is None:
+            return self.default
+
+        if updated_at is None:
+            updated_at = db.session.query(Template.updated_at).filter(Template.id == template_id).scalar()
+            if updated_at is None:
+                return self.default
+
+        key = (template_id, updated_at.isoformat())
+        validator = self.backend.get(key)
+        if validator is None:
+            config = db.session.query(Template.config).filter(Template.id == template_id).scalar()
+            validator = ContentValidator(_allowed_types(config))
+            self.backend.set(key, validator)
+        return validator
+
+
+schema_cache = SchemaCache()
+
+
+def validate_content(content, template_id=None, updated_at=None):
+    """
+    Podiže ContentError sa putanjom do prvog neispravnog dela stabla.
+    """
+    schema_cache.get(template_id, updated_at).validate(content)
+
+
+def validator_lookup(versions=None):
+    """
+    schema_cache.get sa memoizacijom po template_id za trajanje jednog zahteva sa više stavki
+    (bulk, uvoz sajta). versions: {template_id: updated_at} već učitan jednim upitom.
+    """
+    memo = {}
+    versions = versions or {}
+
+    def get(template_id):
+        if template_id not in memo:
+            memo[template_id] = schema_cache.get(template_id, versions.get(template_id))
+        return memo[template_id]
+
+    return get
+
+
+def check_content(content, validator):
+    """
+    Poruka greške ili None; za obradu po stavci, gde greška ne prekida ceo zahtev.
+    """
+    try:
+        validator.validate(content)
+    except ContentError as e:
+        return str(e)
+    return None
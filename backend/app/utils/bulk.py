@@ -0,0 +1,390 @@
+from collections import Counter, defaultdict
+
+from flask import current_app
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Site, Template
+from app.utils import stats
+from app.utils.block_schema import check_content, validator_lookup
+from app.utils.content_events import content_changed
+from app.utils.slugs import slugify
+
+
+ALLOWED_STATUS = {"draft", "published"}
+# redova po INSERT ... VALUES naredbi (drži broj parametara ispod limita SQLite/PostgreSQL)
+INSERT_BATCH = 500
+
+
+class BulkError(ValueError):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _check_size(items, name="items"):
+    if not isinstance(items, list) or not items:
+        raise BulkError(f"{name} must be a non-empty list")
+    limit = current_app.config.get("BULK_MAX_ITEMS", 1000)
+    if len(items) > limit:
+        raise BulkError(f"Too many {name}: {len(items)} (max {limit})", 413)
+
+
+def _existing_ids(model, ids):
+    if not ids:
+        return set()
+    return {row_id for (row_id,) in db.session.query(model.id).filter(model.id.in_(ids))}
+
+
+def _template_versions(ids):
+    """
+    {template_id: updated_at} postojećih šablona, jednim upitom; verzija je ključ keša validatora.
+    """
+    if not ids:
+        return {}
+    return dict(db.session.query(Template.id, Template.updated_at).filter(Template.id.in_(ids)))
+
+
+def _item_template_ids(items):
+    return {
+        _as_int(item.get("templateId"))
+        for item in items
+        if isinstance(item, dict) and item.get("templateId") is not None
+    } - {None}
+
+
+def _taken_slugs(model, pairs, exclude_ids=()):
+    """
+    Skup (site_id, slug) parova koji već postoje u bazi, jednim upitom.
+    """
+    if not pairs:
+        return set()
+    q = db.session.query(model.site_id, model.slug).filter(db.tuple_(model.site_id, model.slug).in_(list(pairs)))
+    if exclude_ids:
+        q = q.filter(model.id.notin_(list(exclude_ids)))
+    return {(site_id, slug) for site_id, slug in q}
+
+
+def _normalize_new(item, validators):
+    if not isinstance(item, dict):
+        return None, "item must be an object"
+
+    site_id = _as_int(item.get("siteId"))
+    title = (item.get("title") or "").strip()
+    slug = slugify(item.get("slug") or title)
+    template_id = item.get("templateId")
+    status = (item.get("status") or "draft").strip().lower()
+    content = item.get("content")
+
+    if not site_id:
+        return None, "siteId is required"
+    if not title:
+        return None, "title is required"
+    if not slug:
+        return None, "Invalid slug"
+    if status not in ALLOWED_STATUS:
+        return None, f"Invalid status. Allowed: {sorted(ALLOWED_STATUS)}"
+    if template_id is not None and _as_int(template_id) is None:
+        return None, "templateId must be an integer"
+    if content is None:
+        content = {"version": 1, "blocks": []}
+    error = check_content(content, validators(_as_int(template_id)))
+    if error:
+        return None, error
+
+    return {
+        "site_id": site_id,
+        "template_id": _as_int(template_id),
+        "title": title,
+        "slug": slug,
+        "content": content,
+        "status": status,
+    }, None
+
+
+def _insert_returning_ids(model, rows):
+    """
+    Core INSERT ... VALUES (...), (...) RETURNING po paketu od INSERT_BATCH redova.
+    ORM executemany deli redove po ključevima sa None vrednostima (npr. templateId: null),
+    pa bi mešani payload postao više naredbi. Redosled RETURNING redova nije garantovan,
+    zato se id vraća po (site_id, slug), koji je jedinstven u paketu.
+    """
+    table = model.__table__
+    ids = {}
+    for start in range(0, len(rows), INSERT_BATCH):
+        stmt = (
+            insert(table)
+            .values(rows[start:start + INSERT_BATCH])
+            .returning(table.c.id, table.c.site_id, table.c.slug)
+        )
+        ids.update({(site_id, slug): row_id for row_id, site_id, slug in db.session.execute(stmt)})
+    return ids
+
+
+def bulk_create(model, kind: str, items, owner: dict):
+    """
+    Validacija u jednom prolazu, set-based provere (sajtovi, šabloni, slug-ovi),
+    jedan INSERT ... VALUES sa više redova po paketu i jedan commit.
+    owner: npr. {"author_id": 5} ili {"created_by_id": 5}.
+    Vraća listu rezultata po stavci (index, status, id ili error).
+    """
+    _check_size(items)
+
+    results = [None] * len(items)
+    rows = []
+    templates = _template_versions(_item_template_ids(items))
+    validators = validator_lookup(templates)
+    for i, item in enumerate(items):
+        values, error = _normalize_new(item, validators)
+        if error:
+            results[i] = {"index": i, "status": 400, "error": error}
+        else:
+            rows.append((i, values))
+
+    sites = _existing_ids(Site, {v["site_id"] for _, v in rows})
+    taken = _taken_slugs(model, {(v["site_id"], v["slug"]) for _, v in rows})
+
+    valid = []
+    seen = set()
+    for i, values in rows:
+        key = (values["site_id"], values["slug"])
+        if values["site_id"] not in sites:
+            results[i] = {"index": i, "status": 404, "error": "Site not found"}
+        elif values["template_id"] is not None and values["template_id"] not in templates:
+            results[i] = {"index": i, "status": 404, "error": "Template not found"}
+        elif key in taken or key in seen:
+            results[i] = {"index": i, "status": 409, "error": "Slug already exists for this site"}
+        else:
+            seen.add(key)
+            valid.append((i, {**values, **owner}))
+
+    if valid:
+        try:
+            inserted = _insert_returning_ids(model, [values for _, values in valid])
+
+            per_site = Counter((values["site_id"], values["status"]) for _, values in valid)
+            for (site_id, status), count in per_site.items():
+                stats.content_created(kind, site_id, status, count)
+
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise BulkError("Slug already exists for this site (concurrent write), nothing was created", 409)
+
+        for i, values in valid:
+            new_id = inserted[(values["site_id"], values["slug"])]
+            results[i] = {"index": i, "status": 201, "id": new_id, "slug": values["slug"]}
+        _changed(kind, ((values["site_id"], values["slug"]) for _, values in valid))
+
+    return results
+
+
+def _changed(kind: str, pairs):
+    """
+    Jedan content_changed po sajtu (sa svim slug-ovima), ne po stavci:
+    izvedeni podaci (render paketi, sitemap) se osvežavaju set-based.
+    """
+    per_site = defaultdict(set)
+    for site_id, slug in pairs:
+        per_site[site_id].add(slug)
+    for site_id, slugs in per_site.items():
+        content_changed(kind, site_id, *slugs)
+
+
+def _slug_holders(model, pairs):
+    """
+    {(site_id, slug): id} za parove koji već postoje u bazi, jednim upitom.
+    """
+    if not pairs:
+        return {}
+    q = db.session.query(model.site_id, model.slug, model.id).filter(
+        db.tuple_(model.site_id, model.slug).in_(list(pairs))
+    )
+    return {(site_id, slug): row_id for site_id, slug, row_id in q}
+
+
+def _resolve_slugs(moves, holders):
+    """
+    moves: {index: (obj, (site_id, slug))} izmena slug-a koje su prošle ostale provere.
+    Vraća indekse koji ne mogu da dobiju slug: ključ na kraju batch-a drži drugi red
+    (van batch-a ili stavka koja ne uspeva) ili ga je ranija stavka već zauzela.
+    Ponavlja se dok ima odbijenih, jer odbijena stavka zadržava stari slug.
+    """
+    rejected = set()
+    while True:
+        leaving = {obj.id: key for i, (obj, key) in moves.items() if i not in rejected}
+        claimed = set()
+        conflicts = set()
+        for i in sorted(moves):
+            if i in rejected:
+                continue
+            obj, key = moves[i]
+            holder = holders.get(key)
+            held = holder is not None and holder != obj.id and leaving.get(holder, key) == key
+            if held or key in claimed:
+                conflicts.add(i)
+            else:
+                claimed.add(key)
+        if not conflicts:
+            return rejected
+        rejected |= conflicts
+
+
+def bulk_update(model, kind: str, items, can_edit):
+    """
+    Jedan SELECT za sve ciljne redove, set-based provere šablona i slug-ova,
+    izmene kroz ORM i jedan commit.
+    Slug se proverava prema konačnom stanju batch-a (zamene i lanci preimenovanja rade),
+    a stavka čija izmena ne uspe ne oslobađa svoj slug.
+    can_edit: funkcija (obj) -> bool za proveru prava po stavci.
+    """
+    _check_size(items)
+
+    ids = {_as_int(item.get("id")) for item in items if isinstance(item, dict)} - {None}
+    objects = {o.id: o for o in model.query.filter(model.id.in_(ids))} if ids else {}
+
+    # šabloni iz zahteva i trenutni šabloni stavki (validacija sadržaja bez promene šablona)
+    templates = _template_versions((_item_template_ids(items) | {o.template_id for o in objects.values()}) - {None})
+
+    results = {}
+    accepted = {}
+    moves = {}
+    validators = validator_lookup(templates)
+    for i, item in enumerate(items):
+        obj = objects.get(_as_int(item.get("id"))) if isinstance(item, dict) else None
+        if obj is None:
+            results[i] = {"index": i, "status": 404, "error": f"{kind.capitalize()} not found"}
+            continue
+        if not can_edit(obj):
+            results[i] = {"index": i, "status": 403, "error": "Forbidden"}
+            continue
+
+        changes = {}
+        error = None
+
+        if "title" in item:
+            title = (item.get("title") or "").strip()
+            if not title:
+                error = (400, "title cannot be empty")
+            changes["title"] = title
+
+        if not error and "slug" in item:
+            slug = slugify(item.get("slug"))
+            if not slug:
+                error = (400, "Invalid slug")
+            elif slug != obj.slug:
+                changes["slug"] = slug
+
+        if not error and "templateId" in item:
+            tid = item.get("templateId")
+            if tid is not None and _as_int(tid) not in templates:
+                error = (404, "Template not found")
+            changes["template_id"] = _as_int(tid) if tid is not None else None
+
+        if not error and "status" in item:
+            st = (item.get("status") or "").strip().lower()
+            if st not in ALLOWED_STATUS:
+                error = (400, f"Invalid status. Allowed: {sorted(ALLOWED_STATUS)}")
+            changes["status"] = st
+
+        if not error and "content" in item:
+            validator = validators(changes.get("template_id", obj.template_id))
+            message = check_content(item.get("content"), validator)
+            if message:
+                error = (400, message)
+            changes["content"] = item.get("content")
+
+        if error:
+            results[i] = {"index": i, "status": error[0], "error": error[1]}
+            continue
+
+        accepted[i] = (obj, changes)
+        if "slug" in changes:
+            moves[i] = (obj, (obj.site_id, changes["slug"]))
+
+    holders = _slug_holders(model, {key for _, key in moves.values()})
+    for i in _resolve_slugs(moves, holders):
+        results[i] = {"index": i, "status": 409, "error": "Slug already exists for this site"}
+        del accepted[i], moves[i]
+
+    # zamena/lanac (novi slug drži red iz istog batch-a): prvo privremeni slug-ovi,
+    # da redosled UPDATE-ova u flush-u ne prekrši jedinstvenost (site_id, slug)
+    old_slugs = {obj.id: obj.slug for obj, _ in accepted.values()}
+    moving = {obj.id for obj, _ in moves.values()}
+    if any(holders.get(key) in moving for _, key in moves.values()):
+        for obj, _ in moves.values():
+            obj.slug = f"--bulk-{obj.id}"
+        db.session.flush()
+
+    touched = []
+    for i, (obj, changes) in accepted.items():
+        old_slug = old_slugs[obj.id]
+        if "status" in changes:
+            stats.content_status_changed(kind, obj.site_id, obj.status, changes["status"])
+        for attr, value in changes.items():
+            setattr(obj, attr, value)
+        touched.append((obj.site_id, old_slug, obj.slug))
+        results[i] = {"index": i, "status": 200, "id": obj.id}
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise BulkError("Slug already exists for this site (concurrent write), nothing was updated", 409)
+
+    _changed(kind, ((site_id, slug) for site_id, old_slug, new_slug in touched for slug in (old_slug, new_slug)))
+
+    return [results[i] for i in range(len(items))]
+
+
+def bulk_delete(model, kind: str, ids, owner_attr: str, is_admin: bool, user_id: int):
+    """
+    Jedan SELECT (samo id/site/slug/status/vlasnik), jedan DELETE ... WHERE id IN (...).
+    """
+    _check_size(ids, "ids")
+
+    wanted = [_as_int(x) for x in ids]
+    owner_col = getattr(model, owner_attr)
+    rows = {
+        r.id: r
+        for r in db.session.query(model.id, model.site_id, model.slug, model.status, owner_col.label("owner_id"))
+        .filter(model.id.in_({x for x in wanted if x is not None}))
+    }
+
+    results = []
+    deletable = {}
+    for i, row_id in enumerate(wanted):
+        row = rows.get(row_id)
+        if row is None:
+            results.append({"index": i, "status": 404, "error": f"{kind.capitalize()} not found"})
+        elif not is_admin and row.owner_id != user_id:
+            results.append({"index": i, "status": 403, "error": "Forbidden"})
+        else:
+            deletable[row.id] = row
+            results.append({"index": i, "status": 200, "id": row.id})
+
+    if deletable:
+        db.session.execute(
+            delete(model).where(model.id.in_(list(deletable))).execution_options(synchronize_session=False)
+        )
+        per_site = Counter((r.site_id, r.status) for r in deletable.values())
+        for (site_id, status), count in per_site.items():
+            stats.content_deleted(kind, site_id, status, count)
+        db.session.commit()
+
+        _changed(kind, ((r.site_id, r.slug) for r in deletable.values()))
+
+    return results
+
+
+def summarize(results):
+    ok = sum(1 for r in results if r["status"] < 300)
+    return {"results": results, "succeeded": ok, "failed": len(results) - ok}
@@ -0,0 +1,187 @@
+from contextlib import contextmanager
+
+from sqlalchemy import delete, exists, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
+
+from app.extensions import db, bundle_cache
+from app.models import Page, Post, RenderBundle, Site, Template
+from app.utils.expand import expanded
+from app.utils.json_response import EMPTY_BLOCK_TREE, RawJSON, dumps
+
+
+KINDS = {"page": Page, "post": Post}
+BUILD_ATTEMPTS = 3
+
+
+def _item(kind: str, item) -> dict:
+    data = {
+        "id": item.id,
+        "templateId": item.template_id,
+        "title": item.title,
+        "slug": item.slug,
+        "content": RawJSON(item.content_text or EMPTY_BLOCK_TREE),
+        "updatedAt": item.updated_at.isoformat() if item.updated_at else None,
+    }
+    if kind == "post":
+        data["authorId"] = item.author_id
+    return data
+
+
+@contextmanager
+def _primary():
+    """
+    Sesija na posebnoj konekciji ka primarnoj bazi. Paket se čita i pravi odavde, ne sa replike:
+    replika koja kasni bi posle invalidacije vratila stari red ili napravila paket od stare stavke,
+    a on bi se upisao na primarnu sa svežom verzijom. Čitalac se ne vezuje za primarnu (mark_write).
+    """
+    with db.engine.begin() as conn:
+        session = Session(bind=conn)
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+def lookup(site_slug: str, kind: str, slug: str):
+    """
+    Sačuvan paket po slug-u sajta (indeks na sites.slug) i slug-u stavke, jedan upit.
+    """
+    with _primary() as session:
+        return (
+            session.query(RenderBundle.item_id, RenderBundle.version, RenderBundle.body)
+            .join(Site, Site.id == RenderBundle.site_id)
+            .filter(Site.slug == site_slug, RenderBundle.kind == kind, RenderBundle.slug == slug)
+            .first()
+        )
+
+
+def build(site_slug: str, kind: str, slug: str):
+    """
+    Pravi i čuva paket objavljene stavke; None ako sajt ili stavka ne postoje (ili je nacrt).
+    Content se ubacuje kao content_text, bez dekodiranja stabla blokova.
+    Ako se stavka, sajt ili šablon promene između čitanja i upisa, paket se ne upisuje
+    i pravi se ponovo od svežih redova (najviše BUILD_ATTEMPTS puta).
+    """
+    model = KINDS[kind]
+    for _ in range(BUILD_ATTEMPTS):
+        with _primary() as session:
+            # Postgres: FOR SHARE drži stavku i sajt do commit-a, pa izmena (i njena invalidacija)
+            # čeka upis paketa; šablon je sa nullable strane outer join-a i pokriva ga provera u _store
+            item = (
+                session.query(model).join(Site, Site.id == model.site_id)
+                .options(joinedload(model.site), joinedload(model.template))
+                .filter(Site.slug == site_slug, model.slug == slug, model.status == "published")
+                .with_for_update(read=True, of=(model, Site))
+                .first()
+            )
+            if item is None:
+                return None
+
+            body = dumps({"kind": kind, kind: _item(kind, item), **expanded(item, ("site", "template"))})
+            stamps = [item.updated_at, item.site.updated_at, item.template.updated_at if item.template else None]
+            version = max(s for s in stamps if s is not None)
+            if _store(session.connection(), model, item, kind, body, version):
+                break
+    return item.id, version, body
+
+
+def _unchanged(model, item):
+    """
+    Uslovi da stavka, sajt i šablon nisu noviji od verzije od koje je paket napravljen.
+    <= a ne ==: SQLite čuva server_default now() bez mikrosekundi, a parametar ih ima.
+    """
+    conditions = [
+        exists().where(
+            model.id == item.id, model.updated_at <= item.updated_at,
+            model.status == "published", model.slug == item.slug,
+        ),
+        exists().where(Site.id == item.site_id, Site.updated_at <= item.site.updated_at),
+    ]
+    if item.template is not None:
+        conditions.append(exists().where(
+            Template.id == item.template_id, Template.updated_at <= item.template.updated_at,
+        ))
+    return conditions
+
+
+def _store(conn, model, item, kind: str, body: str, version) -> bool:
+    """
+    Upsert u istoj transakciji u kojoj je stavka pročitana. Red se upisuje samo ako se izvorni
+    redovi nisu promenili posle čitanja (invalidacija je tada možda već prošla, pa bi stari paket
+    ostao zauvek) i ne prepisuje noviji paket. False: ništa nije upisano.
+    """
+    values = {"site_id": item.site_id, "kind": kind, "slug": item.slug, "item_id": item.id,
+              "template_id": item.template_id, "body": body, "version": version}
+    columns = [getattr(RenderBundle, k) for k in values]
+    row = select(*(literal(v, type_=c.type) for v, c in zip(values.values(), columns))).where(*_unchanged(model, item))
+
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(RenderBundle).from_select(list(values), row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RenderBundle.site_id, RenderBundle.kind, RenderBundle.slug],
+            set_={k: stmt.excluded[k] for k in ("item_id", "template_id", "body", "version")},
+            where=RenderBundle.version <= stmt.excluded.version,
+        )
+        return conn.execute(stmt).rowcount > 0
+    _delete(conn, RenderBundle.site_id == item.site_id, RenderBundle.kind == kind, RenderBundle.slug == item.slug)
+    return conn.execute(insert(RenderBundle).from_select(list(values), row)).rowcount > 0
+
+
+def _delete(conn, *where):
+    conn.execute(delete(RenderBundle).where(*where))
+
+
+def invalidate(kind: str, site_id: int, *slugs):
+    """
+    Stavka je izmenjena/obrisana (stari i novi slug).
+    """
+    slugs = [s for s in slugs if s]
+    if not slugs:
+        return
+    with db.engine.begin() as conn:
+        site_slug = conn.execute(select(Site.slug).where(Site.id == site_id)).scalar()
+        _delete(conn, RenderBundle.site_id == site_id, RenderBundle.kind == kind, RenderBundle.slug.in_(slugs))
+    if site_slug:
+        bundle_cache.invalidate(kind, site_slug, *slugs)
+
+
+def invalidate_template(template_id: int):
+    """
+    Šablon je izmenjen/obrisan: brišu se paketi svih stavki koje ga koriste.
+    """
+    with db.engine.begin() as conn:
+        site_slugs = conn.execute(
+            select(Site.slug).distinct()
+            .join(RenderBundle, RenderBundle.site_id == Site.id)
+            .where(RenderBundle.template_id == template_id)
+        ).scalars().all()
+        _delete(conn, RenderBundle.template_id == template_id)
+    for site_slug in site_slugs:
+        bundle_cache.invalidate_site(site_slug)
+
+
+def invalidate_site(site_id: int, *site_slugs):
+    """
+    Sajt je izmenjen/obrisan; site_slugs: stari i novi slug (ključevi keša su po slug-u).
+    """
+    with db.engine.begin() as conn:
+        _delete(conn, RenderBundle.site_id == site_id)
+    for site_slug in {s for s in site_slugs if s}:
+        bundle_cache.invalidate_site(site_slug)
+
+
+def rebuild(site=None):
+    """
+    Briše sačuvane pakete (svih sajtova ili jednog) i pravi ih ponovo za sve objavljene stavke.
+    """
+    sites = [site] if site is not None else Site.query.order_by(Site.id).all()
+    built = 0
+    for s in sites:
+        invalidate_site(s.id, s.slug)
+        for kind, model in KINDS.items():
+            slugs = db.session.query(model.slug).filter_by(site_id=s.id, status="published").all()
+            built += sum(1 for (slug,) in slugs if build(s.slug, kind, slug))
+    return {"sites": len(sites), "bundles": built}
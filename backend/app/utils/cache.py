@@ -0,0 +1,337 @@
+import abc
+import enum
+import fcntl
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from app.utils.files import private_dir
+from app.utils.metrics import record_cache
+
+
+class CacheBackend(abc.ABC):
+    """
+    Interfejs za skladište keša. Deljeni backend (npr. Redis) treba da implementira
+    get/set/delete/incr; vrednosti su obične Python strukture (tuple, str, int).
+    """
+
+    @classmethod
+    def from_config(cls, config, prefix: str):
+        """
+        Pravi backend iz podešavanja (<PREFIX>MAX_ENTRIES, <PREFIX>TTL, CACHE_DIR).
+        Podrazumevano bez argumenata; backend-i sa opcijama ovo redefinišu.
+        """
+        return cls()
+
+    @abc.abstractmethod
+    def get(self, key):
+        ...
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key):
+        ...
+
+    @abc.abstractmethod
+    def incr(self, key) -> int:
+        ...
+
+    @abc.abstractmethod
+    def clear(self):
+        ...
+
+
+class LRUBackend(CacheBackend):
+    """
+    In-process LRU sa ograničenim brojem stavki i TTL-om po stavci.
+    Brojači (incr) se čuvaju odvojeno i ne izbacuju se iz LRU-a.
+
+    Ograničenje: stanje živi u jednom procesu. delete/incr (invalidacija) ne stižu do
+    ostalih gunicorn workera, koji služe staru vrednost do isteka TTL-a. Zato je ovo
+    podrazumevani backend samo za jedan proces (GUNICORN_WORKERS=1, flask run, testovi).
+    """
+
+    @classmethod
+    def from_config(cls, config, prefix: str):
+        return cls(max_entries=int(config[prefix + "MAX_ENTRIES"]), ttl=float(config[prefix + "TTL"]))
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"__dt": value.isoformat()}
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _json_object(obj):
+    if len(obj) == 1 and "__dt" in obj:
+        return datetime.fromisoformat(obj["__dt"])
+    return obj
+
+
+class FileBackend(CacheBackend):
+    """
+    Keš u direktorijumu koji dele svi procesi na istom hostu (gunicorn workeri).
+    Jedna stavka = jedan JSON fajl (vrednost i trenutak isteka; datetime kao ISO string,
+    enum kao vrednost, tuple kao lista), upis preko privremenog fajla i os.replace,
+    pa čitalac nikad ne vidi polovičan zapis.
+    Brojači (incr) su u counters/ pod fcntl zaključavanjem i ne ističu.
+    Direktorijum (CACHE_DIR) mora biti privatan: gunicorn.conf.py pravi mkdtemp ako nije zadat.
+    Za više hostova/kontejnera treba mrežni backend (RESPONSE_CACHE_BACKEND="modul:Klasa").
+    """
+
+    # na svakih PRUNE_EVERY upisa uklanjaju se istekle, pa najstarije stavke preko max_entries
+    PRUNE_EVERY = 256
+
+    def __init__(self, directory: str, max_entries: int = 1024, ttl: float = 60.0):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._writes = 0
+        self._counters = os.path.join(directory, "counters")
+        private_dir(directory)
+        private_dir(self._counters)
+
+    @classmethod
+    def from_config(cls, config, prefix: str):
+        root = config.get("CACHE_DIR")
+        if not root:
+            raise RuntimeError("FileBackend requires CACHE_DIR (a private directory, see gunicorn.conf.py)")
+        return cls(
+            os.path.join(private_dir(root), prefix.rstrip("_").lower()),
+            max_entries=int(config[prefix + "MAX_ENTRIES"]),
+            ttl=float(config[prefix + "TTL"]),
+        )
+
+    @staticmethod
+    def _name(key) -> str:
+        return hashlib.sha1(str(key).encode()).hexdigest()
+
+    def _path(self, key) -> str:
+        return os.path.join(self.directory, self._name(key))
+
+    def _counter_path(self, key) -> str:
+        return os.path.join(self._counters, self._name(key))
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f, object_hook=_json_object)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, path, item):
+        data = json.dumps(item, default=_json_default, separators=(",", ":"))
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        item = self._read(self._path(key))
+        if item is None:
+            return self._read(self._counter_path(key))
+        value, expires_at = item
+        if expires_at is not None and expires_at < time.time():
+            self._remove(self._path(key))
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self._write(self._path(key), (value, time.time() + ttl if ttl else None))
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def _remove(self, path) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, key):
+        self._remove(self._path(key))
+
+    def incr(self, key) -> int:
+        path = self._counter_path(key)
+        with open(os.path.join(self._counters, ".lock"), "wb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            value = (self._read(path) or 0) + 1
+            self._write(path, value)
+        return value
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            return [e for e in it if e.is_file() and not e.name.startswith("tmp")]
+
+    def prune(self):
+        now = time.time()
+        alive = []
+        for entry in self._entries():
+            item = self._read(entry.path)
+            if item is None or (item[1] is not None and item[1] < now):
+                self.evictions += self._remove(entry.path)
+            else:
+                alive.append(entry)
+        alive.sort(key=lambda e: e.stat().st_mtime)
+        for entry in alive[: max(0, len(alive) - self.max_entries)]:
+            self.evictions += self._remove(entry.path)
+
+    def clear(self):
+        for directory in (self.directory, self._counters):
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name != ".lock":
+                        self._remove(entry.path)
+
+    def __len__(self):
+        return len(self._entries())
+
+
+class ResponseCache:
+    """
+    Keš serijalizovanih odgovora za javne slug rute, ključ je (kind, site_id, slug).
+    Brisanje sajta ne traži skeniranje ključeva: povećava se generacija sajta,
+    pa svi stari ključevi tog sajta prestaju da se koriste i ističu sami.
+    name: prefiks podešavanja (RESPONSE_CACHE_*, BUNDLE_CACHE_*) i ključeva u deljenom backend-u.
+    """
+
+    def __init__(self, backend: CacheBackend = None, name: str = "response"):
+        self.backend = backend
+        self.name = name
+        self.prefix = "" if name == "response" else f"{name}:"
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        config = self.name.upper() + "_CACHE_"
+        app.config.setdefault(config + "ENABLED", True)
+        app.config.setdefault(config + "MAX_ENTRIES", 2048)
+        app.config.setdefault(config + "TTL", 60)
+        app.config.setdefault(config + "BACKEND", None)
+
+        self.enabled = bool(app.config[config + "ENABLED"])
+        if self.backend is None:
+            self.backend = load_backend(app.config, config)
+
+        app.extensions[f"{self.name}_cache"] = self
+
+    def _key(self, kind: str, site_id: int, slug: str) -> str:
+        generation = self.backend.get(f"{self.prefix}gen:{site_id}") or 0
+        return f"{self.prefix}{kind}:{site_id}:{generation}:{slug}"
+
+    def get(self, kind: str, site_id: int, slug: str):
+        if not self.enabled:
+            return None
+        value = self.backend.get(self._key(kind, site_id, slug))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        record_cache(self.name, value is not None)
+        return value
+
+    def set(self, kind: str, site_id: int, slug: str, value):
+        if self.enabled:
+            self.backend.set(self._key(kind, site_id, slug), value)
+
+    def invalidate(self, kind: str, site_id: int, *slugs):
+        for slug in slugs:
+            if slug:
+                self.backend.delete(self._key(kind, site_id, slug))
+
+    def invalidate_site(self, site_id: int):
+        self.backend.incr(f"{self.prefix}gen:{site_id}")
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend) if hasattr(self.backend, "__len__") else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": getattr(self.backend, "evictions", None),
+            "hitRate": round(self.hits / total, 4) if total else None,
+        }
+
+
+def load_backend(config, prefix: str = "RESPONSE_CACHE_") -> CacheBackend:
+    """
+    RESPONSE_CACHE_BACKEND="paket.modul:Klasa" za deljeni backend, inače lokalni LRU.
+    """
+    path = config.get(prefix + "BACKEND")
+    if path:
+        module_name, _, cls_name = path.partition(":")
+        return getattr(importlib.import_module(module_name), cls_name).from_config(config, prefix)
+    return LRUBackend.from_config(config, prefix)
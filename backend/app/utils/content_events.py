@@ -0,0 +1,38 @@
+from app.extensions import response_cache
+from app.utils import bundles, sitemap
+from app.utils.search import search_index
+
+
+def content_changed(kind: str, site_id: int, *slugs):
+    """
+    Poziva se posle commit-a svakog create/update/delete za page/post.
+    slugs: stari i novi slug (kod promene slug-a oba moraju da se invalidiraju).
+    """
+    response_cache.invalidate(kind, site_id, *slugs)
+    bundles.invalidate(kind, site_id, *slugs)
+    sitemap.sync(kind, site_id, *slugs)
+    search_index.invalidate(site_id)
+
+
+def template_changed(template_id: int):
+    """
+    Posle commit-a izmene/brisanja šablona: šablon je deo render paketa stavki.
+    """
+    bundles.invalidate_template(template_id)
+
+
+def site_changed(site_id: int, *slugs):
+    """
+    Posle commit-a izmene sajta (config je deo render paketa); slugs: stari i novi slug sajta.
+    """
+    bundles.invalidate_site(site_id, *slugs)
+
+
+def site_removed(site_id: int, slug: str = None):
+    """
+    Brisanje sajta kaskadno briše sve njegove stranice i postove.
+    """
+    response_cache.invalidate_site(site_id)
+    bundles.invalidate_site(site_id, slug)
+    sitemap.remove_site(site_id)
+    search_index.invalidate(site_id)
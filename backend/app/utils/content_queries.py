@@ -0,0 +1,28 @@
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.extensions import db
+
+
+def _dialect_name() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def has_block_type(model, block_type: str):
+    """
+    Uslov "content sadrži blok tipa X" koji se izvršava u bazi.
+    PostgreSQL: content @> '{"blocks":[{"type":"X"}]}' (koristi GIN jsonb_path_ops indeks).
+    SQLite: json_each nad content.blocks (fallback za testove).
+    """
+    if _dialect_name() == "postgresql":
+        probe = literal({"blocks": [{"type": block_type}]}, type_=JSONB)
+        return model.content.op("@>")(probe)
+
+    blocks = func.json_each(model.content, "$.blocks").table_valued("value")
+    return (
+        select(1)
+        .select_from(blocks)
+        .where(func.json_extract(blocks.c.value, "$.type") == block_type)
+        .exists()
+    )
+
@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default) == "1"
+
+
+class PoolStats:
+    """
+    Brojači iz pool događaja (connect/checkout/checkin/invalidate) i čekanja na konekciju.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.peak_checked_out = 0
+            self.checked_out = 0
+
+    def incr(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def checkout(self):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def checkin(self):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def waited(self, seconds: float):
+        with self._lock:
+            # čekanje ispod 1ms je samo trošak uzimanja iz reda, ne računa se
+            if seconds >= 0.001:
+                self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "waitTotalMs": round(self.wait_total * 1000, 3),
+                "waitMaxMs": round(self.wait_max * 1000, 3),
+                "peakCheckedOut": self.peak_checked_out,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool koji meri koliko je zahtev čekao na slobodnu konekciju i broji timeout-e.
+    Pool događaji nemaju "čekanje", pa se meri oko _do_get.
+    """
+
+    stats = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            if self.stats is not None:
+                self.stats.incr("timeouts")
+            raise
+        if self.stats is not None:
+            self.stats.waited(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def engine_options(uri: str) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS iz env-a:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS i DB_PGBOUNCER=1 (transaction pooling kroz PgBouncer).
+    SQLite (testovi) zadržava podrazumevani pool.
+    """
+    if not uri:
+        return {}
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", "1"),
+    }
+
+    connect_args = {}
+    timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    pgbouncer = _env_flag("DB_PGBOUNCER", "0")
+
+    if url.get_backend_name() == "postgresql":
+        if timeout_ms and not pgbouncer:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+        if pgbouncer and url.get_driver_name() == "psycopg":
+            # psycopg 3 bi inače pravio server-side prepared statements (ne rade kroz transaction pooling)
+            connect_args["prepare_threshold"] = None
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def init_pool_telemetry(app, db):
+    """
+    Kači pool događaje na engine aplikacije; statistika je u app.extensions["pool_stats"].
+    """
+    stats = PoolStats()
+    app.extensions["pool_stats"] = stats
+
+    timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    pgbouncer = _env_flag("DB_PGBOUNCER", "0")
+
+    with app.app_context():
+        engine = db.engine
+
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.stats = stats
+
+    event.listen(engine, "connect", lambda *a: stats.incr("connects"))
+    event.listen(engine, "checkout", lambda *a: stats.checkout())
+    event.listen(engine, "checkin", lambda *a: stats.checkin())
+    event.listen(engine, "invalidate", lambda *a: stats.incr("invalidations"))
+
+    if pgbouncer and timeout_ms and engine.dialect.name == "postgresql":
+        # PgBouncer ne prosleđuje startup "options"; SET LOCAL važi samo za tekuću transakciju
+        @event.listens_for(engine, "begin")
+        def _statement_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    return stats
+
+
+def pool_status(engine, stats: PoolStats) -> dict:
+    pool = engine.pool
+    status = {
+        "poolClass": type(pool).__name__,
+        "size": None,
+        "checkedOut": stats.checked_out,
+        "checkedIn": None,
+        "overflow": None,
+        "maxOverflow": None,
+        "timeout": None,
+    }
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checkedOut=pool.checkedout(),
+            checkedIn=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            maxOverflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    status.update(stats.snapshot())
+    return status
@@ -0,0 +1,90 @@
+from flask import request
+from sqlalchemy.orm import joinedload, selectinload
+
+
+EXPANSIONS = ("site", "template", "author")
+
+
+class ExpandError(ValueError):
+    pass
+
+
+def parse_expand():
+    """
+    Čita ?expand=site,template,author. Vraća tuple u kanonskom redosledu (deo ETag-a) ili ().
+    """
+    raw = (request.args.get("expand") or "").strip()
+    if not raw:
+        return ()
+    names = {n.strip() for n in raw.split(",") if n.strip()}
+    unknown = sorted(names - set(EXPANSIONS))
+    if unknown:
+        raise ExpandError(f"Unknown expand: {unknown}. Allowed: {list(EXPANSIONS)}")
+    return tuple(n for n in EXPANSIONS if n in names)
+
+
+def _attribute(model_or_obj, name: str) -> str:
+    # stranica nema autora; "author" je korisnik koji ju je napravio
+    if name == "author" and not hasattr(model_or_obj, "author"):
+        return "created_by"
+    return name
+
+
+def expand_options(model, expand, many: bool):
+    """
+    Opcije učitavanja za tražene veze: lista koristi selectinload (jedan IN upit po vezi
+    za celu stranu, bez obzira na broj stavki), pojedinačna stavka joinedload (isti upit).
+    """
+    loader = selectinload if many else joinedload
+    return [loader(getattr(model, _attribute(model, name))) for name in expand]
+
+
+def expand_columns(model, expand):
+    """
+    Strani ključevi koje selectinload koristi; dodaju se uz ?fields= da veze ne bi
+    učitavale kolonu po redu.
+    """
+    relations = (getattr(model, _attribute(model, name)).property for name in expand)
+    return {column.key for rel in relations for column, _ in rel.local_remote_pairs}
+
+
+def _site(s):
+    return {"id": s.id, "name": s.name, "slug": s.slug, "config": s.config}
+
+
+def _template(t):
+    return {"id": t.id, "name": t.name, "type": t.type, "config": t.config}
+
+
+def _author(u):
+    return {"id": u.id, "name": u.name}
+
+
+_SERIALIZERS = {"site": _site, "template": _template, "author": _author}
+
+
+def expanded(obj, expand) -> dict:
+    """
+    Ugnježdeni objekti za odgovor (None za stavku bez šablona).
+    """
+    data = {}
+    for name in expand:
+        related = getattr(obj, _attribute(obj, name))
+        data[name] = _SERIALIZERS[name](related) if related is not None else None
+    return data
+
+
+def expanded_version(obj, expand):
+    """
+    Najnoviji updated_at stavke i proširenih veza: ETag se menja i kad se promeni npr. šablon.
+    """
+    stamps = [obj.updated_at]
+    for name in expand:
+        related = getattr(obj, _attribute(obj, name))
+        if related is not None:
+            stamps.append(related.updated_at)
+    return max(s for s in stamps if s is not None)
+
+
+def etag_kind(kind: str, expand) -> str:
+    return f"{kind}+{'+'.join(expand)}" if expand else kind
@@ -0,0 +1,17 @@
+import os
+import stat
+
+
+def private_dir(path: str) -> str:
+    """
+    Pravi direktorijum sa 0o700 ili prihvata postojeći samo ako je naš i nedostupan
+    ostalim korisnicima (deljeni keš i metrike workera; drugi korisnik ne sme da podmetne fajlove).
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise RuntimeError(f"Directory {path} must be a directory owned by uid {os.getuid()} with mode 0700")
+    return path
@@ -0,0 +1,74 @@
+import hashlib
+from datetime import timezone
+
+from flask import Response, current_app, request
+
+
+def _etag_mode() -> str:
+    return current_app.config.get("ETAG_MODE", "timestamp")
+
+
+def _as_utc(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.replace(microsecond=0)
+
+
+def _version_etag(kind: str, obj_id: int, updated_at) -> str:
+    stamp = updated_at.isoformat() if updated_at else "0"
+    return f"{kind}-{obj_id}-{stamp}"
+
+
+def _is_fresh(etag: str, last_modified) -> bool:
+    # If-None-Match ima prednost nad If-Modified-Since (RFC 9110)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return _as_utc(last_modified) <= request.if_modified_since
+    return False
+
+
+def _not_modified(etag: str, last_modified) -> Response:
+    resp = Response(status=304)
+    resp.set_etag(etag, weak=True)
+    if last_modified is not None:
+        resp.last_modified = _as_utc(last_modified)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+def precondition(kind: str, obj_id: int, updated_at):
+    """
+    Jeftina provera pre učitavanja celog reda: dovoljan je SELECT id, updated_at.
+    Vraća 304 odgovor ako klijent već ima aktuelnu verziju, inače None.
+    U "hash" režimu ETag zavisi od tela odgovora, pa se ova provera preskače.
+    """
+    if _etag_mode() == "hash":
+        return None
+    etag = _version_etag(kind, obj_id, updated_at)
+    if _is_fresh(etag, updated_at):
+        return _not_modified(etag, updated_at)
+    return None
+
+
+def conditional(resp: Response, kind: str, obj_id: int, updated_at) -> Response:
+    """
+    Postavlja ETag i Last-Modified na gotov odgovor.
+    ETag je izveden iz updated_at ili (ETAG_MODE=hash) iz sadržaja odgovora;
+    strimovan odgovor se ne čita ceo radi hash-a, pa uvek dobija ETag iz verzije.
+    """
+    if _etag_mode() == "hash" and not resp.is_streamed:
+        etag = hashlib.sha1(resp.get_data()).hexdigest()
+    else:
+        etag = _version_etag(kind, obj_id, updated_at)
+
+    if _is_fresh(etag, updated_at):
+        return _not_modified(etag, updated_at)
+
+    resp.set_etag(etag, weak=True)
+    if updated_at is not None:
+        resp.last_modified = _as_utc(updated_at)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
@@ -0,0 +1,58 @@
+import json
+import re
+import uuid
+
+from flask import Response, stream_with_context
+
+
+EMPTY_BLOCK_TREE = '{"version":1,"blocks":[]}'
+
+
+class RawJSON:
+    """
+    Već serijalizovan JSON (npr. content iz baze, validiran pri upisu)
+    koji se ubacuje u odgovor doslovno, bez json.loads + ponovnog json.dumps.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+
+def dumps(payload) -> str:
+    raws = []
+    nonce = uuid.uuid4().hex
+
+    def default(o):
+        if isinstance(o, RawJSON):
+            raws.append(o.raw)
+            return f"{nonce}{len(raws) - 1}"
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    text = json.dumps(payload, default=default, separators=(",", ":"))
+    if not raws:
+        return text
+    return re.sub(f'"{nonce}(\\d+)"', lambda m: raws[int(m.group(1))], text)
+
+
+def json_response(payload, status: int = 200) -> Response:
+    return Response(dumps(payload), status=status, mimetype="application/json")
+
+
+def stream_list(key: str, items, serialize, extra=None, status: int = 200) -> Response:
+    """
+    Strimuje {"<key>": [...], ...extra} element po element,
+    tako da se ceo niz nikad ne drži u memoriji kao jedan string.
+    """
+
+    def generate():
+        yield '{"' + key + '":['
+        for i, item in enumerate(items):
+            yield ("," if i else "") + dumps(serialize(item))
+        yield "]"
+        for k, v in (extra or {}).items():
+            yield "," + json.dumps(k) + ":" + dumps(v)
+        yield "}"
+
+    return Response(stream_with_context(generate()), status=status, mimetype="application/json")
@@ -0,0 +1,361 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.files import private_dir
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+# multiprocess: worker upisuje izmene u METRICS_DIR najkasnije posle FLUSH_INTERVAL (i uvek pre scrape-a)
+FLUSH_INTERVAL = 1.0
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def merge(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _write_histogram(out, name, labels, hist: Histogram):
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        out.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    out.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    out.append(f"{name}_sum{_labels(**labels)} {hist.sum:.6f}")
+    out.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+
+def record_cache(cache: str, hit: bool):
+    """
+    Keševi (response_cache, user_cache) javljaju pogodak/promašaj za tekući zahtev.
+    """
+    if has_app_context():
+        current = g.get("metrics_request")
+        if current is not None:
+            current.cache[(cache, "hit" if hit else "miss")] += 1
+
+
+class _RequestMetrics:
+    __slots__ = ("started", "queries", "db_time", "cache")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache = defaultdict(int)
+
+
+class Metrics:
+    """
+    Metrike po endpointu (npr. posts.list_posts): latencija, broj i trajanje SQL upita,
+    veličina odgovora i pogoci keša. Izlaz je Prometheus tekst format na /metrics.
+    Brojači su po procesu. Sa METRICS_DIR (gunicorn.conf.py ga postavlja) svaki worker
+    upisuje svoje stanje u <METRICS_DIR>/<pid>.json, a /metrics sabira sve fajlove,
+    pa scrape koji stigne na bilo koji worker vraća zbir (i workera koji su u međuvremenu zamenjeni).
+    METRICS_SERVER_TIMING=1 dodaje Server-Timing zaglavlje (app, db) na svaki odgovor.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.server_timing = False
+        self.directory = None
+        # broj spojenih procesa kad je ovo zbir iz METRICS_DIR (aggregate)
+        self.processes = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pid = os.getpid()
+        self._flusher_pid = None
+        self._exit_hook = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.latency = {}
+            self.queries = {}
+            self.db_seconds = defaultdict(float)
+            self.response_bytes = {}
+            self.cache = defaultdict(int)
+            self._dirty = False
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", True)
+        app.config.setdefault("METRICS_SERVER_TIMING", False)
+
+        app.config.setdefault("METRICS_DIR", None)
+
+        self.enabled = bool(app.config["METRICS_ENABLED"])
+        self.server_timing = bool(app.config["METRICS_SERVER_TIMING"])
+        app.extensions["metrics"] = self
+        if not self.enabled:
+            return
+
+        directory = app.config["METRICS_DIR"]
+        self.directory = private_dir(directory) if directory else None
+        if self.directory and not self._exit_hook:
+            # worker koji se gasi upisuje i poslednje zahteve (inače do FLUSH_INTERVAL kasni)
+            atexit.register(self.flush)
+            self._exit_hook = True
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule("/metrics", "metrics", self.endpoint, methods=["GET"])
+
+        # na klasu Engine, pa se broje upiti i na primarnoj bazi i na replikama
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    def _before_request(self):
+        g.metrics_request = _RequestMetrics()
+
+    def _after_request(self, response):
+        current = g.pop("metrics_request", None)
+        if current is None:
+            return response
+
+        endpoint = request.endpoint or "unmatched"
+        method = request.method
+        status = response.status_code
+
+        if self.server_timing:
+            elapsed = time.perf_counter() - current.started
+            response.headers.add(
+                "Server-Timing",
+                f'app;dur={elapsed * 1000:.1f}, db;dur={current.db_time * 1000:.1f};desc="{current.queries} queries"',
+            )
+
+        if not response.is_streamed:
+            self._record(current, endpoint, method, status, response.calculate_content_length())
+            return response
+
+        # streaming (stream_list, sitemap, export): upiti i bajtovi nastaju dok se telo šalje,
+        # pa se zahtev beleži tek posle poslednjeg bloka (kao i provera u query_guard-u)
+        g.metrics_request = current
+        body = response.response
+        encoded = response.iter_encoded()
+
+        def counted():
+            size = 0
+            try:
+                for chunk in encoded:
+                    size += len(chunk)
+                    yield chunk
+            finally:
+                if hasattr(body, "close"):
+                    body.close()
+                self._record(current, endpoint, method, status, size)
+
+        response.response = counted()
+        return response
+
+    def _record(self, current, endpoint, method, status, size):
+        elapsed = time.perf_counter() - current.started
+        key = (endpoint, method)
+        self._check_fork()
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.queries.setdefault(key, Histogram(QUERY_BUCKETS)).observe(current.queries)
+            self.db_seconds[key] += current.db_time
+            if size is not None:
+                self.response_bytes.setdefault(key, Histogram(BYTES_BUCKETS)).observe(size)
+            for (cache, result), count in current.cache.items():
+                self.cache[(endpoint, cache, result)] += count
+            self._dirty = True
+        if self.directory and self._flusher_pid != self._pid:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        # jedna nit po procesu (niti ne preživljavaju fork)
+        self._flusher_pid = self._pid
+
+        def run():
+            while True:
+                time.sleep(FLUSH_INTERVAL)
+                self.flush()
+
+        threading.Thread(target=run, name="metrics-flush", daemon=True).start()
+
+    def _check_fork(self):
+        # worker nasleđuje stanje mastera (preload); njegovi brojači idu u novi <pid>.json
+        if self._pid != os.getpid():
+            self.reset()
+            self._pid = os.getpid()
+            if self.directory:
+                self.merge(self._read(self._path(self._pid)) or {})
+
+    def _path(self, pid) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "requests": [[*key, count] for key, count in self.requests.items()],
+                "latency": [[*key, h.counts, h.sum, h.count] for key, h in self.latency.items()],
+                "queries": [[*key, h.counts, h.sum, h.count] for key, h in self.queries.items()],
+                "dbSeconds": [[*key, seconds] for key, seconds in self.db_seconds.items()],
+                "responseBytes": [[*key, h.counts, h.sum, h.count] for key, h in self.response_bytes.items()],
+                "cache": [[*key, count] for key, count in self.cache.items()],
+            }
+
+    def merge(self, state: dict):
+        """
+        Dodaje stanje drugog procesa (iz state()); histogrami imaju iste granice.
+        """
+        with self._lock:
+            for endpoint, method, status, count in state.get("requests", ()):
+                self.requests[(endpoint, method, status)] += count
+            for name, buckets, target in (
+                ("latency", LATENCY_BUCKETS, self.latency),
+                ("queries", QUERY_BUCKETS, self.queries),
+                ("responseBytes", BYTES_BUCKETS, self.response_bytes),
+            ):
+                for endpoint, method, counts, total, count in state.get(name, ()):
+                    target.setdefault((endpoint, method), Histogram(buckets)).merge(counts, total, count)
+            for endpoint, method, seconds in state.get("dbSeconds", ()):
+                self.db_seconds[(endpoint, method)] += seconds
+            for endpoint, cache, result, count in state.get("cache", ()):
+                self.cache[(endpoint, cache, result)] += count
+
+    def flush(self):
+        """
+        Upisuje stanje ovog procesa u METRICS_DIR (privremeni fajl + os.replace).
+        """
+        if not self.directory:
+            return
+        self._check_fork()
+        with self._flush_lock:
+            # proces bez zahteva (npr. gunicorn master sa preload-om) ne pravi fajl
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            data = json.dumps(self.state(), separators=(",", ":"))
+            try:
+                fd, tmp = tempfile.mkstemp(dir=self.directory)
+            except FileNotFoundError:
+                # direktorijum je već obrisan pri gašenju (gunicorn on_exit)
+                return
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self._path(self._pid))
+
+    def aggregate(self) -> "Metrics":
+        """
+        Zbir svih <pid>.json fajlova u METRICS_DIR (uključujući ovaj proces, upisan upravo sada).
+        """
+        self.flush()
+        total = Metrics()
+        with os.scandir(self.directory) as it:
+            paths = [e.path for e in it if e.name.endswith(".json")]
+        for path in paths:
+            total.merge(self._read(path) or {})
+        total.processes = len(paths)
+        return total
+
+    def render(self) -> str:
+        out = []
+        with self._lock:
+            out.append("# HELP http_requests_total Requests per endpoint, method and status.")
+            out.append("# TYPE http_requests_total counter")
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                out.append(f"http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+            out.append("# HELP http_request_duration_seconds Request latency (streamed responses: until the last chunk is produced).")
+            out.append("# TYPE http_request_duration_seconds histogram")
+            for (endpoint, method), hist in sorted(self.latency.items()):
+                _write_histogram(out, "http_request_duration_seconds", {"endpoint": endpoint, "method": method}, hist)
+
+            out.append("# HELP http_request_db_queries SQL statements executed per request.")
+            out.append("# TYPE http_request_db_queries histogram")
+            for (endpoint, method), hist in sorted(self.queries.items()):
+                _write_histogram(out, "http_request_db_queries", {"endpoint": endpoint, "method": method}, hist)
+
+            out.append("# HELP http_request_db_seconds_total Time spent in SQL statements.")
+            out.append("# TYPE http_request_db_seconds_total counter")
+            for (endpoint, method), seconds in sorted(self.db_seconds.items()):
+                out.append(f"http_request_db_seconds_total{_labels(endpoint=endpoint, method=method)} {seconds:.6f}")
+
+            out.append("# HELP http_response_bytes Response body size (streamed responses: total of all chunks).")
+            out.append("# TYPE http_response_bytes histogram")
+            for (endpoint, method), hist in sorted(self.response_bytes.items()):
+                _write_histogram(out, "http_response_bytes", {"endpoint": endpoint, "method": method}, hist)
+
+            out.append("# HELP cache_requests_total Cache lookups per endpoint, cache and result.")
+            out.append("# TYPE cache_requests_total counter")
+            for (endpoint, cache, result), count in sorted(self.cache.items()):
+                out.append(f"cache_requests_total{_labels(endpoint=endpoint, cache=cache, result=result)} {count}")
+
+        out.append("# HELP process_id Worker process that served this scrape.")
+        out.append("# TYPE process_id gauge")
+        out.append(f"process_id {os.getpid()}")
+        if self.processes is not None:
+            out.append("# HELP metrics_processes Worker processes (current and replaced) summed in this output.")
+            out.append("# TYPE metrics_processes gauge")
+            out.append(f"metrics_processes {self.processes}")
+        return "\n".join(out) + "\n"
+
+    def endpoint(self):
+        source = self.aggregate() if self.directory else self
+        return Response(source.render(), mimetype="text/plain; version=0.0.4")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if has_app_context():
+        current = g.get("metrics_request")
+        if current is not None:
+            current.queries += 1
+            current.db_time += elapsed
@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import request
+
+from app.extensions import db
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_token(values) -> str:
+    """
+    Neproziran kursor: lista vrednosti kao base64(JSON).
+    """
+    raw = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(value: str) -> list:
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise CursorError("Invalid cursor")
+    if not isinstance(values, list):
+        raise CursorError("Invalid cursor")
+    return values
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return encode_token([created_at.isoformat(), row_id])
+
+
+def decode_cursor(value: str):
+    try:
+        created_at, row_id = decode_token(value)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError):
+        raise CursorError("Invalid cursor")
+
+
+def page_args():
+    """
+    Čita ?limit= i ?cursor= iz query stringa.
+    Vraća (limit, cursor) ili (None, None) kada klijent ne traži paginaciju.
+    """
+    limit = request.args.get("limit", type=int)
+    raw_cursor = (request.args.get("cursor") or "").strip()
+
+    if limit is None and not raw_cursor:
+        return None, None
+
+    limit = max(1, min(limit or DEFAULT_LIMIT, MAX_LIMIT))
+    cursor = decode_cursor(raw_cursor) if raw_cursor else None
+    return limit, cursor
+
+
+# SQLite čuva DateTime kao tekst u dva oblika: server_default (CURRENT_TIMESTAMP) bez delova
+# sekunde, SQLAlchemy parametri sa mikrosekundama; poređenje teksta bi red kursora vratilo ponovo
+_SQLITE_TIME = "%Y-%m-%d %H:%M:%f"
+
+
+def sort_key(column, value=None):
+    """
+    Izraz za ORDER BY/keyset poređenje kolone (ili vrednosti kursora za tu kolonu).
+    Na PostgreSQL-u sama kolona (indeks se koristi); na SQLite-u DateTime se svodi na isti tekstualni oblik.
+    """
+    expr = column if value is None else db.literal(value, column.type)
+    if isinstance(column.type, db.DateTime) and db.session.get_bind().dialect.name == "sqlite":
+        return db.func.strftime(_SQLITE_TIME, expr)
+    return expr
+
+
+def keyset_page(query, model, limit, cursor):
+    """
+    Keyset paginacija po (created_at, id) opadajuće.
+    Uslov (created_at, id) < (c_created_at, c_id) koristi kompozitni indeks,
+    pa je cena ista za svaku stranicu, bez obzira na dubinu (za razliku od OFFSET).
+    """
+    created_at = sort_key(model.created_at)
+    query = query.order_by(created_at.desc(), model.id.desc())
+
+    if limit is None:
+        # bez paginacije: redovi se čitaju u serijama dok se odgovor strimuje
+        return query.yield_per(500), None
+
+    if cursor is not None:
+        query = query.filter(
+            db.tuple_(created_at, model.id) < db.tuple_(sort_key(model.created_at, cursor[0]), cursor[1])
+        )
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,29 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.extensions import db
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimated_count(query):
+    """
+    Procena broja redova iz statistike planera (EXPLAIN), bez COUNT(*) nad celom tabelom.
+    Na bazama bez EXPLAIN (FORMAT JSON) vraća None.
+    """
+    if db.session.get_bind().dialect.name != "postgresql":
+        return None
+
+    statement = query.order_by(None).limit(None).statement
+    plan = db.session.execute(_Explain(statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
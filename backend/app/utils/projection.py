@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from flask import request
+from sqlalchemy.orm import load_only
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def parse_fields(columns: dict, heavy=("content",)):
+    """
+    Čita ?fields=title,slug ili ?view=summary.
+    Vraća listu API polja ili None kada klijent traži pun prikaz.
+    "summary" su sva polja osim teških (content).
+    """
+    raw = (request.args.get("fields") or "").strip()
+    view = (request.args.get("view") or "").strip().lower()
+
+    if raw:
+        fields = [f.strip() for f in raw.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in columns]
+        if unknown:
+            raise FieldsError(f"Unknown fields: {unknown}. Allowed: {list(columns)}")
+        if "id" not in fields:
+            fields.insert(0, "id")
+        return fields
+
+    if view == "summary":
+        return [f for f in columns if f not in heavy]
+    if view and view != "full":
+        raise FieldsError("Invalid view. Allowed: ['full', 'summary']")
+
+    return None
+
+
+def load_fields(model, columns: dict, fields, extra=()):
+    """
+    load_only opcija za SELECT samo traženih kolona.
+    id i created_at se uvek učitavaju jer ih koristi keyset paginacija;
+    extra su dodatne kolone (npr. strani ključevi za ?expand=).
+    """
+    attrs = {columns[f] for f in fields} | {"id", "created_at"} | set(extra)
+    return load_only(*[getattr(model, a) for a in attrs])
+
+
+def project(obj, columns: dict, fields):
+    data = {}
+    for f in fields:
+        value = getattr(obj, columns[f])
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data[f] = value
+    return data
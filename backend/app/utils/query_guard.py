@@ -0,0 +1,180 @@
+import os
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.expand import ExpandError, parse_expand
+
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUARD_MODES = {"off", "warn", "raise"}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Zahtev je prekoračio budžet upita ili ponovio isti upit (N+1) u QUERY_GUARD=raise režimu.
+    """
+
+
+def query_budget(limit: int, per_expand: int = 0):
+    """
+    Dekorator: najveći broj SQL naredbi za ovaj endpoint (proverava se samo kad je QUERY_GUARD uključen).
+    per_expand: dodatne naredbe po vezi iz ?expand= (selectinload za liste).
+    Kao i body_limit, samo označava funkciju.
+    """
+    def decorator(fn):
+        fn.query_budget = (limit, per_expand)
+        return fn
+    return decorator
+
+
+def _budget(view):
+    limit, per_expand = getattr(view, "query_budget", (None, 0))
+    if limit is None or not per_expand:
+        return limit
+    try:
+        return limit + per_expand * len(parse_expand())
+    except ExpandError:
+        return limit
+
+
+def _call_site():
+    """
+    Okviri iz app/ koda (ne iz SQLAlchemy/Flask-a) koji su doveli do naredbe, najdublji prvi.
+    """
+    return [
+        frame for frame in reversed(traceback.extract_stack()[:-2])
+        if frame.filename.startswith(APP_ROOT) and not frame.filename.endswith("query_guard.py")
+    ]
+
+
+def _format(frame):
+    return f"{os.path.relpath(frame.filename, os.path.dirname(APP_ROOT))}:{frame.lineno} in {frame.name}"
+
+
+class _Recorder:
+    def __init__(self):
+        self.statements = []
+        self.keys = []
+
+    def add(self, statement, executemany):
+        sql = " ".join(statement.split())
+        frames = _call_site()
+        self.statements.append((sql, executemany, _format(frames[0]) if frames else "<outside app>"))
+        # N+1 su ponovljena čitanja sa istog mesta: upisi (brojači po grupi) i executemany se ne broje,
+        # a isti SELECT sa različitih mesta (npr. session.get u user_loader-u i u kontroleru) nije petlja
+        if executemany or not sql.startswith("SELECT"):
+            self.keys.append(None)
+        else:
+            self.keys.append((sql, tuple((frame.filename, frame.lineno) for frame in frames)))
+
+    def repeated(self, threshold):
+        """
+        Isti SELECT (drugi parametri) sa istog mesta u kodu izdat threshold+ puta: tipičan N+1.
+        """
+        counts = Counter(key for key in self.keys if key is not None)
+        return {key: n for key, n in counts.items() if n >= threshold}
+
+    def report(self, title, threshold):
+        repeated = self.repeated(threshold)
+        lines = [f"{title} ({len(self.statements)} statements)"]
+        for i, ((sql, _, origin), key) in enumerate(zip(self.statements, self.keys), start=1):
+            flag = " [N+1]" if key in repeated else ""
+            lines.append(f"  {i:>3}. {origin}{flag}\n       {sql[:300]}")
+        return "\n".join(lines)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        recorder = g.get("query_guard")
+        if recorder is not None:
+            recorder.add(statement, executemany)
+
+
+class QueryGuard:
+    """
+    Razvojni/test režim (QUERY_GUARD=warn|raise): beleži svaku SQL naredbu zahteva
+    sa mestom u kodu odakle je izdata, otkriva N+1 (isti SELECT sa istog mesta QUERY_GUARD_N1_THRESHOLD+ puta)
+    i proverava @query_budget endpointa. warn loguje izveštaj, raise podiže QueryBudgetExceeded
+    (u testovima pada test). U produkciji je isključen (off) i ne kači nijedan event.
+    """
+
+    def init_app(self, app):
+        app.config.setdefault("QUERY_GUARD", "off")
+        app.config.setdefault("QUERY_GUARD_N1_THRESHOLD", 3)
+
+        mode = app.config["QUERY_GUARD"]
+        if mode not in GUARD_MODES:
+            raise ValueError(f"QUERY_GUARD must be one of {sorted(GUARD_MODES)}")
+        app.extensions["query_guard"] = self
+        if mode == "off":
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._check)
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+
+    def _before_request(self):
+        g.query_guard = _Recorder()
+
+    def _after_request(self, response):
+        recorder = g.get("query_guard")
+        if recorder is not None and not response.is_streamed:
+            response.headers["X-Query-Count"] = str(len(recorder.statements))
+        return response
+
+    def _check(self, exc=None):
+        """
+        teardown_request: streaming odgovori (stream_list) izvršavaju upite i posle after_request,
+        pa se budžet proverava tek kad je telo poslato.
+        """
+        recorder = g.pop("query_guard", None)
+        if recorder is None or exc is not None:
+            return
+
+        config = current_app.config
+        threshold = int(config["QUERY_GUARD_N1_THRESHOLD"])
+        view = current_app.view_functions.get(request.endpoint) if request.endpoint else None
+        budget = _budget(view)
+        count = len(recorder.statements)
+
+        problems = []
+        if budget is not None and count > budget:
+            problems.append(f"query budget {budget} exceeded")
+        repeated = recorder.repeated(threshold)
+        if repeated:
+            problems.append(f"possible N+1: {len(repeated)} statement(s) repeated {max(repeated.values())}x")
+        if not problems:
+            return
+
+        report = recorder.report(f"{request.method} {request.path} ({request.endpoint}): {'; '.join(problems)}", threshold)
+        if config["QUERY_GUARD"] == "raise":
+            raise QueryBudgetExceeded(report)
+        current_app.logger.warning(report)
+
+
+@contextmanager
+def capture_queries():
+    """
+    Za testove i konzolu: beleži naredbe izdate u bloku (unutar zahteva ili van njega).
+
+        with capture_queries() as queries:
+            client.get("/api/posts?siteId=1")
+        assert len(queries.statements) <= 2, queries.report("list_posts", 3)
+    """
+    recorder = _Recorder()
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        recorder.add(statement, executemany)
+
+    event.listen(Engine, "before_cursor_execute", listener)
+    try:
+        yield recorder
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
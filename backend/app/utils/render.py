@@ -0,0 +1,217 @@
+from markupsafe import escape
+
+from app.extensions import db
+from app.models import Template
+from app.utils.cache import LRUBackend
+
+
+# podrazumevane klase su iste kao u React blokovima (frontend/src/components/blocks)
+DEFAULT_LAYOUT = {
+    "page": {"container": "max-w-3xl mx-auto px-4 py-10", "header": "mb-8",
+             "title": "text-4xl font-bold text-gray-900 mb-4", "content": "prose max-w-none"},
+    "post": {"container": "max-w-3xl mx-auto px-4 py-10", "header": "mb-6",
+             "title": "text-3xl font-bold text-gray-900 mb-2", "content": "prose max-w-none"},
+}
+BUTTON_FALLBACK = {
+    "primary": "inline-flex items-center px-4 py-2 bg-gray-900 text-white rounded hover:bg-gray-800",
+    "secondary": "inline-flex items-center px-4 py-2 border rounded hover:bg-gray-50",
+}
+SAFE_URL_PREFIXES = ("http://", "https://", "mailto:", "/", "#", "./", "../")
+
+
+def _attr(cls) -> str:
+    cls = " ".join(str(cls or "").split())
+    return f' class="{escape(cls)}"' if cls else ""
+
+
+def _safe_url(value, fallback="#") -> str:
+    value = str(value or "").strip()
+    if not value:
+        return fallback
+    if value.lower().startswith(SAFE_URL_PREFIXES) or ":" not in value.split("/", 1)[0]:
+        return value
+    return fallback
+
+
+class RenderPlan:
+    """
+    Prevedena konfiguracija jednog šablona: gotovi class atributi po tipu bloka
+    i layout-u, tako da render bloka svodi na formatiranje stringa.
+    """
+
+    def __init__(self, config):
+        config = config if isinstance(config, dict) else {}
+        styles = config.get("styles") if isinstance(config.get("styles"), dict) else {}
+        layout = config.get("layout") if isinstance(config.get("layout"), dict) else {}
+
+        def style(name, fallback=""):
+            value = styles.get(name)
+            return value if isinstance(value, str) else fallback
+
+        self.layout = {
+            kind: {key: _attr(layout.get(key) or fallback) for key, fallback in defaults.items()}
+            for kind, defaults in DEFAULT_LAYOUT.items()
+        }
+        self.meta = _attr(layout.get("meta") or "text-sm text-gray-500 mb-6")
+
+        heading = styles.get("heading")
+        self.heading = {
+            level: _attr(heading if isinstance(heading, str) else (heading or {}).get(f"h{level}", ""))
+            for level in (1, 2, 3)
+        }
+
+        button = style("button").strip()
+        self.button = {variant: _attr(button or fallback) for variant, fallback in BUTTON_FALLBACK.items()}
+
+        self.hero = _attr(style("hero"))
+        self.section = style("section", "mb-6")
+        self.text = _attr(style("text"))
+        self.quote = _attr(style("quote"))
+        self.code = _attr(style("code"))
+        self.image = _attr(style("image"))
+
+
+def _render_hero(props, plan):
+    align = "text-center" if props.get("align") == "center" else "text-left"
+    subtitle = props.get("subtitle")
+    sub = f'<div class="text-sm text-gray-600 mt-1">{escape(subtitle)}</div>' if subtitle else ""
+    return (
+        f'<div{plan.hero}><div class="{align}">'
+        f'<div class="text-2xl font-bold">{escape(props.get("title") or "")}</div>{sub}'
+        f"</div></div>"
+    )
+
+
+def _render_section(props, plan, children=""):
+    parts = [plan.section] + [props.get(k) or "" for k in ("padding", "background", "rounded", "border")]
+    return f"<div{_attr(' '.join(p for p in parts if p))}>{children}</div>"
+
+
+def _render_heading(props, plan):
+    try:
+        level = min(3, max(1, int(props.get("level") or 2)))
+    except (TypeError, ValueError):
+        level = 2
+    return f"<h{level}{plan.heading[level]}>{escape(props.get('text') or '')}</h{level}>"
+
+
+def _render_text(props, plan):
+    return f"<p{plan.text}>{escape(props.get('text') or '')}</p>"
+
+
+def _render_quote(props, plan):
+    return f"<blockquote{plan.quote}>{escape(props.get('text') or '')}</blockquote>"
+
+
+def _render_code(props, plan):
+    return f"<pre{plan.code}><code>{escape(props.get('code') or '')}</code></pre>"
+
+
+def _render_button(props, plan):
+    variant = "secondary" if props.get("variant") == "secondary" else "primary"
+    href = escape(_safe_url(props.get("href")))
+    return f'<a href="{href}"{plan.button[variant]}>{escape(props.get("text") or "Button")}</a>'
+
+
+def _render_image(props, plan):
+    src = _safe_url(props.get("src"), fallback="")
+    if not src:
+        return ""
+    caption = props.get("caption")
+    figcaption = f"<figcaption>{escape(caption)}</figcaption>" if caption else ""
+    return (
+        f'<figure{plan.image}><img src="{escape(src)}" alt="{escape(props.get("alt") or "")}" loading="lazy">'
+        f"{figcaption}</figure>"
+    )
+
+
+BLOCK_RENDERERS = {
+    "hero": _render_hero,
+    "section": _render_section,
+    "heading": _render_heading,
+    "text": _render_text,
+    "quote": _render_quote,
+    "code": _render_code,
+    "button": _render_button,
+    "image": _render_image,
+}
+
+
+# zaštita za stari sadržaj upisan pre validacije dubine (block_schema)
+MAX_RENDER_DEPTH = 16
+
+
+def _render_list(blocks, plan, depth=1):
+    out = []
+    for block in blocks or []:
+        if not isinstance(block, dict):
+            continue
+        renderer = BLOCK_RENDERERS.get(block.get("type"))
+        if renderer is None:
+            continue
+        props = block.get("props") if isinstance(block.get("props"), dict) else {}
+        children = block.get("children")
+        if renderer is _render_section and isinstance(children, list) and depth < MAX_RENDER_DEPTH:
+            out.append(renderer(props, plan, _render_list(children, plan, depth + 1)))
+        else:
+            out.append(renderer(props, plan))
+    return "".join(out)
+
+
+def render_blocks(content, plan: RenderPlan) -> str:
+    """
+    HTML za stablo blokova; nepoznati tipovi se preskaču (kao BlockRenderer na frontendu).
+    """
+    return _render_list(content.get("blocks") if isinstance(content, dict) else None, plan)
+
+
+def render_document(kind: str, item, site, plan: RenderPlan) -> str:
+    layout = plan.layout[kind]
+    body = render_blocks(item.content, plan)
+    if body:
+        body = f'<div class="space-y-4">{body}</div>'
+    meta = f"<div{plan.meta}>Status: {escape(item.status)}</div>" if kind == "post" else ""
+
+    return (
+        "<!doctype html>"
+        '<html><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f"<title>{escape(item.title)} | {escape(site.name)}</title>"
+        "</head><body>"
+        f"<div{layout['container']}>"
+        f"<div{layout['header']}><h1{layout['title']}>{escape(item.title)}</h1>{meta}</div>"
+        f"<div{layout['content']}>{body}</div>"
+        "</div></body></html>"
+    )
+
+
+class PlanCache:
+    """
+    Prevedeni planovi po (template_id, updated_at): izmena šablona menja updated_at,
+    pa stari plan više nije dohvatljiv i ispada iz LRU-a.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.backend = LRUBackend(max_entries=max_entries, ttl=0)
+        self.default = RenderPlan(None)
+        self.compiled = 0
+
+    def get(self, template_id):
+        if template_id is None:
+            return self.default, None
+
+        updated_at = db.session.query(Template.updated_at).filter(Template.id == template_id).scalar()
+        if updated_at is None:
+            return self.default, None
+
+        key = (template_id, updated_at.isoformat())
+        plan = self.backend.get(key)
+        if plan is None:
+            config = db.session.query(Template.config).filter(Template.id == template_id).scalar()
+            plan = RenderPlan(config)
+            self.compiled += 1
+            self.backend.set(key, plan)
+        return plan, updated_at
+
+
+plan_cache = PlanCache()
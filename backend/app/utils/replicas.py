@@ -0,0 +1,238 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+
+from app.utils.db_pool import engine_options
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+WRITE_STAMP_KEY = "_db_write_at"
+
+# kašnjenje repa za PostgreSQL standby; 0 ako je sve primljeno i primenjeno (ili nije replika)
+_PG_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = create_engine(url, **engine_options(url))
+        self.healthy = True
+        self.lag = 0.0
+        self.weight = 1.0
+        self.current = 0.0
+        self.failures = 0
+        self.checked_at = 0.0
+        self.error = None
+        self.reads = 0
+
+    def status(self):
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lagSeconds": round(self.lag, 3),
+            "weight": round(self.weight, 3),
+            "failures": self.failures,
+            "reads": self.reads,
+            "error": self.error,
+        }
+
+
+class ReplicaRouter:
+    """
+    Rutiranje čitanja na replike (DATABASE_REPLICA_URLS):
+    - GET/HEAD/OPTIONS zahtevi čitaju sa replike, izbor je ponderisani round-robin
+      gde težina opada sa kašnjenjem replike (preko REPLICA_MAX_LAG_SECONDS težina je 0);
+    - upisi, flush i zahtevi van HTTP konteksta (CLI) idu na primarnu bazu;
+    - posle upisa, ista Flask sesija čita sa primarne REPLICA_STICKY_SECONDS sekundi,
+      a kasnije samo sa replika čije je kašnjenje manje od vremena od upisa.
+    Bez replika sve ide na primarnu bazu kao ranije.
+    """
+
+    def __init__(self):
+        self.replicas = []
+        self.sticky_seconds = 5.0
+        self.max_lag = 10.0
+        self.check_interval = 5.0
+        self.primary_reads = 0
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("DATABASE_REPLICA_URLS", "")
+        app.config.setdefault("REPLICA_STICKY_SECONDS", 5)
+        app.config.setdefault("REPLICA_MAX_LAG_SECONDS", 10)
+        app.config.setdefault("REPLICA_CHECK_INTERVAL", 5)
+
+        urls = [u.strip() for u in (app.config["DATABASE_REPLICA_URLS"] or "").split(",") if u.strip()]
+        self.replicas = [Replica(u) for u in urls]
+        self.sticky_seconds = float(app.config["REPLICA_STICKY_SECONDS"])
+        self.max_lag = float(app.config["REPLICA_MAX_LAG_SECONDS"])
+        self.check_interval = float(app.config["REPLICA_CHECK_INTERVAL"])
+
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+        app.after_request(self._stamp_write)
+        app.extensions["replica_router"] = self
+
+    # --- zdravlje replika ---
+
+    def _on_error(self, replica):
+        def handle_error(context):
+            if context.is_disconnect:
+                self._mark_failed(replica, "disconnect")
+        return handle_error
+
+    def _mark_failed(self, replica, error):
+        with self._lock:
+            replica.healthy = False
+            replica.weight = 0.0
+            replica.failures += 1
+            replica.error = error
+            replica.checked_at = time.monotonic()
+
+    def _check(self, replica):
+        try:
+            with replica.engine.connect() as conn:
+                lag = float(conn.execute(_PG_LAG).scalar() or 0) if conn.dialect.name == "postgresql" else 0.0
+        except Exception as e:
+            self._mark_failed(replica, type(e).__name__)
+            return
+        with self._lock:
+            replica.lag = lag
+            replica.healthy = lag <= self.max_lag
+            if not replica.healthy:
+                replica.weight = 0.0
+            else:
+                replica.weight = max(0.1, 1.0 - lag / self.max_lag) if self.max_lag > 0 else 1.0
+            replica.failures = 0
+            replica.error = None if replica.healthy else "lagging"
+            replica.checked_at = time.monotonic()
+
+    def refresh(self, force: bool = False):
+        """
+        Proverava replike čija je provera zastarela. Radi je samo jedna nit;
+        ostale u međuvremenu koriste poslednje poznato stanje.
+        Replika koja pada čeka duže do sledeće provere (do 60s).
+        """
+        if not self._check_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            for replica in self.replicas:
+                interval = min(60.0, self.check_interval * (2 ** min(replica.failures, 4)))
+                if force or now - replica.checked_at >= interval:
+                    self._check(replica)
+        finally:
+            self._check_lock.release()
+
+    # --- izbor ---
+
+    def _pick(self, fresh_within=None):
+        """
+        Glatki ponderisani round-robin (kao nginx) među zdravim replikama;
+        fresh_within: samo replike sa kašnjenjem manjim od toga (sekunde od poslednjeg upisa).
+        """
+        with self._lock:
+            candidates = [
+                r for r in self.replicas
+                if r.healthy and r.weight > 0 and (fresh_within is None or r.lag < fresh_within)
+            ]
+            if not candidates:
+                return None
+            total = sum(r.weight for r in candidates)
+            for r in candidates:
+                r.current += r.weight
+            best = max(candidates, key=lambda r: r.current)
+            best.current -= total
+            best.reads += 1
+            return best
+
+    def read_engine(self):
+        """
+        Engine za čitanje u tekućem zahtevu (isti za ceo zahtev) ili None za primarnu bazu.
+        """
+        if not self.replicas or not has_request_context() or request.method not in READ_METHODS:
+            return None
+        if g.get("db_primary"):
+            return None
+        if "db_replica" in g:
+            return g.db_replica
+
+        self.refresh()
+        replica = None
+        written_at = session.get(WRITE_STAMP_KEY)
+        elapsed = time.time() - written_at if written_at else None
+        if elapsed is None:
+            replica = self._pick()
+        elif elapsed >= self.sticky_seconds:
+            replica = self._pick(fresh_within=elapsed)
+
+        if replica is None:
+            with self._lock:
+                self.primary_reads += 1
+        g.db_replica = replica.engine if replica else None
+        return g.db_replica
+
+    @contextmanager
+    def primary(self):
+        """
+        Čitanja u bloku idu na primarnu bazu. Koristi se za podatke koji pune keš
+        (response_cache, user_cache, indeks pretrage): keš je upravo invalidiran upisom,
+        pa bi replika koja kasni vratila stari red koji bi se služio do isteka TTL-a.
+        """
+        if not self.replicas or not has_request_context():
+            yield
+            return
+        previous = g.get("db_primary", False)
+        g.db_primary = True
+        try:
+            yield
+        finally:
+            g.db_primary = previous
+
+    def mark_write(self):
+        if self.replicas and has_request_context():
+            g.db_wrote = True
+
+    def _stamp_write(self, response):
+        if g.get("db_wrote") and response.status_code < 400:
+            session[WRITE_STAMP_KEY] = time.time()
+        return response
+
+    def status(self):
+        with self._lock:
+            return {
+                "enabled": bool(self.replicas),
+                "stickySeconds": self.sticky_seconds,
+                "maxLagSeconds": self.max_lag,
+                "primaryReads": self.primary_reads,
+                "replicas": [r.status() for r in self.replicas],
+            }
+
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy sesija koja čitanja u GET zahtevima šalje na repliku (ReplicaRouter),
+    a flush i INSERT/UPDATE/DELETE uvek na primarnu bazu.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            router = current_app.extensions.get("replica_router")
+            if router is not None and router.replicas:
+                if self._flushing or getattr(clause, "is_dml", False):
+                    router.mark_write()
+                else:
+                    engine = router.read_engine()
+                    if engine is not None:
+                        return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
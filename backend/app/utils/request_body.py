@@ -0,0 +1,174 @@
+import json
+import re
+
+from flask import Request, current_app, g, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+READ_CHUNK = 64 * 1024
+DEFAULT_LIMIT_KEY = "REQUEST_BODY_MAX_BYTES"
+
+# van stringa: zagrada ili početak stringa
+_STRUCTURE = re.compile(rb'[\[\]{}"]')
+# unutar stringa: sve do zatvarajućeg navodnika ili "\\" na kraju bloka
+_STRING_BODY = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+
+class BodyError(ValueError):
+    """
+    Telo odbijeno pre parsiranja; create_app ga pretvara u JSON odgovor sa status kodom.
+    """
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def body_limit(config_key: str):
+    """
+    Dekorator: ograničenje veličine tela za ovaj endpoint (ključ u app.config).
+    Samo označava funkciju; proveru radi check_body_limit pre nego što se telo čita.
+    """
+    def decorator(fn):
+        fn.body_limit_key = config_key
+        return fn
+    return decorator
+
+
+def _limit_for_endpoint():
+    view = current_app.view_functions.get(request.endpoint) if request.endpoint else None
+    key = getattr(view, "body_limit_key", DEFAULT_LIMIT_KEY)
+    return current_app.config.get(key) or current_app.config.get(DEFAULT_LIMIT_KEY)
+
+
+def check_body_limit():
+    """
+    before_request: odbija prevelik zahtev (413) na osnovu Content-Length, bez čitanja tela.
+    Zahtevi bez Content-Length (chunked) se ograničavaju tokom čitanja (read_json, MAX_CONTENT_LENGTH).
+    """
+    limit = _limit_for_endpoint()
+    g.body_limit = limit
+    if limit and request.content_length is not None and request.content_length > limit:
+        return jsonify({"error": f"Request body too large (max {limit} bytes)"}), 413
+    return None
+
+
+class _StructureScanner:
+    """
+    Prati dubinu ugnježdavanja i broj objekata/nizova dok telo stiže u blokovima,
+    pa se "JSON bombe" odbijaju pre nego što json.loads napravi Python objekte.
+    Jedan prolaz: stanje (unutar stringa, escape, dubina, brojači) se prenosi
+    između blokova, pa se nijedan bajt ne čita dva puta ni za vrlo duge stringove.
+    """
+
+    def __init__(self, max_depth: int, max_nodes: int):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.depth = 0
+        self.nodes = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, chunk: bytes):
+        pos, end = 0, len(chunk)
+        while pos < end:
+            if self.in_string:
+                if self.escape:
+                    # znak posle "\" iz prethodnog bloka
+                    self.escape = False
+                    pos += 1
+                    continue
+                pos = _STRING_BODY.match(chunk, pos).end()
+                if pos == end:
+                    return
+                if chunk[pos] == 0x22:  # "
+                    self.in_string = False
+                else:
+                    # "\" je poslednji bajt bloka
+                    self.escape = True
+                pos += 1
+                continue
+
+            m = _STRUCTURE.search(chunk, pos)
+            if m is None:
+                return
+            pos = m.end()
+            token = m.group()
+            if token == b'"':
+                self.in_string = True
+            elif token in (b"{", b"["):
+                self.depth += 1
+                self.nodes += 1
+                if self.depth > self.max_depth:
+                    raise BodyError(f"JSON nesting deeper than {self.max_depth} levels")
+                if self.nodes > self.max_nodes:
+                    raise BodyError(f"JSON has more than {self.max_nodes} objects/arrays", 413)
+            else:
+                self.depth -= 1
+
+
+def read_json():
+    """
+    Zamena za request.get_json(silent=True) za velika tela (content stabla, bulk):
+    čita telo u blokovima od 64KB uz brojanje bajtova (radi i bez Content-Length),
+    usput proverava dubinu/broj čvorova i tek onda parsira.
+    Telo se skuplja u jedan bytearray (bez kopije pri spajanju); veličina je ograničena
+    limitom endpointa, a scanner odbija duboka/ogromna stabla pre json.loads.
+    Vraća None za ne-JSON ili neispravan JSON; podiže BodyError preko limita.
+    """
+    if not request.is_json:
+        return None
+
+    config = current_app.config
+    limit = g.get("body_limit") or _limit_for_endpoint()
+    scanner = _StructureScanner(config.get("JSON_MAX_DEPTH", 32), config.get("JSON_MAX_NODES", 100000))
+
+    body = bytearray()
+    stream = request.stream
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        if limit and len(body) + len(chunk) > limit:
+            raise BodyError(f"Request body too large (max {limit} bytes)", 413)
+        scanner.feed(chunk)
+        body += chunk
+
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class LimitedRequest(Request):
+    """
+    Limit endpointa (@body_limit ili REQUEST_BODY_MAX_BYTES) važi i dok Werkzeug čita stream,
+    pa i request.get_json/form na ostalim endpointima odbijaju chunked telo preko limita (413).
+    MAX_CONTENT_LENGTH ostaje gornja granica za sve.
+    """
+
+    def _body_limit(self):
+        if not current_app:
+            return None
+        ceiling = current_app.config.get("MAX_CONTENT_LENGTH")
+        limit = _limit_for_endpoint() if self.url_rule is not None else current_app.config.get(DEFAULT_LIMIT_KEY)
+        if limit and ceiling:
+            return min(limit, ceiling)
+        return limit or ceiling
+
+    @property
+    def max_content_length(self):
+        limit = self._body_limit()
+        # chunked: Werkzeug ne razlikuje telo od tačno limit bajtova od dužeg (čitanje posle
+        # limita je 413), pa stream dozvoljava bajt više, a get_data/read_json odbijaju > limit
+        if limit and self.content_length is None:
+            return limit + 1
+        return limit
+
+    def get_data(self, *args, **kwargs):
+        # Werkzeug chunked telo preko limita skraćuje na limit + 1; ovde postaje 413
+        data = super().get_data(*args, **kwargs)
+        limit = self._body_limit()
+        if self.content_length is None and limit and len(data) > limit:
+            raise RequestEntityTooLarge()
+        return data
@@ -0,0 +1,206 @@
+import re
+import threading
+from collections import defaultdict
+
+from sqlalchemy import text
+
+from app.extensions import db, replica_router
+from app.models import Page, Post
+from app.utils.pagination import CursorError, decode_token, encode_token
+
+
+# props blokova koji nose tekst; isti spisak koristi generisana kolona search_vector (migracija)
+TEXT_PROPS = ("title", "subtitle", "text", "code")
+KINDS = {"page": Page, "post": Post}
+
+# težine kao podrazumevane u ts_rank: naslov je A, tekst iz blokova B
+WEIGHT_TITLE = 1.0
+WEIGHT_BODY = 0.4
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value: str):
+    return _TOKEN.findall((value or "").lower())
+
+
+def extract_text(content) -> str:
+    """
+    Tekst iz stabla blokova: vrednosti TEXT_PROPS svakog bloka, redom (uključujući children).
+    """
+    parts = []
+    stack = [content.get("blocks") if isinstance(content, dict) else None]
+    while stack:
+        blocks = stack.pop()
+        for block in reversed(blocks) if isinstance(blocks, list) else ():
+            if not isinstance(block, dict):
+                continue
+            stack.append(block.get("children"))
+            props = block.get("props")
+            if isinstance(props, dict):
+                parts.extend(props[k] for k in TEXT_PROPS if isinstance(props.get(k), str))
+    return " ".join(parts)
+
+
+def encode_search_cursor(rank: float, kind: str, row_id: int) -> str:
+    return encode_token([rank, kind, row_id])
+
+
+def decode_search_cursor(value: str):
+    try:
+        rank, kind, row_id = decode_token(value)
+        return float(rank), str(kind), int(row_id)
+    except (TypeError, ValueError):
+        raise CursorError("Invalid cursor")
+
+
+def _after(item, cursor) -> bool:
+    # redosled: rank opadajuće, pa (kind, id) rastuće
+    rank, kind, row_id = cursor
+    return item["rank"] < rank or (item["rank"] == rank and (item["kind"], item["id"]) > (kind, row_id))
+
+
+class _SiteIndex:
+    """
+    Invertovani indeks jednog sajta: token -> {(kind, id): težina}.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.docs = {}
+
+    def add(self, kind, row_id, title, slug, status, content):
+        key = (kind, row_id)
+        self.docs[key] = {"title": title, "slug": slug, "status": status}
+        for weight, value in ((WEIGHT_TITLE, title), (WEIGHT_BODY, extract_text(content))):
+            for token in tokenize(value):
+                bucket = self.postings[token]
+                bucket[key] = bucket.get(key, 0.0) + weight
+
+    def search(self, tokens):
+        matches = None
+        for token in tokens:
+            keys = set(self.postings.get(token, ()))
+            matches = keys if matches is None else matches & keys
+            if not matches:
+                return []
+        return [(key, sum(self.postings[t][key] for t in tokens)) for key in matches]
+
+
+class SearchIndex:
+    """
+    Pure-Python zamena za tsvector pretragu (SQLite/testovi).
+    Indeks sajta se gradi lenjo pri prvoj pretrazi i odbacuje na svaku izmenu
+    sadržaja tog sajta (content_events), pa se sledeći upit gradi iz baze.
+    """
+
+    def __init__(self):
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, site_id: int):
+        with self._lock:
+            self._sites.pop(site_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._sites.clear()
+
+    def _build(self, site_id: int) -> _SiteIndex:
+        index = _SiteIndex()
+        # indeks se čuva do sledeće izmene, pa se gradi sa primarne baze
+        with replica_router.primary():
+            for kind, model in KINDS.items():
+                rows = db.session.query(model.id, model.title, model.slug, model.status, model.content).filter(
+                    model.site_id == site_id
+                )
+                for row in rows.yield_per(500):
+                    index.add(kind, row.id, row.title, row.slug, row.status, row.content)
+        return index
+
+    def _site(self, site_id: int) -> _SiteIndex:
+        with self._lock:
+            index = self._sites.get(site_id)
+        if index is None:
+            index = self._build(site_id)
+            with self._lock:
+                self._sites[site_id] = index
+        return index
+
+    def search(self, site_id, q, kinds, status, limit, cursor):
+        tokens = tokenize(q)
+        if not tokens:
+            return [], None
+
+        index = self._site(site_id)
+        items = []
+        for (kind, row_id), rank in index.search(tokens):
+            doc = index.docs[(kind, row_id)]
+            if kind not in kinds or (status and doc["status"] != status):
+                continue
+            item = {"kind": kind, "id": row_id, "rank": round(rank, 6), **doc}
+            if cursor is None or _after(item, cursor):
+                items.append(item)
+
+        items.sort(key=lambda x: (-x["rank"], x["kind"], x["id"]))
+        return _page(items, limit)
+
+
+search_index = SearchIndex()
+
+
+def _page(items, limit):
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_search_cursor(last["rank"], last["kind"], last["id"])
+
+
+_PG_BRANCH = """
+    SELECT '{kind}' AS kind, id, title, slug, status,
+           ts_rank_cd(search_vector, query) AS rank
+    FROM {table}, websearch_to_tsquery('simple', :q) AS query
+    WHERE site_id = :site_id AND search_vector @@ query {status_filter}
+"""
+
+
+def _pg_search(site_id, q, kinds, status, limit, cursor):
+    """
+    Generisana tsvector kolona + GIN (site_id, search_vector) indeks;
+    rangiranje ts_rank_cd, keyset po (rank, kind, id).
+    """
+    status_filter = "AND status = :status" if status else ""
+    branches = " UNION ALL ".join(
+        _PG_BRANCH.format(kind=kind, table=KINDS[kind].__tablename__, status_filter=status_filter)
+        for kind in sorted(kinds)
+    )
+    where = ""
+    params = {"q": q, "site_id": site_id, "status": status, "limit": limit + 1}
+    if cursor is not None:
+        where = "WHERE r.rank < :c_rank OR (r.rank = :c_rank AND (r.kind, r.id) > (:c_kind, :c_id))"
+        params.update(c_rank=cursor[0], c_kind=cursor[1], c_id=cursor[2])
+
+    sql = f"""
+        SELECT r.kind, r.id, r.title, r.slug, r.status, r.rank
+        FROM ({branches}) AS r
+        {where}
+        ORDER BY r.rank DESC, r.kind, r.id
+        LIMIT :limit
+    """
+    items = [
+        {"kind": r.kind, "id": r.id, "rank": float(r.rank), "title": r.title, "slug": r.slug, "status": r.status}
+        for r in db.session.execute(text(sql), params)
+    ]
+    return _page(items, limit)
+
+
+def search(site_id: int, q: str, kinds=("page", "post"), status=None, limit=20, cursor=None):
+    """
+    Rangirana pretraga naslova i teksta iz blokova unutar jednog sajta.
+    Vraća (items, next_cursor).
+    """
+    kinds = set(kinds)
+    if db.session.get_bind().dialect.name == "postgresql":
+        return _pg_search(site_id, q, kinds, status, limit, cursor)
+    return search_index.search(site_id, q, kinds, status, limit, cursor)
@@ -0,0 +1,16 @@
+from app.models import Site
+
+
+def site_to_dict(site: Site):
+    """
+    JSON oblik sajta, isti za /api/sites i odgovor posle uvoza.
+    """
+    return {
+        "id": site.id,
+        "name": site.name,
+        "slug": site.slug,
+        "createdById": site.created_by_id,
+        "config": site.config,
+        "createdAt": site.created_at.isoformat() if site.created_at else None,
+        "updatedAt": site.updated_at.isoformat() if site.updated_at else None,
+    }
@@ -0,0 +1,262 @@
+import gzip
+import json
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, union
+
+from app.extensions import db
+from app.models import Site, Template, Page, Post
+from app.utils import stats
+from app.utils.block_schema import check_content, validator_lookup
+from app.utils.bulk import ALLOWED_STATUS
+from app.utils.json_response import RawJSON, EMPTY_BLOCK_TREE, dumps
+from app.utils.slugs import slugify
+
+
+FORMAT_VERSION = 1
+STREAM_BATCH = 500
+IMPORT_BATCH = 1000
+CHUNK_SIZE = 64 * 1024
+MODELS = {"page": Page, "post": Post}
+
+
+class TransferError(ValueError):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _iso(dt):
+    return dt.isoformat() if dt else None
+
+
+def export_records(site: Site):
+    """
+    Generator zapisa za NDJSON: sajt, korišćeni šabloni, pa stranice i postovi.
+    Stranice/postovi se čitaju server-side kursorom (yield_per), content ide sirov iz baze.
+    """
+    yield {
+        "type": "site",
+        "formatVersion": FORMAT_VERSION,
+        "data": {"name": site.name, "slug": site.slug, "config": site.config},
+    }
+
+    used = union(
+        select(Page.template_id).where(Page.site_id == site.id, Page.template_id.isnot(None)),
+        select(Post.template_id).where(Post.site_id == site.id, Post.template_id.isnot(None)),
+    )
+    for t in Template.query.filter(Template.id.in_(used)).order_by(Template.id):
+        yield {
+            "type": "template",
+            "data": {"id": t.id, "name": t.name, "type": t.type, "config": t.config},
+        }
+
+    for kind, model in MODELS.items():
+        rows = model.query.filter(model.site_id == site.id).order_by(model.id).yield_per(STREAM_BATCH)
+        for p in rows:
+            yield {
+                "type": kind,
+                "data": {
+                    "templateId": p.template_id,
+                    "title": p.title,
+                    "slug": p.slug,
+                    "status": p.status,
+                    "content": RawJSON(p.content_text or EMPTY_BLOCK_TREE),
+                    "createdAt": _iso(p.created_at),
+                    "updatedAt": _iso(p.updated_at),
+                },
+            }
+
+
+def ndjson_chunks(records, compress: bool = False):
+    """
+    Spaja linije u blokove od ~64KB i (opciono) ih gzip-uje u letu.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    buffer = []
+    size = 0
+
+    for record in records:
+        line = dumps(record) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            data = "".join(buffer).encode()
+            buffer, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+
+    data = "".join(buffer).encode()
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def ndjson_lines(stream, compressed: bool = False, max_line: int = None):
+    """
+    Čita telo zahteva liniju po liniju, bez učitavanja celog fajla u memoriju.
+    max_line ograničava jednu liniju (i posle gzip raspakivanja).
+    """
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream)
+    n = 0
+    while True:
+        raw = stream.readline(max_line + 1) if max_line else stream.readline()
+        if not raw:
+            return
+        n += 1
+        if max_line and len(raw) > max_line:
+            raise TransferError(f"Line {n}: longer than {max_line} bytes", 413)
+        raw = raw.strip()
+        if raw:
+            yield raw
+
+
+def _parse_time(n, data, field):
+    """
+    ISO 8601 iz izvoza -> naivni UTC datetime (kao kolone created_at/updated_at), None ako polja nema.
+    """
+    value = data.get(field)
+    if value is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise TransferError(f"Line {n}: invalid {field} '{value}'")
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _site_from_record(data, slug_override, user_id):
+    name = (data.get("name") or "").strip()
+    slug = slugify(slug_override or data.get("slug") or name)
+    if not name or not slug:
+        raise TransferError("Line 1: site name and slug are required")
+    if Site.query.filter_by(slug=slug).first():
+        raise TransferError(f"Site slug '{slug}' already exists (use ?slug= to import under a new slug)", 409)
+
+    site = Site(name=name, slug=slug, config=data.get("config"), created_by_id=user_id)
+    db.session.add(site)
+    db.session.flush()
+    stats.site_created(site.id)
+    return site
+
+
+def _template_from_record(n, data, user_id):
+    """
+    Šabloni su globalni: postojeći šablon istog imena se ponovo koristi.
+    """
+    name = (data.get("name") or "").strip()
+    if not name:
+        raise TransferError(f"Line {n}: template name is required")
+    t = Template.query.filter_by(name=name).first()
+    if t is None:
+        t = Template(name=name, type=data.get("type") or "both", config=data.get("config"), created_by_id=user_id)
+        db.session.add(t)
+        db.session.flush()
+    return t.id
+
+
+def _content_row(n, kind, data, site_id, template_map, owner, validators, imported_at):
+    title = (data.get("title") or "").strip()
+    slug = slugify(data.get("slug") or title)
+    status = (data.get("status") or "draft").strip().lower()
+    content = data.get("content") or {"version": 1, "blocks": []}
+
+    if not title or not slug:
+        raise TransferError(f"Line {n}: title and slug are required")
+    if status not in ALLOWED_STATUS:
+        raise TransferError(f"Line {n}: invalid status '{status}'")
+    template_id = template_map.get(data.get("templateId"))
+    error = check_content(content, validators(template_id))
+    if error:
+        raise TransferError(f"Line {n}: {error}")
+
+    # vremena iz izvoza se čuvaju (ETag-ovi, sitemap lastmod, sortiranje); bez njih važi trenutak uvoza
+    created_at = _parse_time(n, data, "createdAt")
+    updated_at = _parse_time(n, data, "updatedAt")
+    created_at = created_at or updated_at or imported_at
+    updated_at = updated_at or created_at
+
+    return {
+        "site_id": site_id,
+        "template_id": template_id,
+        "title": title,
+        "slug": slug,
+        "content": content,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        **owner,
+    }
+
+
+def import_records(lines, user_id: int, slug_override: str = None):
+    """
+    Uvozi NDJSON u novi sajt: redovi se skupljaju u serije od IMPORT_BATCH
+    i upisuju jednim INSERT-om, sve u jednoj transakciji (commit radi pozivalac).
+    Autor/kreator uvezenog sadržaja je korisnik koji radi uvoz; createdAt/updatedAt se zadržavaju.
+    Vraća (site, {"page": n, "post": m}).
+    """
+    site = None
+    template_map = {}
+    seen = {kind: set() for kind in MODELS}
+    batches = {kind: [] for kind in MODELS}
+    counts = Counter()
+    owners = {"page": {"created_by_id": user_id}, "post": {"author_id": user_id}}
+    validators = validator_lookup()
+    # svi redovi serije imaju iste kolone, pa zapis bez vremena dobija vreme baze (kao server_default)
+    imported_at = db.session.execute(select(db.func.now(type_=db.DateTime))).scalar()
+
+    def flush(kind):
+        rows = batches[kind]
+        if rows:
+            # Core INSERT ... VALUES sa više redova: ORM executemany bi delio seriju po
+            # ključevima sa None vrednostima (template_id), pa bi jedan INSERT postao više njih
+            db.session.execute(insert(MODELS[kind].__table__).values(rows))
+            counts.update((kind, r["status"]) for r in rows)
+            rows.clear()
+
+    for n, raw in enumerate(lines, start=1):
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            raise TransferError(f"Line {n}: invalid JSON")
+        if not isinstance(record, dict):
+            raise TransferError(f"Line {n}: record must be an object")
+
+        rtype = record.get("type")
+        data = record.get("data") or {}
+
+        if site is None:
+            if rtype != "site":
+                raise TransferError("First line must be the site record")
+            site = _site_from_record(data, slug_override, user_id)
+        elif rtype == "template":
+            template_map[data.get("id")] = _template_from_record(n, data, user_id)
+        elif rtype in MODELS:
+            row = _content_row(n, rtype, data, site.id, template_map, owners[rtype], validators, imported_at)
+            if row["slug"] in seen[rtype]:
+                raise TransferError(f"Line {n}: duplicate {rtype} slug '{row['slug']}'", 409)
+            seen[rtype].add(row["slug"])
+            batches[rtype].append(row)
+            if len(batches[rtype]) >= IMPORT_BATCH:
+                flush(rtype)
+        else:
+            raise TransferError(f"Line {n}: unknown record type '{rtype}'")
+
+    if site is None:
+        raise TransferError("Empty import")
+
+    for kind in MODELS:
+        flush(kind)
+    for (kind, status), count in counts.items():
+        stats.content_created(kind, site.id, status, count)
+
+    totals = {kind: sum(c for (k, _), c in counts.items() if k == kind) for kind in MODELS}
+    return site, totals
@@ -0,0 +1,154 @@
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from markupsafe import escape
+
+from app.extensions import db
+from app.models import Page, Post, Site, SitemapEntry, SitemapVersion
+
+
+KINDS = {"page": Page, "post": Post}
+FETCH_BATCH = 2000
+CHUNK_SIZE = 64 * 1024
+# najviše URL-ova u jednom sitemap.xml (sitemaps.org); veći sajt dobija sitemap index
+MAX_URLS = 50000
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def _published(kind: str, site_id: int, slugs=None):
+    model = KINDS[kind]
+    q = select(model.site_id, literal(kind), model.slug, model.id, model.title, model.updated_at).where(
+        model.site_id == site_id, model.status == "published"
+    )
+    return q.where(model.slug.in_(slugs)) if slugs else q
+
+
+def sync(kind: str, site_id: int, *slugs):
+    """
+    Posle commit-a: osvežava unose samo za date slug-ove (stari i novi slug),
+    bez slug-ova ceo sajt za taj kind (npr. posle uvoza). Kroz posebnu konekciju na primarnu
+    bazu kao i ostali izvedeni podaci; ako se indeks promenio, u istoj transakciji pomera verziju sajta.
+    """
+    slugs = [s for s in slugs if s]
+    where = [SitemapEntry.site_id == site_id, SitemapEntry.kind == kind]
+    if slugs:
+        where.append(SitemapEntry.slug.in_(slugs))
+    columns = ["site_id", "kind", "slug", "item_id", "title", "updated_at"]
+    with db.engine.begin() as conn:
+        removed = conn.execute(delete(SitemapEntry).where(*where)).rowcount
+        added = conn.execute(insert(SitemapEntry).from_select(columns, _published(kind, site_id, slugs))).rowcount
+        # izmena nacrta ne dira indeks, pa ni verziju
+        if removed or added:
+            _touch(conn, site_id)
+
+
+def _touch(conn, site_id: int):
+    """
+    changed_at = now() za sajt (upsert kao u stats.bump).
+    """
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(SitemapVersion).values(
+            site_id=site_id, changed_at=func.now()
+        )
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[SitemapVersion.site_id], set_={"changed_at": stmt.excluded.changed_at},
+        ))
+        return
+    result = conn.execute(
+        update(SitemapVersion).where(SitemapVersion.site_id == site_id).values(changed_at=func.now())
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(SitemapVersion).values(site_id=site_id, changed_at=func.now()))
+
+
+def remove_site(site_id: int):
+    with db.engine.begin() as conn:
+        conn.execute(delete(SitemapEntry).where(SitemapEntry.site_id == site_id))
+        conn.execute(delete(SitemapVersion).where(SitemapVersion.site_id == site_id))
+
+
+def rebuild(site_id: int = None):
+    """
+    Ponovo puni indeks iz izvornih tabela (svi sajtovi ili jedan).
+    """
+    site_ids = [site_id] if site_id is not None else [s for (s,) in db.session.query(Site.id).order_by(Site.id)]
+    for sid in site_ids:
+        for kind in KINDS:
+            sync(kind, sid)
+    return {"sites": len(site_ids)}
+
+
+def version(site_id: int, kind: str = None):
+    """
+    (broj unosa, vreme poslednje izmene indeksa sajta) za ETag i Last-Modified, jedan upit.
+    Vreme izmene pomera i uklanjanje stavke, pa If-Modified-Since ne vraća zastareo 304.
+    """
+    count = select(func.count()).select_from(SitemapEntry).where(SitemapEntry.site_id == site_id)
+    if kind:
+        count = count.where(SitemapEntry.kind == kind)
+    changed_at = select(SitemapVersion.changed_at).where(SitemapVersion.site_id == site_id)
+    return db.session.execute(select(count.scalar_subquery(), changed_at.scalar_subquery())).one()
+
+
+def entries(site_id: int, kind: str = None, offset: int = 0, limit: int = None):
+    """
+    Unosi po (kind, slug), redosledom primarnog ključa; čitaju se u serijama dok se odgovor strimuje.
+    """
+    q = (
+        db.session.query(SitemapEntry.kind, SitemapEntry.slug, SitemapEntry.title, SitemapEntry.updated_at)
+        .filter(SitemapEntry.site_id == site_id)
+    )
+    if kind:
+        q = q.filter(SitemapEntry.kind == kind)
+    q = q.order_by(SitemapEntry.kind, SitemapEntry.slug)
+    if offset:
+        q = q.offset(offset)
+    if limit:
+        q = q.limit(limit)
+    return q.yield_per(FETCH_BATCH)
+
+
+def item_url(base: str, site_slug: str, kind: str, slug: str) -> str:
+    # iste putanje kao rute frontenda: /<site>/pages/<slug>, /<site>/posts/<slug>
+    return f"{base}/{site_slug}/{kind}s/{slug}"
+
+
+def _lastmod(dt) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _chunks(lines):
+    """
+    Spaja linije u blokove od ~64KB.
+    """
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def urlset(rows, base: str, site_slug: str):
+    def lines():
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n'
+        for row in rows:
+            loc = escape(item_url(base, site_slug, row.kind, row.slug))
+            yield f"<url><loc>{loc}</loc><lastmod>{_lastmod(row.updated_at)}</lastmod></url>\n"
+        yield "</urlset>\n"
+
+    return _chunks(lines())
+
+
+def sitemap_index(urls):
+    def lines():
+        yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n'
+        for url in urls:
+            yield f"<sitemap><loc>{escape(url)}</loc></sitemap>\n"
+        yield "</sitemapindex>\n"
+
+    return _chunks(lines())
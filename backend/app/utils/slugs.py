@@ -0,0 +1,10 @@
+import re
+
+
+def slugify(value: str) -> str:
+    """
+    Slug iz naslova/unosa: mala slova, cifre i crtice (isto pravilo kao kontroleri).
+    """
+    value = (value or "").strip().lower()
+    value = re.sub(r"[^a-z0-9]+", "-", value)
+    return value.strip("-")
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from sqlalchemy.orm import undefer
+
+from app.extensions import db
+from app.models import Page, Post, Template
+from app.utils.render import RenderPlan, render_document
+
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+KINDS = {"page": Page, "post": Post}
+FETCH_BATCH = 500
+# ispod ovoga se ne isplati podizanje procesa, render ide u glavnom procesu
+POOL_THRESHOLD = 200
+
+
+def item_path(kind: str, slug: str) -> str:
+    # iste putanje kao rute frontenda: /<site>/pages/<slug>, /<site>/posts/<slug>
+    return f"{kind}s/{slug}/index.html"
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("formatVersion") != FORMAT_VERSION:
+        return {}
+    return manifest
+
+
+def site_version(site) -> str:
+    """
+    Hash podataka sajta koji ulaze u HTML (ime u <title>, config); promena znači render svih stavki.
+    """
+    data = json.dumps([site.name, site.config], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+# plan po procesu, ključ (template_id, verzija); radnici ne pristupaju bazi
+_worker_plans = {}
+
+
+def _plan(template_key, config) -> RenderPlan:
+    plan = _worker_plans.get(template_key)
+    if plan is None:
+        plan = _worker_plans[template_key] = RenderPlan(config)
+    return plan
+
+
+def _render_chunk(out_dir, site_name, jobs):
+    """
+    Radnik: renderuje i upisuje fajlove, vraća (key, path, hash, written) po stavci.
+    Fajl se ne prepisuje ako je HTML identičan prethodnom (isti hash).
+    """
+    site = SimpleNamespace(name=site_name)
+    results = []
+    for job in jobs:
+        item = SimpleNamespace(title=job["title"], status=job["status"], content=job["content"])
+        html = render_document(job["kind"], item, site, _plan(job["templateKey"], job["config"])).encode("utf-8")
+        digest = hashlib.sha256(html).hexdigest()
+        target = os.path.join(out_dir, job["path"])
+        written = digest != job["previousHash"] or not os.path.exists(target)
+        if written:
+            _write_atomic(target, html)
+        results.append((job["key"], job["path"], digest, written))
+    return results
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for x in iterable:
+        chunk.append(x)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_site(site, out_dir: str, workers: int = None, force: bool = False) -> dict:
+    """
+    Renderuje sve objavljene stranice i postove sajta u out_dir.
+    manifest.json čuva verziju sajta i po stavci verziju (updated_at), verziju šablona, putanju i sha256 HTML-a;
+    ponovni build renderuje samo nove/izmenjene stavke (sve, ako se sajt promenio)
+    i briše fajlove stavki koje više nisu objavljene.
+    """
+    started = time.monotonic()
+    os.makedirs(out_dir, exist_ok=True)
+    loaded = {} if force else _load_manifest(out_dir)
+    previous = loaded.get("items") or {}
+    version = site_version(site)
+    site_changed = loaded.get("siteVersion") != version
+
+    templates = {
+        t.id: (t.updated_at.isoformat(), t.config)
+        for t in db.session.query(Template.id, Template.updated_at, Template.config)
+    }
+
+    items = {}
+    dirty = {kind: [] for kind in KINDS}
+    for kind, model in KINDS.items():
+        rows = db.session.query(model.id, model.slug, model.updated_at, model.template_id).filter(
+            model.site_id == site.id, model.status == "published"
+        )
+        for row in rows.yield_per(FETCH_BATCH):
+            key = f"{kind}:{row.id}"
+            template_version = templates[row.template_id][0] if row.template_id in templates else None
+            entry = {
+                "path": item_path(kind, row.slug),
+                "version": row.updated_at.isoformat(),
+                "template": [row.template_id, template_version],
+            }
+            old = previous.get(key)
+            if not site_changed and old and old.get("hash") and all(old.get(k) == v for k, v in entry.items()):
+                entry["hash"] = old["hash"]
+            else:
+                dirty[kind].append(row.id)
+            items[key] = entry
+
+    def jobs():
+        for kind, ids in dirty.items():
+            model = KINDS[kind]
+            for chunk in _chunks(ids, FETCH_BATCH):
+                q = model.query.options(undefer(model.content)).filter(model.id.in_(chunk))
+                for p in q:
+                    key = f"{kind}:{p.id}"
+                    template = templates.get(p.template_id)
+                    yield {
+                        "key": key,
+                        "kind": kind,
+                        "path": items[key]["path"],
+                        "title": p.title,
+                        "status": p.status,
+                        "content": p.content,
+                        "templateKey": (p.template_id, template[0]) if template else None,
+                        "config": template[1] if template else None,
+                        "previousHash": previous.get(key, {}).get("hash"),
+                    }
+
+    to_render = sum(len(ids) for ids in dirty.values())
+    chunk_size = 100
+    written = 0
+
+    if to_render >= POOL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_render_chunk, out_dir, site.name, chunk)
+                for chunk in _chunks(jobs(), chunk_size)
+            ]
+            results = [r for f in futures for r in f.result()]
+    else:
+        results = [r for chunk in _chunks(jobs(), chunk_size) for r in _render_chunk(out_dir, site.name, chunk)]
+
+    for key, _, digest, was_written in results:
+        items[key]["hash"] = digest
+        written += int(was_written)
+
+    # stavke koje su obrisane, vraćene u draft ili su promenile slug
+    live_paths = {entry["path"] for entry in items.values()}
+    removed = 0
+    for key, entry in previous.items():
+        path = entry.get("path")
+        if path and path not in live_paths:
+            try:
+                os.remove(os.path.join(out_dir, path))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            try:
+                os.rmdir(os.path.dirname(os.path.join(out_dir, path)))
+            except OSError:
+                pass
+
+    manifest = {"formatVersion": FORMAT_VERSION, "site": site.slug, "siteVersion": version, "items": items}
+    _write_atomic(
+        os.path.join(out_dir, MANIFEST),
+        json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8"),
+    )
+
+    return {
+        "items": len(items),
+        "rendered": to_render,
+        "written": written,
+        "unchanged": len(items) - to_render,
+        "removed": removed,
+        "seconds": round(time.monotonic() - started, 3),
+    }
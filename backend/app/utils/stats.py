@@ -0,0 +1,137 @@
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models import User, Site, Page, Post, SiteStat, StatCounter
+
+
+STATUSES = ("draft", "published")
+
+
+def _role_value(role) -> str:
+    return role.value if hasattr(role, "value") else str(role)
+
+
+def _site_column(kind: str, status: str):
+    return getattr(SiteStat, f"{kind}s_{status}")
+
+
+def bump(name: str, delta: int):
+    """
+    Atomski name += delta u stat_counters (upsert, bez read-modify-write).
+    Izvršava se u istoj transakciji kao i izmena koju broji.
+    """
+    if not delta:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(StatCounter).values(name=name, value=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatCounter.name],
+            set_={"value": StatCounter.value + delta},
+        )
+        db.session.execute(stmt)
+        return
+
+    result = db.session.execute(
+        update(StatCounter).where(StatCounter.name == name).values(value=StatCounter.value + delta)
+    )
+    if result.rowcount == 0:
+        db.session.add(StatCounter(name=name, value=delta))
+
+
+def bump_site(site_id: int, kind: str, status: str, delta: int):
+    if not delta:
+        return
+    column = _site_column(kind, status)
+    db.session.execute(
+        update(SiteStat)
+        .where(SiteStat.site_id == site_id)
+        .values({column: column + delta, SiteStat.total: SiteStat.total + delta})
+    )
+
+
+def content_created(kind: str, site_id: int, status: str, count: int = 1):
+    bump(f"{kind}s:{status}", count)
+    bump_site(site_id, kind, status, count)
+
+
+def content_deleted(kind: str, site_id: int, status: str, count: int = 1):
+    content_created(kind, site_id, status, -count)
+
+
+def content_status_changed(kind: str, site_id: int, old_status: str, new_status: str):
+    if old_status == new_status:
+        return
+    content_deleted(kind, site_id, old_status)
+    content_created(kind, site_id, new_status)
+
+
+def site_created(site_id: int):
+    db.session.add(SiteStat(site_id=site_id))
+    bump("sites", 1)
+
+
+def site_deleted(site_id: int):
+    """
+    Oduzima sav sadržaj sajta iz globalnih brojača (kaskadno brisanje stranica/postova).
+    """
+    row = db.session.get(SiteStat, site_id)
+    if row is not None:
+        for kind in ("page", "post"):
+            for status in STATUSES:
+                bump(f"{kind}s:{status}", -getattr(row, f"{kind}s_{status}"))
+        db.session.delete(row)
+    bump("sites", -1)
+
+
+def user_created(role):
+    bump(f"users:{_role_value(role)}", 1)
+
+
+def user_role_changed(old_role, new_role):
+    old_role, new_role = _role_value(old_role), _role_value(new_role)
+    if old_role == new_role:
+        return
+    bump(f"users:{old_role}", -1)
+    bump(f"users:{new_role}", 1)
+
+
+def rebuild():
+    """
+    Ponovo računa sve brojače iz izvornih tabela (popravka drift-a).
+    Svaka tabela se grupiše posebno, bez join-a pages x posts.
+    """
+    counters = {"sites": db.session.query(func.count(Site.id)).scalar() or 0}
+
+    for role, count in db.session.query(User.role, func.count(User.id)).group_by(User.role):
+        counters[f"users:{_role_value(role)}"] = int(count)
+
+    per_site = {site_id: SiteStat(site_id=site_id) for (site_id,) in db.session.query(Site.id)}
+    for kind, model in (("page", Page), ("post", Post)):
+        rows = (
+            db.session.query(model.site_id, model.status, func.count(model.id))
+            .group_by(model.site_id, model.status)
+            .all()
+        )
+        for site_id, status, count in rows:
+            counters[f"{kind}s:{status}"] = counters.get(f"{kind}s:{status}", 0) + int(count)
+            stat = per_site.get(site_id)
+            if stat is not None and status in STATUSES:
+                setattr(stat, f"{kind}s_{status}", (getattr(stat, f"{kind}s_{status}") or 0) + int(count))
+
+    for stat in per_site.values():
+        stat.total = sum(
+            getattr(stat, f"{kind}s_{status}") or 0 for kind in ("page", "post") for status in STATUSES
+        )
+
+    db.session.query(SiteStat).delete()
+    db.session.query(StatCounter).delete()
+    db.session.add_all(per_site.values())
+    db.session.add_all(StatCounter(name=name, value=value) for name, value in counters.items())
+    db.session.commit()
+
+    return {"counters": counters, "sites": len(per_site)}
@@ -0,0 +1,87 @@
+from flask_login import UserMixin
+
+from app.utils.cache import load_backend
+from app.utils.metrics import record_cache
+
+
+class CachedUser(UserMixin):
+    """
+    Lagana kopija identiteta i uloge korisnika za current_user.
+    Nije vezana za SQLAlchemy sesiju, pa može da se deli između zahteva.
+    """
+
+    def __init__(self, id, name, email, role):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.role = role
+
+
+class UserCache:
+    """
+    Kratkotrajni (TTL) keš korisnika za login_manager.user_loader,
+    da autentifikovani zahtevi ne idu u users tabelu pri svakom pozivu.
+    Invalidira se pri promeni uloge i pri logout-u. Sa više workera backend mora biti
+    deljeni (USER_CACHE_BACKEND), inače bi smenjeni admin zadržao prava u ostalim
+    procesima do isteka TTL-a.
+    Uloga se u kešu čuva kao vrednost (deljeni backend čuva samo JSON), a role_type
+    (UserRole) je vraća u enum pri čitanju.
+    """
+
+    def __init__(self):
+        self.backend = None
+        self.role_type = None
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app, role_type=None):
+        app.config.setdefault("USER_CACHE_ENABLED", True)
+        app.config.setdefault("USER_CACHE_TTL", 30)
+        app.config.setdefault("USER_CACHE_MAX_ENTRIES", 10000)
+        app.config.setdefault("USER_CACHE_BACKEND", None)
+
+        self.enabled = bool(app.config["USER_CACHE_ENABLED"])
+        self.backend = load_backend(app.config, "USER_CACHE_")
+        self.role_type = role_type
+        app.extensions["user_cache"] = self
+
+    def load(self, user_id: int, fetch):
+        """
+        fetch: funkcija (user_id) -> User ili None, poziva se samo na promašaj.
+        """
+        if self.enabled:
+            cached = self.backend.get(user_id)
+            record_cache("user", cached is not None)
+            if cached is not None:
+                self.hits += 1
+                return self._user(*cached)
+            self.misses += 1
+
+        user = fetch(user_id)
+        if user is None:
+            return None
+
+        identity = (user.id, user.name, user.email, user.role.value)
+        if self.enabled:
+            self.backend.set(user_id, identity)
+        return self._user(*identity)
+
+    def _user(self, id, name, email, role):
+        return CachedUser(id, name, email, self.role_type(role) if self.role_type else role)
+
+    def invalidate(self, user_id: int):
+        if self.backend is not None:
+            self.backend.delete(user_id)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": len(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": getattr(self.backend, "evictions", None),
+            "hitRate": round(self.hits / total, 4) if total else None,
+        }
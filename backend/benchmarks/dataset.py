@@ -0,0 +1,162 @@
+"""
+Sintetički skup podataka za benchmark: sajtovi, šabloni, korisnici i stranice/postovi
+sa realističnim stablima blokova (validnim po block_schema).
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import Page, Post, Site, Template, User, UserRole
+from app.utils import stats
+
+
+ADMIN_EMAIL = "bench-admin@example.com"
+PASSWORD = "bench-password"
+BATCH = 1000
+
+WORDS = (
+    "content site page post block layout editor publish draft template section theme "
+    "performance cache query index render stream search user admin design system hero "
+    "image button quote code heading text news update release guide tutorial notes"
+).split()
+
+TEMPLATES = (
+    ("Bench Default", "both", {"styles": {"hero": "py-12 bg-gray-50", "text": "leading-7"}}),
+    ("Bench Blog", "post", {"styles": {"heading": {"h2": "text-2xl font-bold"}, "quote": "italic border-l-4 pl-4"}}),
+    ("Bench Landing", "page", {"styles": {"button": "px-6 py-3 rounded-full"}, "blocks": {"allowed": [
+        "hero", "section", "heading", "text", "button", "image"]}}),
+)
+
+
+def _words(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _leaf(rng, allowed):
+    kind = rng.choice([t for t in ("heading", "text", "text", "quote", "code", "button", "image") if t in allowed])
+    if kind == "heading":
+        props = {"level": rng.randint(2, 3), "text": _words(rng, 5).title()}
+    elif kind == "text":
+        props = {"text": _words(rng, rng.randint(30, 120))}
+    elif kind == "quote":
+        props = {"text": _words(rng, 20)}
+    elif kind == "code":
+        props = {"code": "\n".join(f"print({i})" for i in range(rng.randint(3, 15)))}
+    elif kind == "button":
+        props = {"text": _words(rng, 2).title(), "href": "/contact", "variant": rng.choice(["primary", "secondary"])}
+    else:
+        props = {"src": f"https://picsum.photos/seed/{rng.randint(1, 10000)}/800/400", "alt": _words(rng, 4)}
+    return {"type": kind, "props": props}
+
+
+def block_tree(rng, allowed=None):
+    """
+    Hero, pa 3-8 blokova; deo su sekcije sa ugnježdenim blokovima (dubina do 3).
+    """
+    allowed = set(allowed or ("hero", "section", "heading", "text", "quote", "code", "button", "image"))
+    blocks = [{"type": "hero", "props": {"title": _words(rng, 4).title(), "subtitle": _words(rng, 10)}}]
+    for _ in range(rng.randint(3, 8)):
+        if "section" in allowed and rng.random() < 0.3:
+            children = [_leaf(rng, allowed) for _ in range(rng.randint(2, 4))]
+            if rng.random() < 0.3:
+                children.append({"type": "section", "props": {"padding": "p-4"},
+                                 "children": [_leaf(rng, allowed) for _ in range(2)]})
+            blocks.append({"type": "section", "props": {"padding": "p-6", "background": "bg-white"}, "children": children})
+        else:
+            blocks.append(_leaf(rng, allowed))
+    return {"version": 1, "blocks": blocks}
+
+
+def seed(sites=5, pages=50, posts=200, users=100, random_seed=1):
+    """
+    Upisuje skup podataka u praznu bazu (ili dodaje uz postojeći admin nalog) i vraća
+    ono što scenarijima treba: admin kredencijale, id-eve sajtova i slugove objavljenih postova.
+    """
+    rng = random.Random(random_seed)
+    # jedan hash za sve korisnike; scrypt za svakog bi trajao minutima
+    password_hash = generate_password_hash(PASSWORD, method="scrypt")
+    # created_at sa mikrosekundama: SQLite server_default now() ih nema, a keyset paginacija ih koristi
+    base_time = datetime.utcnow() - timedelta(days=365)
+
+    def stamp(i):
+        return base_time + timedelta(seconds=i * 37, microseconds=rng.randint(0, 999999))
+
+    admin = User.query.filter_by(email=ADMIN_EMAIL).first()
+    if admin is None:
+        admin = User(name="Bench Admin", email=ADMIN_EMAIL, password=password_hash, role=UserRole.ADMIN)
+        db.session.add(admin)
+        db.session.flush()
+
+    user_rows = [
+        {"name": f"Bench User {i}", "email": f"bench-user-{random_seed}-{i}@example.com", "password": password_hash,
+         "role": UserRole.USER, "created_at": stamp(i), "updated_at": stamp(i)}
+        for i in range(users)
+    ]
+    for i in range(0, len(user_rows), BATCH):
+        db.session.execute(insert(User), user_rows[i:i + BATCH])
+    author_ids = [admin.id] + [u.id for u in User.query.filter(User.email.like(f"bench-user-{random_seed}-%"))]
+
+    template_ids = {}
+    for name, ttype, config in TEMPLATES:
+        t = Template.query.filter_by(name=name).first()
+        if t is None:
+            t = Template(name=name, type=ttype, config=config, created_by_id=admin.id)
+            db.session.add(t)
+            db.session.flush()
+        allowed = (config.get("blocks") or {}).get("allowed")
+        template_ids[t.id] = (ttype, allowed)
+
+    def template_for(kind):
+        options = [(tid, allowed) for tid, (ttype, allowed) in template_ids.items() if ttype in (kind, "both")]
+        return rng.choice(options)
+
+    site_ids = []
+    published = []
+    for s in range(sites):
+        slug = f"bench-{random_seed}-{s}"
+        site = Site(name=f"Bench Site {s}", slug=slug, created_by_id=admin.id, config={"theme": "light"})
+        db.session.add(site)
+        db.session.flush()
+        site_ids.append(site.id)
+
+        for kind, model, count in (("page", Page, pages), ("post", Post, posts)):
+            rows = []
+            for i in range(count):
+                template_id, allowed = template_for(kind)
+                status = "published" if rng.random() < 0.8 else "draft"
+                row = {
+                    "site_id": site.id,
+                    "template_id": template_id,
+                    "title": _words(rng, 6).title(),
+                    "slug": f"{kind}-{i}",
+                    "status": status,
+                    "content": block_tree(rng, allowed),
+                    "created_at": stamp(i),
+                    "updated_at": stamp(i),
+                }
+                if kind == "page":
+                    row["created_by_id"] = admin.id
+                else:
+                    row["author_id"] = rng.choice(author_ids)
+                    if status == "published":
+                        published.append((site.id, row["slug"]))
+                rows.append(row)
+                if len(rows) >= BATCH:
+                    db.session.execute(insert(model), rows)
+                    rows = []
+            if rows:
+                db.session.execute(insert(model), rows)
+
+    db.session.commit()
+    stats.rebuild()
+
+    return {
+        "adminEmail": ADMIN_EMAIL,
+        "password": PASSWORD,
+        "siteIds": site_ids,
+        "publishedPosts": published,
+        "counts": {"sites": sites, "pages": sites * pages, "posts": sites * posts, "users": users + 1},
+    }
@@ -0,0 +1,288 @@
+"""
+Benchmark vrućih endpointa.
+
+    python -m benchmarks.run --seed-data --sites 5 --posts 200 --out results.json
+    python -m benchmarks.run --url http://127.0.0.1:5000 --out results.json      # pokrenut server
+    python -m benchmarks.run --compare baseline.json results.json                 # regresije
+
+Bez --url zahtevi idu kroz Flask test client nad DATABASE_URL (podrazumevano SQLite u memoriji,
+uz --seed-data). Broj SQL upita po zahtevu se čita iz Server-Timing zaglavlja (metrics),
+pa u --url režimu server treba da radi sa METRICS_SERVER_TIMING=1.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+
+SCENARIOS = ("get_post_by_slug", "list_posts", "overview", "login", "create_post")
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _queries(headers):
+    match = _QUERIES.search(headers.get("Server-Timing") or "")
+    return int(match.group(1)) if match else None
+
+
+class TestClientTarget:
+    def __init__(self, app):
+        self.app = app
+        self.clients = {}
+
+    def client(self, name):
+        if name not in self.clients:
+            self.clients[name] = self.app.test_client()
+        return self.clients[name]
+
+    def request(self, client, method, path, body=None):
+        r = self.client(client).open(path, method=method, json=body)
+        r.get_data()
+        return r.status_code, _queries(r.headers)
+
+
+class HTTPTarget:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.conns = {}
+        self.cookies = {}
+
+    def request(self, client, method, path, body=None):
+        conn = self.conns.get(client)
+        if conn is None:
+            conn = self.conns[client] = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if self.cookies.get(client):
+            headers["Cookie"] = self.cookies[client]
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        r = conn.getresponse()
+        r.read()
+        cookie = r.getheader("Set-Cookie")
+        if cookie:
+            self.cookies[client] = cookie.split(";", 1)[0]
+        if (r.getheader("Connection") or "").lower() == "close":
+            conn.close()
+            self.conns.pop(client)
+        return r.status, _queries(r.headers)
+
+
+def _scenario_requests(name, data, rng, counter):
+    """
+    (client, method, path, body) za jedan zahtev scenarija.
+    """
+    site_id = rng.choice(data["siteIds"])
+    if name == "get_post_by_slug":
+        sid, slug = rng.choice(data["publishedPosts"])
+        return "anon", "GET", f"/api/posts/site/{sid}/{slug}", None
+    if name == "list_posts":
+        return "anon", "GET", f"/api/posts?siteId={site_id}&status=published&limit=20&view=summary", None
+    if name == "overview":
+        return "admin", "GET", "/api/admin/overview", None
+    if name == "login":
+        return "login", "POST", "/api/auth/login", {"email": data["adminEmail"], "password": data["password"]}
+    if name == "create_post":
+        n = next(counter)
+        return "admin", "POST", "/api/posts", {
+            "siteId": site_id, "title": f"Bench Created {n}", "slug": f"bench-created-{os.getpid()}-{n}",
+            "status": "draft", "content": {"version": 1, "blocks": [{"type": "text", "props": {"text": "benchmark"}}]},
+        }
+    raise ValueError(name)
+
+
+def run_scenario(target, name, data, requests, warmup, rng, counter):
+    for _ in range(warmup):
+        target.request(*_scenario_requests(name, data, rng, counter))
+
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        args = _scenario_requests(name, data, rng, counter)
+        t = time.perf_counter()
+        status, n = target.request(*args)
+        latencies.append(time.perf_counter() - t)
+        if status >= 400:
+            errors += 1
+        if n is not None:
+            queries.append(n)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1) if elapsed else None,
+        "latencyMs": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else None,
+        },
+        "queriesPerRequest": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _discover(app):
+    """
+    Podaci za scenarije iz postojeće baze (kada se ne seed-uje u ovom pokretanju).
+    """
+    from app.models import Post, Site
+    from benchmarks.dataset import ADMIN_EMAIL, PASSWORD
+
+    with app.app_context():
+        sites = [s.id for s in Site.query.filter(Site.slug.like("bench-%")).order_by(Site.id)]
+        posts = [
+            (p.site_id, p.slug)
+            for p in Post.query.filter(Post.site_id.in_(sites), Post.status == "published").limit(10000)
+        ]
+    if not sites or not posts:
+        sys.exit("No benchmark data found; run with --seed-data (or python -m benchmarks.seed) first.")
+    return {"adminEmail": ADMIN_EMAIL, "password": PASSWORD, "siteIds": sites, "publishedPosts": posts, "counts": None}
+
+
+def _make_app():
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ["METRICS_SERVER_TIMING"] = "1"
+    from app import create_app
+    return create_app()
+
+
+def compare(baseline_path, current_path, threshold):
+    """
+    Poredi p95 i broj upita po zahtevu; vraća listu regresija (prazna = OK).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        old, new = base["latencyMs"]["p95"], result["latencyMs"]["p95"]
+        if old and new and new > old * (1 + threshold):
+            regressions.append(f"{name}: p95 {old}ms -> {new}ms")
+        old_q, new_q = base["queriesPerRequest"]["max"], result["queriesPerRequest"]["max"]
+        if old_q is not None and new_q is not None and new_q > old_q:
+            regressions.append(f"{name}: queries per request {old_q} -> {new_q}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API benchmark (hot endpoints).")
+    parser.add_argument("--url", help="Benchmark a running server instead of the Flask test client.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma separated scenario names.")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed-data", action="store_true", help="Seed the synthetic dataset before running.")
+    parser.add_argument("--sites", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=50, help="Pages per site.")
+    parser.add_argument("--posts", type=int, default=200, help="Posts per site.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--out", help="Write JSON results to this file (default: stdout).")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95 slowdown for --compare (0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print("OK" if not regressions else f"{len(regressions)} regression(s)")
+        return 1 if regressions else 0
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {sorted(unknown)}")
+
+    app = _make_app()
+    from app.extensions import db
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+
+    if args.seed_data:
+        from benchmarks.dataset import seed
+
+        with app.app_context():
+            if dialect == "sqlite":
+                db.create_all()
+            data = seed(args.sites, args.pages, args.posts, args.users, args.random_seed)
+    else:
+        data = _discover(app)
+
+    target = HTTPTarget(args.url) if args.url else TestClientTarget(app)
+    login = {"email": data["adminEmail"], "password": data["password"]}
+    status, _ = target.request("admin", "POST", "/api/auth/login", login)
+    if status != 200:
+        sys.exit(f"Admin login failed ({status})")
+
+    rng = random.Random(args.random_seed)
+    counter = iter(range(10 ** 9))
+    results = {}
+    for name in scenarios:
+        results[name] = run_scenario(target, name, data, args.requests, args.warmup, rng, counter)
+        r = results[name]
+        print(
+            f"{name:18} {r['rps']:>8} req/s  p50 {r['latencyMs']['p50']}ms  p95 {r['latencyMs']['p95']}ms  "
+            f"p99 {r['latencyMs']['p99']}ms  queries {r['queriesPerRequest']['mean']}  errors {r['errors']}",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "target": args.url or "test-client",
+            "database": dialect,
+            "dataset": data["counts"],
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Seed sintetičkog skupa podataka u DATABASE_URL (PostgreSQL posle "flask db upgrade", ili SQLite fajl):
+
+    python -m benchmarks.seed --sites 20 --pages 100 --posts 1000 --users 5000
+"""
+import argparse
+import json
+
+from benchmarks.dataset import seed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the benchmark dataset.")
+    parser.add_argument("--sites", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=50, help="Pages per site.")
+    parser.add_argument("--posts", type=int, default=200, help="Posts per site.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--create-tables", action="store_true", help="db.create_all() first (SQLite without migrations).")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if args.create_tables:
+            db.create_all()
+        data = seed(args.sites, args.pages, args.posts, args.users, args.random_seed)
+    print(json.dumps(data["counts"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Gunicorn konfiguracija za produkciju:  gunicorn -c gunicorn.conf.py wsgi:app
+
+Sve vrednosti se mogu menjati kroz env (GUNICORN_*). Reload bez prekida:
+- kill -HUP <master>: novi workeri sa novom konfiguracijom; kod se ponovo učitava
+  samo kad je GUNICORN_PRELOAD=0 (sa preload-om workeri nasleđuju app iz mastera)
+- kill -USR2 <master>, pa -WINCH i -QUIT starom masteru: zamena koda uz preload
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# procesi × niti; gthread worker drži keep-alive konekcije bez blokiranja niti
+workers = _env_int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+# create_app bira deljeni keš kad ima više workera, pa mora da zna stvarni broj
+os.environ["GUNICORN_WORKERS"] = str(workers)
+# deljeni keš (FileBackend) i metrike workera (/metrics sabira sve workere) traže privatne
+# direktorijume; ako nisu zadati, master pravi mkdtemp (0700, vlasnik ovaj proces) i briše ih pri gašenju
+_own_dirs = []
+for _name, _prefix in (("CACHE_DIR", "cms-cache-"), ("METRICS_DIR", "cms-metrics-")):
+    if not os.getenv(_name):
+        os.environ[_name] = tempfile.mkdtemp(prefix=_prefix)
+        _own_dirs.append(os.environ[_name])
+threads = _env_int("GUNICORN_THREADS", 4)
+worker_class = "gthread" if threads > 1 else "sync"
+worker_connections = _env_int("GUNICORN_WORKER_CONNECTIONS", 1000)
+
+# create_app se izvršava jednom u masteru, workeri dele memoriju (copy-on-write)
+reload = os.getenv("GUNICORN_RELOAD", "0") == "1"
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1" and not reload
+
+# keep-alive iza reverse proxy-ja/load balancera: duže od keepalive-a proxy-ja ka backendu
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# povremena zamena workera (curenje memorije), sa rasipanjem da se ne restartuju svi odjednom
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 5000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 500)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def post_fork(server, worker):
+    """
+    Konekcije otvorene u masteru (preload) ne smeju da se dele između procesa:
+    svaki worker počinje sa praznim pool-om (primarna baza i replike).
+    """
+    app = getattr(server.app, "callable", None)
+    if app is None:
+        return
+
+    from app.extensions import db, replica_router
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    for replica in replica_router.replicas:
+        replica.engine.dispose(close=False)
+
+
+def on_exit(server):
+    for path in _own_dirs:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,36 @@
+"""add keyset indexes to pages and posts
+
+Revision ID: 3f9a1c7e2b4d
+Revises: 72cb31c7d6c7
+Create Date: 2026-02-21 11:42:17.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c7e2b4d'
+down_revision = '72cb31c7d6c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pages', schema=None) as batch_op:
+        batch_op.create_index('ix_pages_site_created_id', ['site_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_pages_site_status_created_id', ['site_id', 'status', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_site_created_id', ['site_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_site_status_created_id', ['site_id', 'status', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_site_status_created_id')
+        batch_op.drop_index('ix_posts_site_created_id')
+
+    with op.batch_alter_table('pages', schema=None) as batch_op:
+        batch_op.drop_index('ix_pages_site_status_created_id')
+        batch_op.drop_index('ix_pages_site_created_id')
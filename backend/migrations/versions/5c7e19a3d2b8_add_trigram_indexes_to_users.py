@@ -0,0 +1,44 @@
+"""add trigram indexes to users
+
+Revision ID: 5c7e19a3d2b8
+Revises: e4a8c2f61d90
+Create Date: 2026-02-25 09:18:03.660412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7e19a3d2b8'
+down_revision = 'e4a8c2f61d90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_id', ['created_at', 'id'], unique=False)
+
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # GIN trigram indeksi pokrivaju ILIKE '%q%' i ILIKE 'q%' nad imenom i email-om
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_users_name_trgm', 'users', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_email_trgm', 'users', ['email'], unique=False,
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_users_email_trgm', table_name='users')
+        op.drop_index('ix_users_name_trgm', table_name='users')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created_id')
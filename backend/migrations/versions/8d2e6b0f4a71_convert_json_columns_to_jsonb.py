@@ -0,0 +1,78 @@
+"""convert json columns to jsonb
+
+Revision ID: 8d2e6b0f4a71
+Revises: 3f9a1c7e2b4d
+Create Date: 2026-02-24 09:18:52.604113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e6b0f4a71'
+down_revision = '3f9a1c7e2b4d'
+branch_labels = None
+depends_on = None
+
+
+EMPTY_BLOCK_TREE = '{"version":1,"blocks":[]}'
+
+
+def upgrade():
+    # JSONB postoji samo na PostgreSQL-u; na ostalim bazama kolone ostaju Text
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in ('pages', 'posts'):
+        op.alter_column(table, 'content', server_default=None)
+        op.alter_column(
+            table, 'content',
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB(),
+            postgresql_using='content::jsonb',
+            existing_nullable=False,
+        )
+        op.alter_column(table, 'content', server_default=sa.text(f"'{EMPTY_BLOCK_TREE}'::jsonb"))
+        op.create_index(
+            f'ix_{table}_content_gin', table, ['content'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'content': 'jsonb_path_ops'},
+        )
+
+    for table in ('sites', 'templates'):
+        op.alter_column(
+            table, 'config',
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB(),
+            postgresql_using='config::jsonb',
+            existing_nullable=True,
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in ('sites', 'templates'):
+        op.alter_column(
+            table, 'config',
+            existing_type=postgresql.JSONB(),
+            type_=sa.Text(),
+            postgresql_using='config::text',
+            existing_nullable=True,
+        )
+
+    for table in ('pages', 'posts'):
+        op.drop_index(f'ix_{table}_content_gin', table_name=table)
+        op.alter_column(table, 'content', server_default=None)
+        op.alter_column(
+            table, 'content',
+            existing_type=postgresql.JSONB(),
+            type_=sa.Text(),
+            postgresql_using='content::text',
+            existing_nullable=False,
+        )
+        op.alter_column(table, 'content', server_default=EMPTY_BLOCK_TREE)
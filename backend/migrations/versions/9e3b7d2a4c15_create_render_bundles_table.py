@@ -0,0 +1,44 @@
+"""create render bundles table
+
+Revision ID: 9e3b7d2a4c15
+Revises: 5c7e19a3d2b8
+Create Date: 2026-03-04 10:21:47.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3b7d2a4c15'
+down_revision = '5c7e19a3d2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # prazna tabela: paketi se prave pri prvom čitanju (ili: flask cms build-bundles)
+    op.create_table('render_bundles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('slug', sa.String(length=200), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=True),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('version', sa.DateTime(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['template_id'], ['templates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('site_id', 'kind', 'slug', name='uq_render_bundles_site_kind_slug')
+    )
+    with op.batch_alter_table('render_bundles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_render_bundles_template_id'), ['template_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('render_bundles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_render_bundles_template_id'))
+
+    op.drop_table('render_bundles')
@@ -0,0 +1,73 @@
+"""create stats tables
+
+Revision ID: b7c41e9d05a3
+Revises: 8d2e6b0f4a71
+Create Date: 2026-02-27 14:06:31.927455
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c41e9d05a3'
+down_revision = '8d2e6b0f4a71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('site_stats',
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('pages_draft', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('pages_published', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('posts_draft', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('posts_published', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('site_id')
+    )
+    with op.batch_alter_table('site_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_site_stats_total'), ['total'], unique=False)
+
+    op.create_table('stat_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # početno stanje iz postojećih podataka (kasnije: flask cms rebuild-stats)
+    op.execute("""
+        INSERT INTO site_stats (site_id, pages_draft, pages_published, posts_draft, posts_published, total)
+        SELECT id, pd, pp, sd, sp, pd + pp + sd + sp
+        FROM (
+            SELECT s.id,
+                (SELECT COUNT(*) FROM pages p WHERE p.site_id = s.id AND p.status = 'draft') AS pd,
+                (SELECT COUNT(*) FROM pages p WHERE p.site_id = s.id AND p.status = 'published') AS pp,
+                (SELECT COUNT(*) FROM posts p WHERE p.site_id = s.id AND p.status = 'draft') AS sd,
+                (SELECT COUNT(*) FROM posts p WHERE p.site_id = s.id AND p.status = 'published') AS sp
+            FROM sites s
+        ) AS counts
+    """)
+    op.execute("INSERT INTO stat_counters (name, value) SELECT 'sites', COUNT(*) FROM sites")
+    op.execute("""
+        INSERT INTO stat_counters (name, value)
+        SELECT 'users:' || CAST(role AS VARCHAR), COUNT(*) FROM users GROUP BY role
+    """)
+    op.execute("""
+        INSERT INTO stat_counters (name, value)
+        SELECT 'pages:' || status, COUNT(*) FROM pages GROUP BY status
+    """)
+    op.execute("""
+        INSERT INTO stat_counters (name, value)
+        SELECT 'posts:' || status, COUNT(*) FROM posts GROUP BY status
+    """)
+
+
+def downgrade():
+    op.drop_table('stat_counters')
+
+    with op.batch_alter_table('site_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_site_stats_total'))
+
+    op.drop_table('site_stats')
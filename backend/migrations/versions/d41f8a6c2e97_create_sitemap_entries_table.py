@@ -0,0 +1,43 @@
+"""create sitemap entries table
+
+Revision ID: d41f8a6c2e97
+Revises: 9e3b7d2a4c15
+Create Date: 2026-03-06 16:42:09.581377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f8a6c2e97'
+down_revision = '9e3b7d2a4c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sitemap_entries',
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('slug', sa.String(length=200), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('site_id', 'kind', 'slug')
+    )
+
+    # početno stanje iz postojećih podataka (kasnije: flask cms rebuild-sitemaps)
+    op.execute("""
+        INSERT INTO sitemap_entries (site_id, kind, slug, item_id, title, updated_at)
+        SELECT site_id, 'page', slug, id, title, updated_at FROM pages WHERE status = 'published'
+    """)
+    op.execute("""
+        INSERT INTO sitemap_entries (site_id, kind, slug, item_id, title, updated_at)
+        SELECT site_id, 'post', slug, id, title, updated_at FROM posts WHERE status = 'published'
+    """)
+
+
+def downgrade():
+    op.drop_table('sitemap_entries')
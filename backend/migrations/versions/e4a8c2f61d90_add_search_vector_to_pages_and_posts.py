@@ -0,0 +1,62 @@
+"""add search vector to pages and posts
+
+Revision ID: e4a8c2f61d90
+Revises: b7c41e9d05a3
+Create Date: 2026-02-24 10:05:41.552307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8c2f61d90'
+down_revision = 'b7c41e9d05a3'
+branch_labels = None
+depends_on = None
+
+
+# naslov (A) + tekstualni props blokova na svim nivoima (B); spisak props-a je isti kao app.utils.search.TEXT_PROPS
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(jsonb_to_tsvector(
+        'simple'::regconfig,
+        jsonb_path_query_array(content, 'strict $.** ? (exists(@.props.title)).props.title') ||
+        jsonb_path_query_array(content, 'strict $.** ? (exists(@.props.subtitle)).props.subtitle') ||
+        jsonb_path_query_array(content, 'strict $.** ? (exists(@.props.text)).props.text') ||
+        jsonb_path_query_array(content, 'strict $.** ? (exists(@.props.code)).props.code'),
+        '["string"]'
+    ), 'B')
+"""
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # btree_gin omogućava jedan GIN indeks nad (site_id, search_vector)
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+
+    for table in ('pages', 'posts'):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+        )
+        op.create_index(
+            f'ix_{table}_site_search',
+            table,
+            ['site_id', 'search_vector'],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    for table in ('posts', 'pages'):
+        op.drop_index(f'ix_{table}_site_search', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,35 @@
+"""create sitemap versions table
+
+Revision ID: f3b9d7c1a6e2
+Revises: d41f8a6c2e97
+Create Date: 2026-10-17 14:21:37.204118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9d7c1a6e2'
+down_revision = 'd41f8a6c2e97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sitemap_versions',
+    sa.Column('site_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['site_id'], ['sites.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('site_id')
+    )
+
+    # početno stanje: sadašnji trenutak, da bi klijenti posle migracije jednom ponovo povukli sitemap
+    op.execute("""
+        INSERT INTO sitemap_versions (site_id, changed_at)
+        SELECT id, CURRENT_TIMESTAMP FROM sites
+    """)
+
+
+def downgrade():
+    op.drop_table('sitemap_versions')
@@ -0,0 +1,89 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.extensions import bundle_cache, db, response_cache
+from app.models import User, UserRole
+from app.utils.block_schema import schema_cache
+from app.utils.render import plan_cache
+from app.utils.search import search_index
+
+
+ADMIN = ("admin@example.com", "admin-pass")
+USER = ("user@example.com", "user-pass")
+
+
+def _reset_caches():
+    # keševi su globalni (app.extensions), a svaki test ima novu bazu sa istim id-jevima
+    response_cache.backend = None
+    bundle_cache.backend = None
+    schema_cache.backend.clear()
+    plan_cache.backend.clear()
+    search_index.clear()
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """
+    Pravi app nad praznom SQLite bazom u tmp_path; env: dodatna podešavanja (npr. replike).
+    Seme: admin (ADMIN) i običan korisnik (USER).
+    """
+    def make(**env):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("QUERY_GUARD", "raise")
+        for key in ("GUNICORN_WORKERS", "DATABASE_REPLICA_URLS", "METRICS_DIR"):
+            monkeypatch.delenv(key, raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, str(value))
+
+        _reset_caches()
+        app = create_app()
+        app.config["TESTING"] = True
+        with app.app_context():
+            db.create_all()
+            for (email, password), role in ((ADMIN, UserRole.ADMIN), (USER, UserRole.USER)):
+                name = email.split("@")[0]
+                db.session.add(User(name=name, email=email, password=generate_password_hash(password), role=role))
+            db.session.commit()
+        return app
+
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+def login(client, credentials):
+    email, password = credentials
+    r = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert r.status_code == 200, r.get_json()
+    return client
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(app):
+    return login(app.test_client(), ADMIN)
+
+
+@pytest.fixture
+def user_client(app):
+    return login(app.test_client(), USER)
+
+
+@pytest.fixture
+def site(admin_client):
+    r = admin_client.post("/api/sites", json={"name": "Demo", "slug": "demo", "config": {"theme": "light"}})
+    assert r.status_code == 201, r.get_json()
+    return r.get_json()["site"]
+
+
+def text_block(text):
+    return {"version": 1, "blocks": [{"type": "text", "props": {"text": text}}]}
@@ -0,0 +1,52 @@
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import User, UserRole
+
+
+def _seed(app, *names):
+    with app.app_context():
+        db.session.add_all(
+            User(name=name, email=f"{name.lower()}@example.org", password=generate_password_hash("x"), role=UserRole.USER)
+            for name in names
+        )
+        db.session.commit()
+
+
+def _pages(client, query):
+    names, cursor = [], None
+    for _ in range(10):
+        body = client.get(f"/api/admin/users?{query}&limit=2" + (f"&cursor={cursor}" if cursor else "")).get_json()
+        names += [u["name"] for u in body["users"]]
+        cursor = body["nextCursor"]
+        if not cursor:
+            return names
+    raise AssertionError("cursor did not advance")
+
+
+def test_cursor_walks_every_sort(app, admin_client):
+    _seed(app, "Carol", "Alice", "Bob", "Dave")
+    everyone = {"Carol", "Alice", "Bob", "Dave", "admin", "user"}
+
+    by_name = _pages(admin_client, "sort=name_asc")
+    assert by_name == sorted(by_name) and set(by_name) == everyone
+    assert _pages(admin_client, "sort=name_desc") == by_name[::-1]
+    # isti created_at (sekunda) za sve: redosled razrešava id
+    newest = _pages(admin_client, "sort=createdAt_desc")
+    assert len(newest) == len(everyone) and set(newest) == everyone
+    assert _pages(admin_client, "sort=createdAt_asc") == newest[::-1]
+
+
+def test_search_modes_and_role_filter(app, admin_client, user_client):
+    _seed(app, "Anna", "Hanna", "Bob")
+
+    contains = admin_client.get("/api/admin/users?q=anna").get_json()["users"]
+    prefix = admin_client.get("/api/admin/users?q=anna&mode=prefix").get_json()["users"]
+    assert {u["name"] for u in contains} == {"Anna", "Hanna"}
+    assert [u["name"] for u in prefix] == ["Anna"]
+    assert admin_client.get("/api/admin/users?q=100%25").get_json()["users"] == []
+
+    admins = admin_client.get("/api/admin/users?role=admin").get_json()["users"]
+    assert [u["email"] for u in admins] == ["admin@example.com"]
+    assert admin_client.get("/api/admin/users?cursor=zzz").status_code == 400
+    assert user_client.get("/api/admin/users").status_code == 403
@@ -0,0 +1,76 @@
+import json
+import random
+
+import pytest
+
+from app.utils.block_schema import ContentValidator
+from benchmarks import run
+from benchmarks.dataset import TEMPLATES, block_tree
+
+
+def _result(p95, queries):
+    return {"latencyMs": {"p95": p95}, "queriesPerRequest": {"max": queries}}
+
+
+def _write(path, results):
+    path.write_text(json.dumps({"results": results}))
+    return str(path)
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    return _write(tmp_path / "baseline.json", {"list_posts": _result(10.0, 3), "login": _result(50.0, 1)})
+
+
+def test_compare_within_threshold_is_ok(tmp_path, baseline, capsys):
+    current = _write(tmp_path / "current.json", {"list_posts": _result(11.9, 3), "login": _result(40.0, 1)})
+    assert run.compare(baseline, current, 0.2) == []
+    assert run.main(["--compare", baseline, current]) == 0
+    assert capsys.readouterr().out.strip() == "OK"
+
+
+def test_compare_flags_p95_and_query_regressions(tmp_path, baseline):
+    current = _write(tmp_path / "current.json", {"list_posts": _result(12.5, 3), "login": _result(50.0, 2)})
+    regressions = run.compare(baseline, current, 0.2)
+    assert regressions == ["list_posts: p95 10.0ms -> 12.5ms", "login: queries per request 1 -> 2"]
+    assert run.main(["--compare", baseline, current, "--threshold", "0.3"]) == 1
+
+
+def test_compare_ignores_new_scenarios(tmp_path, baseline):
+    current = _write(tmp_path / "current.json", {"overview": _result(500.0, 20)})
+    assert run.compare(baseline, current, 0.2) == []
+
+
+def test_percentile():
+    assert run.percentile([], 95) is None
+    assert run.percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert run.percentile([1.0, 2.0], 95) == pytest.approx(1.95)
+
+
+@pytest.mark.parametrize("name,ttype,config", TEMPLATES)
+def test_generated_block_trees_are_valid(app, name, ttype, config):
+    allowed = (config.get("blocks") or {}).get("allowed")
+    validator = ContentValidator(allowed)
+    rng = random.Random(7)
+    with app.app_context():
+        for _ in range(50):
+            validator.validate(block_tree(rng, allowed))
+
+
+def test_seed_and_run_against_test_client(make_app, tmp_path, monkeypatch):
+    make_app()
+    monkeypatch.setenv("METRICS_SERVER_TIMING", "1")
+    out = tmp_path / "results.json"
+    argv = [
+        "--seed-data", "--sites", "1", "--pages", "3", "--posts", "8", "--users", "2",
+        "--requests", "3", "--warmup", "1", "--out", str(out),
+    ]
+    assert run.main(argv) == 0
+
+    report = json.loads(out.read_text())
+    assert report["meta"]["dataset"] == {"sites": 1, "pages": 3, "posts": 8, "users": 3}
+    assert set(report["results"]) == set(run.SCENARIOS)
+    for name, result in report["results"].items():
+        assert result["errors"] == 0, name
+        assert result["requests"] == 3
+        assert result["queriesPerRequest"]["max"] is not None, name
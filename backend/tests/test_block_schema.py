@@ -0,0 +1,98 @@
+import pytest
+
+from app.utils.block_schema import ContentError, ContentValidator
+from app.utils.query_guard import capture_queries
+from tests.conftest import text_block
+
+
+def _blocks(*blocks):
+    return {"version": 1, "blocks": list(blocks)}
+
+
+VALID = _blocks(
+    {"id": "h1", "type": "hero", "props": {"title": "Hi", "align": "center"}},
+    {"type": "section", "props": {"padding": "p-4"}, "children": [
+        {"type": "heading", "props": {"level": 2, "text": "Title"}},
+        {"type": "button", "props": {"text": "Go", "href": "/x", "variant": "primary"}},
+    ]},
+)
+
+
+def test_valid_tree_passes(app):
+    with app.app_context():
+        ContentValidator().validate(VALID)
+
+
+@pytest.mark.parametrize("content, message", [
+    ([], "content must be an object"),
+    ({"version": 2, "blocks": []}, "content.version must be 1"),
+    ({"version": 1, "blocks": [], "x": 1}, "unknown keys"),
+    (_blocks({"type": "video"}), "unknown block type 'video'"),
+    (_blocks("text"), "block must be an object"),
+    (_blocks({"type": "text", "props": {"color": "red"}}), "unknown prop 'color'"),
+    (_blocks({"type": "heading", "props": {"level": 7}}), "content.blocks[0].props.level"),
+    (_blocks({"type": "heading", "props": {"level": True}}), "must be an integer"),
+    (_blocks({"type": "hero", "props": {"align": "right"}}), "must be one of"),
+    (_blocks({"type": "text", "children": []}), "cannot have children"),
+    (_blocks({"type": "text", "id": "x" * 65}), ".id: must be a string"),
+])
+def test_invalid_tree_reports_path(app, content, message):
+    with app.app_context(), pytest.raises(ContentError) as e:
+        ContentValidator().validate(content)
+    assert message in str(e.value)
+
+
+def test_depth_block_count_and_size_limits(app):
+    nested = {"type": "text"}
+    for _ in range(4):
+        nested = {"type": "section", "children": [nested]}
+
+    with app.app_context():
+        app.config["CONTENT_MAX_DEPTH"] = 4
+        with pytest.raises(ContentError, match="nesting deeper than 4"):
+            ContentValidator().validate(_blocks(nested))
+
+        app.config["CONTENT_MAX_BLOCKS"] = 3
+        with pytest.raises(ContentError, match="more than 3 blocks"):
+            ContentValidator().validate(_blocks(*[{"type": "text"}] * 4))
+
+        app.config["CONTENT_MAX_BYTES"] = 100
+        with pytest.raises(ContentError, match="larger than 100 bytes"):
+            ContentValidator().validate(text_block("x" * 200))
+
+
+def test_template_restricts_block_types(admin_client, site):
+    t = admin_client.post("/api/templates", json={"name": "Plain", "config": {"blocks": {"allowed": ["text"]}}})
+    template_id = (t.get_json().get("template") or t.get_json())["id"]
+    page = {"siteId": site["id"], "title": "P", "templateId": template_id}
+
+    r = admin_client.post("/api/pages", json={**page, "content": _blocks({"type": "hero"})})
+    assert r.status_code == 400
+    assert "not allowed by the template" in r.get_json()["error"]
+
+    assert admin_client.post("/api/pages", json={**page, "content": text_block("ok")}).status_code == 201
+
+
+def test_empty_allowed_list_allows_no_types(app, admin_client, site):
+    with app.app_context():
+        with pytest.raises(ContentError, match="not allowed by the template"):
+            ContentValidator([]).validate(text_block("x"))
+        ContentValidator(None).validate(text_block("x"))
+
+    t = admin_client.post("/api/templates", json={"name": "Locked", "config": {"blocks": {"allowed": []}}}).get_json()
+    page = {"siteId": site["id"], "title": "P", "templateId": t["template"]["id"]}
+    assert admin_client.post("/api/pages", json={**page, "content": text_block("x")}).status_code == 400
+    assert admin_client.post("/api/pages", json={**page, "content": {"version": 1, "blocks": []}}).status_code == 201
+
+
+def test_cached_validator_skips_template_config_query(admin_client, site):
+    t = admin_client.post("/api/templates", json={"name": "Plain", "config": {"blocks": {"allowed": ["text"]}}}).get_json()
+    page = {"siteId": site["id"], "templateId": t["template"]["id"], "content": text_block("x")}
+    admin_client.post("/api/pages", json={**page, "title": "First"})
+
+    with capture_queries() as queries:
+        assert admin_client.post("/api/pages", json={**page, "title": "Second"}).status_code == 201
+
+    template_reads = [sql for sql, _, _ in queries.statements if "FROM templates" in sql]
+    # jedino učitavanje šablona (postojanje); validator se nalazi po (id, updated_at)
+    assert len(template_reads) == 1
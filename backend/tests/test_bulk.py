@@ -0,0 +1,111 @@
+from app.utils import bulk
+from app.utils.query_guard import capture_queries
+from tests.conftest import text_block
+
+
+def _slugs(client, site_id):
+    pages = client.get(f"/api/pages?siteId={site_id}").get_json()["pages"]
+    return {p["id"]: p["slug"] for p in pages}
+
+
+def _create_pages(client, site_id, *titles):
+    r = client.post("/api/pages/bulk", json={"items": [{"siteId": site_id, "title": t} for t in titles]})
+    assert r.status_code == 200
+    return [item["id"] for item in r.get_json()["results"]]
+
+
+def test_bulk_create_reports_each_item(admin_client, site):
+    items = [
+        {"siteId": site["id"], "title": "First", "status": "published", "content": text_block("hi")},
+        {"siteId": 999, "title": "No site"},
+        {"siteId": site["id"], "title": "first"},
+        {"title": "No site id"},
+        {"siteId": site["id"], "title": "Bad template", "templateId": 77},
+        {"siteId": site["id"], "title": "Bad content", "content": {"version": 1, "blocks": [{"type": "nope"}]}},
+        {"siteId": site["id"], "title": "Second"},
+    ]
+    r = admin_client.post("/api/pages/bulk", json={"items": items})
+
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [x["status"] for x in body["results"]] == [201, 404, 409, 400, 404, 400, 201]
+    assert (body["succeeded"], body["failed"]) == (2, 5)
+    assert sorted(_slugs(admin_client, site["id"]).values()) == ["first", "second"]
+
+
+def test_bulk_create_rejects_empty_and_oversized_batches(app, admin_client, site):
+    assert admin_client.post("/api/pages/bulk", json={"items": []}).status_code == 400
+
+    app.config["BULK_MAX_ITEMS"] = 2
+    items = [{"siteId": site["id"], "title": f"P{i}"} for i in range(3)]
+    assert admin_client.post("/api/pages/bulk", json={"items": items}).status_code == 413
+
+
+def test_bulk_create_inserts_mixed_rows_in_one_statement_per_batch(monkeypatch, admin_client, site):
+    template = admin_client.post("/api/templates", json={"name": "Plain"}).get_json()["template"]
+    items = [
+        {"siteId": site["id"], "title": f"P{i}", "templateId": template["id"] if i % 2 else None} for i in range(7)
+    ]
+    monkeypatch.setattr(bulk, "INSERT_BATCH", 3)
+
+    with capture_queries() as queries:
+        body = admin_client.post("/api/pages/bulk", json={"items": items}).get_json()
+
+    inserts = [sql for sql, _, _ in queries.statements if sql.startswith("INSERT INTO pages")]
+    assert len(inserts) == 3
+    by_id = {p["id"]: p for p in admin_client.get(f"/api/pages?siteId={site['id']}").get_json()["pages"]}
+    for i, result in enumerate(body["results"]):
+        assert by_id[result["id"]]["title"] == f"P{i}"
+        assert by_id[result["id"]]["templateId"] == (template["id"] if i % 2 else None)
+
+
+def test_bulk_update_swaps_slugs(admin_client, site):
+    a, b = _create_pages(admin_client, site["id"], "A", "B")
+
+    r = admin_client.put("/api/pages/bulk", json={"items": [{"id": a, "slug": "b"}, {"id": b, "slug": "a"}]})
+
+    assert r.status_code == 200
+    assert r.get_json()["succeeded"] == 2
+    assert _slugs(admin_client, site["id"]) == {a: "b", b: "a"}
+
+
+def test_bulk_update_rename_chain_and_cycle(admin_client, site):
+    a, b, c = _create_pages(admin_client, site["id"], "A", "B", "C")
+
+    items = [{"id": a, "slug": "b"}, {"id": b, "slug": "c"}, {"id": c, "slug": "a"}]
+    r = admin_client.put("/api/pages/bulk", json={"items": items})
+
+    assert r.get_json()["succeeded"] == 3
+    assert _slugs(admin_client, site["id"]) == {a: "b", b: "c", c: "a"}
+
+
+def test_bulk_update_keeps_slug_of_failed_partner(admin_client, site):
+    a, b = _create_pages(admin_client, site["id"], "A", "B")
+
+    items = [{"id": a, "slug": "b"}, {"id": b, "slug": "c", "title": ""}]
+    r = admin_client.put("/api/pages/bulk", json={"items": items})
+
+    assert r.status_code == 200
+    assert [x["status"] for x in r.get_json()["results"]] == [409, 400]
+    assert _slugs(admin_client, site["id"]) == {a: "a", b: "b"}
+
+
+def test_bulk_update_first_claim_wins(admin_client, site):
+    a, b = _create_pages(admin_client, site["id"], "A", "B")
+
+    r = admin_client.put("/api/pages/bulk", json={"items": [{"id": a, "slug": "x"}, {"id": b, "slug": "x"}]})
+
+    assert [x["status"] for x in r.get_json()["results"]] == [200, 409]
+    assert _slugs(admin_client, site["id"]) == {a: "x", b: "b"}
+
+
+def test_bulk_delete_checks_each_item(app, admin_client, user_client, site):
+    mine = user_client.post("/api/posts", json={"siteId": site["id"], "title": "Mine"}).get_json()["post"]["id"]
+    theirs = admin_client.post("/api/posts", json={"siteId": site["id"], "title": "Theirs"}).get_json()["post"]["id"]
+
+    r = user_client.delete("/api/posts/bulk", json={"ids": [mine, theirs, 999]})
+
+    assert r.status_code == 200
+    assert [x["status"] for x in r.get_json()["results"]] == [200, 403, 404]
+    assert user_client.get(f"/api/posts/{mine}").status_code == 404
+    assert admin_client.get(f"/api/posts/{theirs}").status_code == 200
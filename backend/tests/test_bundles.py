@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import Page, Site
+from app.utils import bundles
+from tests.conftest import text_block
+
+
+@pytest.fixture
+def template(admin_client):
+    r = admin_client.post("/api/templates", json={"name": "Landing", "type": "page", "config": {"styles": {"text": "prose"}}})
+    return r.get_json()["template"]
+
+
+@pytest.fixture
+def page(admin_client, site, template):
+    r = admin_client.post("/api/pages", json={
+        "siteId": site["id"], "templateId": template["id"], "title": "Home", "status": "published",
+        "content": text_block("hello"),
+    })
+    return r.get_json()["page"]
+
+
+def _bundle(client, slug="home"):
+    r = client.get(f"/api/sites/demo/bundle/{slug}")
+    assert r.status_code == 200, r.get_data(as_text=True)
+    return r.get_json()
+
+
+def _stored(app, slug="home"):
+    with app.app_context():
+        return bundles.lookup("demo", "page", slug)
+
+
+def test_bundle_contains_item_site_and_template(app, client, page, template):
+    body = _bundle(client)
+    assert body["kind"] == "page"
+    assert body["page"]["title"] == "Home"
+    assert body["page"]["content"] == text_block("hello")
+    assert body["site"]["config"] == {"theme": "light"}
+    assert body["template"]["config"] == {"styles": {"text": "prose"}}
+    assert _stored(app) is not None
+
+
+def test_drafts_and_unknown_items_are_not_bundled(admin_client, client, site):
+    admin_client.post("/api/pages", json={"siteId": site["id"], "title": "Draft"})
+    assert client.get("/api/sites/demo/bundle/draft").status_code == 404
+    assert client.get("/api/sites/demo/bundle/missing").status_code == 404
+    assert client.get("/api/sites/nope/bundle/draft").status_code == 404
+    assert client.get("/api/sites/demo/bundle/draft?kind=blog").status_code == 400
+
+
+def test_item_update_invalidates_bundle(app, admin_client, client, page):
+    _bundle(client)
+    r = admin_client.put(f"/api/pages/{page['id']}", json={"title": "Welcome", "content": text_block("new")})
+    assert r.status_code == 200
+
+    body = _bundle(client)
+    assert body["page"]["title"] == "Welcome"
+    assert body["page"]["content"] == text_block("new")
+
+    admin_client.put(f"/api/pages/{page['id']}", json={"status": "draft"})
+    assert client.get("/api/sites/demo/bundle/home").status_code == 404
+    assert _stored(app) is None
+
+
+def test_slug_change_drops_old_bundle(app, admin_client, client, page):
+    _bundle(client)
+    admin_client.put(f"/api/pages/{page['id']}", json={"slug": "start"})
+    assert client.get("/api/sites/demo/bundle/home").status_code == 404
+    assert _bundle(client, "start")["page"]["slug"] == "start"
+
+
+def test_template_update_invalidates_bundle(admin_client, client, page, template):
+    _bundle(client)
+    r = admin_client.put(f"/api/templates/{template['id']}", json={"config": {"styles": {"text": "lead"}}})
+    assert r.status_code == 200
+    assert _bundle(client)["template"]["config"] == {"styles": {"text": "lead"}}
+
+
+def test_site_update_invalidates_bundle(admin_client, client, page, site):
+    _bundle(client)
+    r = admin_client.put(f"/api/sites/{site['id']}", json={"config": {"theme": "dark"}})
+    assert r.status_code == 200
+    assert _bundle(client)["site"]["config"] == {"theme": "dark"}
+
+
+def _concurrent_update(app, monkeypatch, page):
+    """
+    Izmena stavke (i njena invalidacija) koja se desi između čitanja stavke i upisa paketa.
+    """
+    with app.app_context():
+        db.session.get(Page, page["id"]).updated_at = datetime(2020, 1, 1)
+        db.session.get(Site, page["siteId"]).updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+
+    # "tuđa" izmena i ponovljeno pravljenje se broje u budžet zahteva
+    app.config["QUERY_GUARD"] = "warn"
+    store = bundles._store
+    calls = []
+
+    def racing_store(*args):
+        if not calls:
+            with db.engine.begin() as conn:
+                conn.execute(update(Page).where(Page.id == page["id"]).values(title="Changed", updated_at=db.func.now()))
+            bundles.invalidate("page", page["siteId"], page["slug"])
+        calls.append(args)
+        return store(*args)
+
+    monkeypatch.setattr(bundles, "_store", racing_store)
+    return calls
+
+
+def test_build_does_not_store_bundle_of_changed_item(app, client, page, monkeypatch):
+    calls = _concurrent_update(app, monkeypatch, page)
+    monkeypatch.setattr(bundles, "BUILD_ATTEMPTS", 1)
+
+    # ovaj odgovor je napravljen pre izmene, ali se ne čuva
+    assert _bundle(client)["page"]["title"] == "Home"
+    assert len(calls) == 1
+    assert _stored(app) is None
+
+
+def test_build_retries_after_concurrent_change(app, client, page, monkeypatch):
+    calls = _concurrent_update(app, monkeypatch, page)
+
+    assert _bundle(client)["page"]["title"] == "Changed"
+    assert len(calls) == 2
+    assert '"Changed"' in _stored(app).body
+
+
+def test_store_keeps_newer_bundle(app, page, client):
+    _bundle(client)
+    with app.app_context():
+        item = db.session.get(Page, page["id"])
+        with db.engine.begin() as conn:
+            stored = bundles._store(conn, Page, item, "page", "{}", datetime(2000, 1, 1))
+    assert stored is False
+    assert _stored(app).body != "{}"
@@ -0,0 +1,112 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from app.extensions import response_cache, user_cache
+from app.models import UserRole
+from app.utils.cache import CacheBackend, FileBackend, LRUBackend, ResponseCache
+from tests.conftest import ADMIN, login
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_lru_evicts_oldest_and_expires():
+    cache = LRUBackend(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+    cache.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+
+def test_file_backend_is_shared_between_instances(tmp_path):
+    worker1 = FileBackend(str(tmp_path), max_entries=3)
+    worker2 = FileBackend(str(tmp_path), max_entries=3)
+
+    worker1.set("k", ("value", 1))
+    assert worker2.get("k") == ["value", 1]
+    worker2.delete("k")
+    assert worker1.get("k") is None
+
+    assert (worker1.incr("gen"), worker2.incr("gen"), worker1.get("gen")) == (1, 2, 2)
+
+    for i in range(10):
+        worker1.set(i, i)
+    worker1.prune()
+    assert len(worker1) == 3
+    assert worker1.get(9) == 9
+
+
+def test_file_backend_stores_json(tmp_path):
+    cache = FileBackend(str(tmp_path / "c"))
+    stamp = datetime(2024, 5, 6, 7, 8, 9, 123456)
+    cache.set("k", (1, stamp, UserRole.ADMIN, "body"))
+
+    assert cache.get("k") == [1, stamp, "admin", "body"]
+    path = cache._path("k")
+    with open(path) as f:
+        assert '"__dt":"2024-05-06T07:08:09.123456"' in f.read()
+
+    with open(path, "wb") as f:
+        f.write(b"\x80\x04garbage")
+    assert cache.get("k") is None
+
+
+def test_file_backend_rejects_foreign_or_open_directory(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(RuntimeError, match="mode 0700"):
+        FileBackend(str(shared))
+
+    os.symlink(tmp_path / "elsewhere", tmp_path / "link")
+    with pytest.raises(RuntimeError):
+        FileBackend(str(tmp_path / "link"))
+
+    with pytest.raises(RuntimeError, match="requires CACHE_DIR"):
+        FileBackend.from_config({"RESPONSE_CACHE_MAX_ENTRIES": 1, "RESPONSE_CACHE_TTL": 1}, "RESPONSE_CACHE_")
+
+
+def test_response_cache_generation_drops_whole_site(tmp_path):
+    cache = ResponseCache(LRUBackend())
+    cache.set("page", 1, "home", "v1")
+    cache.set("page", 2, "home", "other")
+
+    cache.invalidate_site(1)
+
+    assert cache.get("page", 1, "home") is None
+    assert cache.get("page", 2, "home") == "other"
+
+
+def test_shared_backend_is_default_with_several_workers(make_app):
+    make_app(GUNICORN_WORKERS=2)
+    assert isinstance(response_cache.backend, FileBackend)
+    assert isinstance(user_cache.backend, FileBackend)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_slug_cache_is_invalidated_on_update(make_app, workers):
+    app = make_app(GUNICORN_WORKERS=workers)
+    admin_client, client = login(app.test_client(), ADMIN), app.test_client()
+    site = admin_client.post("/api/sites", json={"name": "Demo", "slug": "demo"}).get_json()["site"]
+    page = admin_client.post(
+        "/api/pages", json={"siteId": site["id"], "title": "Old", "slug": "home", "status": "published"}
+    ).get_json()["page"]
+    url = f"/api/pages/site/{site['id']}/home"
+
+    assert client.get(url).get_json()["page"]["title"] == "Old"
+    hits = response_cache.hits
+    assert client.get(url).get_json()["page"]["title"] == "Old"
+    assert response_cache.hits == hits + 1
+
+    admin_client.put(f"/api/pages/{page['id']}", json={"title": "New"})
+    assert client.get(url).get_json()["page"]["title"] == "New"
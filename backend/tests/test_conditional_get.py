@@ -0,0 +1,69 @@
+import hashlib
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import Post
+from tests.conftest import ADMIN, login, text_block
+
+
+@pytest.fixture()
+def post(admin_client, site):
+    r = admin_client.post("/api/posts", json={"siteId": site["id"], "title": "Hello", "content": text_block("hi")})
+    return r.get_json()["post"]
+
+
+@pytest.fixture()
+def page(admin_client, site):
+    r = admin_client.post("/api/pages", json={"siteId": site["id"], "title": "About", "content": text_block("hi")})
+    return r.get_json()["page"]
+
+
+@pytest.fixture()
+def template(admin_client):
+    return admin_client.post("/api/templates", json={"name": "Plain"}).get_json()["template"]
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/posts/{post}", "/api/pages/{page}", "/api/sites/{site}", "/api/templates/{template}"]
+)
+def test_if_none_match_returns_304(admin_client, site, post, page, template, path):
+    url = path.format(post=post["id"], page=page["id"], site=site["id"], template=template["id"])
+    first = admin_client.get(url)
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+
+    again = admin_client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_if_modified_since_returns_304(admin_client, post):
+    first = admin_client.get(f"/api/posts/{post['id']}")
+    again = admin_client.get(f"/api/posts/{post['id']}", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert again.status_code == 304
+
+
+def test_update_changes_etag(app, admin_client, post):
+    with app.app_context():
+        db.session.get(Post, post["id"]).updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+    old = admin_client.get(f"/api/posts/{post['id']}").headers["ETag"]
+
+    assert admin_client.put(f"/api/posts/{post['id']}", json={"title": "Changed"}).status_code == 200
+
+    r = admin_client.get(f"/api/posts/{post['id']}", headers={"If-None-Match": old})
+    assert r.status_code == 200
+    assert r.get_json()["post"]["title"] == "Changed"
+    assert r.headers["ETag"] != old
+
+
+def test_hash_mode_etag_follows_body(make_app):
+    client = login(make_app(ETAG_MODE="hash").test_client(), ADMIN)
+    site = client.post("/api/sites", json={"name": "Demo", "slug": "demo"}).get_json()["site"]
+
+    first = client.get(f"/api/sites/{site['id']}")
+    assert first.headers["ETag"] == f'W/"{hashlib.sha1(first.get_data()).hexdigest()}"'
+    assert client.get(f"/api/sites/{site['id']}", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
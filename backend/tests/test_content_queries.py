@@ -0,0 +1,30 @@
+from tests.conftest import text_block
+
+
+def _content(*types):
+    blocks = {
+        "hero": {"type": "hero", "props": {"title": "Welcome"}},
+        "text": {"type": "text", "props": {"text": "body"}},
+        "quote": {"type": "quote", "props": {"text": "cite"}},
+    }
+    return {"version": 1, "blocks": [blocks[t] for t in types]}
+
+
+def test_block_type_filter_runs_on_posts_and_pages(admin_client, site):
+    for title, content in [("Landing", _content("hero", "text")), ("Plain", _content("text")), ("Cite", _content("quote"))]:
+        assert admin_client.post("/api/posts", json={"siteId": site["id"], "title": title, "content": content}).status_code == 201
+        assert admin_client.post("/api/pages", json={"siteId": site["id"], "title": title, "content": content}).status_code == 201
+
+    posts = admin_client.get(f"/api/posts?siteId={site['id']}&blockType=hero").get_json()["posts"]
+    pages = admin_client.get(f"/api/pages?siteId={site['id']}&blockType=quote").get_json()["pages"]
+    assert [p["title"] for p in posts] == ["Landing"]
+    assert [p["title"] for p in pages] == ["Cite"]
+    assert admin_client.get(f"/api/posts?siteId={site['id']}&blockType=image").get_json()["posts"] == []
+
+
+def test_content_and_config_round_trip_as_json(admin_client, site):
+    content = text_block("čćž \"quoted\"")
+    post = admin_client.post("/api/posts", json={"siteId": site["id"], "title": "Unicode", "content": content}).get_json()["post"]
+
+    assert admin_client.get(f"/api/posts/{post['id']}").get_json()["post"]["content"] == content
+    assert admin_client.get(f"/api/sites/{site['id']}").get_json()["site"]["config"] == {"theme": "light"}
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from app.utils.db_pool import InstrumentedQueuePool, PoolStats, engine_options, pool_status
+
+
+def test_engine_options_from_env(monkeypatch):
+    assert engine_options("sqlite:///x.db") == {}
+
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "500")
+    options = engine_options("postgresql+psycopg2://u:p@db/cms")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (3, 20)
+    assert options["connect_args"] == {"options": "-c statement_timeout=500"}
+
+    monkeypatch.setenv("DB_PGBOUNCER", "1")
+    # kroz PgBouncer nema startup options ni server-side prepared statements
+    assert engine_options("postgresql+psycopg://u:p@db/cms")["connect_args"] == {"prepare_threshold": None}
+
+
+def test_instrumented_pool_counts_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    stats = PoolStats()
+    engine.pool.stats = stats
+    event.listen(engine, "checkout", lambda *a: stats.checkout())
+    event.listen(engine, "checkin", lambda *a: stats.checkin())
+
+    held = engine.connect()
+    with pytest.raises(PoolTimeout):
+        engine.connect()
+    status = pool_status(engine, stats)
+    assert (status["size"], status["checkedOut"], status["timeouts"], status["peakCheckedOut"]) == (1, 1, 1, 1)
+
+    held.close()
+    with engine.connect():
+        pass
+    assert pool_status(engine, stats)["checkouts"] == 2
+
+
+def test_pool_health_endpoint(client):
+    client.get("/api/sites")
+    body = client.get("/health/db/pool").get_json()
+    assert body["status"] == "ok"
+    assert body["pool"]["checkouts"] >= 1
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import Post, Site, Template
+from app.utils.query_guard import capture_queries
+from tests.conftest import USER, login, text_block
+
+
+@pytest.fixture
+def template(admin_client):
+    r = admin_client.post("/api/templates", json={"name": "Blog", "type": "both", "config": {"styles": {"text": "prose"}}})
+    return r.get_json()["template"]
+
+
+def _post(client, site_id, title, template_id=None):
+    body = {"siteId": site_id, "title": title, "status": "published", "content": text_block("hi")}
+    if template_id:
+        body["templateId"] = template_id
+    r = client.post("/api/posts", json=body)
+    assert r.status_code == 201, r.get_json()
+    return r.get_json()["post"]
+
+
+def _list(client, site_id, query):
+    with capture_queries() as queries:
+        r = client.get(f"/api/posts?siteId={site_id}&{query}")
+    assert r.status_code == 200, r.get_json()
+    return r.get_json()["posts"], queries
+
+
+def test_list_embeds_site_template_and_author(app, admin_client, site, template):
+    user_client = login(app.test_client(), USER)
+    _post(admin_client, site["id"], "Mine", template["id"])
+    _post(user_client, site["id"], "Theirs")
+
+    posts, _ = _list(admin_client, site["id"], "expand=author,template,site")
+    by_title = {p["title"]: p for p in posts}
+
+    assert by_title["Mine"]["author"] == {"id": 1, "name": "admin"}
+    assert by_title["Theirs"]["author"] == {"id": 2, "name": "user"}
+    assert by_title["Mine"]["template"] == {
+        "id": template["id"], "name": "Blog", "type": "both", "config": {"styles": {"text": "prose"}},
+    }
+    assert by_title["Theirs"]["template"] is None
+    for post in posts:
+        assert post["site"] == {"id": site["id"], "name": "Demo", "slug": "demo", "config": {"theme": "light"}}
+
+
+def test_list_without_expand_has_no_embedded_objects(admin_client, site):
+    _post(admin_client, site["id"], "Plain")
+    posts, _ = _list(admin_client, site["id"], "limit=5")
+    assert not {"site", "template", "author"} & set(posts[0])
+
+
+def test_list_expand_uses_one_query_per_relation(app, admin_client, site, template):
+    user_client = login(app.test_client(), USER)
+    _post(admin_client, site["id"], "First", template["id"])
+    _, few = _list(admin_client, site["id"], "expand=site,template,author")
+
+    for i in range(6):
+        _post(admin_client if i % 2 else user_client, site["id"], f"More {i}", template["id"])
+    posts, many = _list(admin_client, site["id"], "expand=site,template,author")
+
+    assert len(posts) == 7
+    # broj upita ne raste sa brojem stavki: stranica + jedan IN upit po vezi
+    assert len(many.statements) == len(few.statements), many.report("expand", 3)
+    assert sum("FROM users" in sql for sql, _, _ in many.statements) <= 2
+
+
+def test_expand_combines_with_fields(admin_client, site):
+    _post(admin_client, site["id"], "Hello")
+    posts, _ = _list(admin_client, site["id"], "fields=title&expand=author")
+    assert posts == [{"id": 1, "title": "Hello", "author": {"id": 1, "name": "admin"}}]
+
+
+def test_page_author_is_its_creator(admin_client, site):
+    r = admin_client.post("/api/pages", json={"siteId": site["id"], "title": "About"})
+    page = r.get_json()["page"]
+
+    listed = admin_client.get(f"/api/pages?siteId={site['id']}&expand=author").get_json()["pages"]
+    assert listed[0]["author"] == {"id": 1, "name": "admin"}
+    detail = admin_client.get(f"/api/pages/{page['id']}?expand=author,site").get_json()["page"]
+    assert detail["author"] == {"id": 1, "name": "admin"}
+    assert detail["site"]["slug"] == "demo"
+
+
+@pytest.mark.parametrize("path", ["/api/posts/{post}", "/api/posts/site/{site}/hello"])
+def test_detail_loads_item_and_relations_in_one_query(admin_client, site, template, path):
+    post = _post(admin_client, site["id"], "Hello", template["id"])
+    url = path.format(post=post["id"], site=site["id"]) + "?expand=site,template,author"
+
+    with capture_queries() as queries:
+        r = admin_client.get(url)
+    assert r.status_code == 200
+    body = r.get_json()["post"]
+    assert (body["site"]["id"], body["template"]["id"], body["author"]["id"]) == (site["id"], template["id"], 1)
+    assert sum("FROM posts" in sql for sql, _, _ in queries.statements) == 1
+    assert not any("FROM templates" in sql and "FROM posts" not in sql for sql, _, _ in queries.statements)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/posts?siteId={site}&expand=author,comments",
+    "/api/posts/{post}?expand=owner",
+    "/api/posts/site/{site}/hello?expand=site,tags",
+    "/api/pages?siteId={site}&expand=nope",
+])
+def test_unknown_expand_is_rejected(admin_client, site, path):
+    post = _post(admin_client, site["id"], "Hello")
+    r = admin_client.get(path.format(site=site["id"], post=post["id"]))
+    assert r.status_code == 400
+    assert "Unknown expand" in r.get_json()["error"]
+
+
+def test_expanded_etag_follows_related_updates(app, admin_client, site, template):
+    post = _post(admin_client, site["id"], "Hello", template["id"])
+    # vremena se u SQLite-u čuvaju u sekundama, pa se pomeraju unazad da izmena promeni verziju
+    with app.app_context():
+        for model, pk in ((Post, post["id"]), (Site, site["id"]), (Template, template["id"])):
+            db.session.get(model, pk).updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+
+    url = f"/api/posts/{post['id']}?expand=template"
+    first = admin_client.get(url)
+    plain = admin_client.get(f"/api/posts/{post['id']}")
+    assert first.headers["ETag"] != plain.headers["ETag"]
+    assert admin_client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    assert admin_client.put(f"/api/templates/{template['id']}", json={"name": "Renamed"}).status_code == 200
+    second = admin_client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.get_json()["post"]["template"]["name"] == "Renamed"
+    # site se ne traži, pa njegova izmena ne menja verziju
+    assert admin_client.put(f"/api/sites/{site['id']}", json={"name": "Demo 2"}).status_code == 200
+    assert admin_client.get(url, headers={"If-None-Match": second.headers["ETag"]}).status_code == 304
@@ -0,0 +1,63 @@
+import os
+import runpy
+import stat
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+@pytest.fixture()
+def load_conf(monkeypatch):
+    def load(**env):
+        for key in ("GUNICORN_WORKERS", "GUNICORN_THREADS", "GUNICORN_PRELOAD", "GUNICORN_RELOAD", "CACHE_DIR", "METRICS_DIR"):
+            monkeypatch.delenv(key, raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, str(value))
+        conf = runpy.run_path(CONF)
+        loaded.append(conf)
+        return conf
+
+    loaded = []
+    yield load
+    for conf in loaded:
+        conf["on_exit"](None)
+
+
+def test_worker_class_and_preload_follow_env(load_conf):
+    conf = load_conf(GUNICORN_WORKERS=3, GUNICORN_THREADS=1)
+    assert (conf["workers"], conf["worker_class"], conf["preload_app"]) == (3, "sync", True)
+    # create_app bira deljeni keš po stvarnom broju workera
+    assert os.environ["GUNICORN_WORKERS"] == "3"
+
+    conf = load_conf(GUNICORN_THREADS=4, GUNICORN_RELOAD=1)
+    assert (conf["worker_class"], conf["reload"], conf["preload_app"]) == ("gthread", True, False)
+
+
+@pytest.mark.parametrize("name", ["CACHE_DIR", "METRICS_DIR"])
+def test_private_dirs_are_created_and_removed(load_conf, tmp_path, name):
+    conf = load_conf()
+    path = os.environ[name]
+    st = os.stat(path)
+    assert st.st_uid == os.getuid() and stat.S_IMODE(st.st_mode) == 0o700
+
+    conf["on_exit"](None)
+    assert not os.path.exists(path)
+
+    conf = load_conf(**{name: tmp_path})
+    conf["on_exit"](None)
+    assert os.environ[name] == str(tmp_path) and tmp_path.exists()
+
+
+def test_post_fork_gives_worker_a_fresh_pool(load_conf, app):
+    conf = load_conf()
+    with app.app_context():
+        with db.engine.connect():
+            pass
+        pool = db.engine.pool
+
+        conf["post_fork"](SimpleNamespace(app=SimpleNamespace(callable=app)), None)
+        assert db.engine.pool is not pool
@@ -0,0 +1,35 @@
+import json
+
+from app.utils.json_response import RawJSON, dumps, stream_list
+
+
+def test_raw_json_is_spliced_verbatim():
+    raw = '{"version":1,"blocks":[{"type":"text","props":{"text":"\\u00e9 \\"q\\""}}]}'
+    text = dumps({"id": 1, "content": RawJSON(raw), "title": "x"})
+
+    assert raw in text
+    assert json.loads(text) == {"id": 1, "content": json.loads(raw), "title": "x"}
+
+
+def test_placeholder_looking_strings_are_not_replaced():
+    text = dumps({"a": RawJSON("[1]"), "b": "0"})
+    assert json.loads(text) == {"a": [1], "b": "0"}
+
+
+def test_stream_list_matches_dumps(app):
+    items = [{"id": i, "content": RawJSON('{"k":%d}' % i)} for i in range(3)]
+    with app.test_request_context():
+        resp = stream_list("posts", items, lambda x: x, extra={"nextCursor": None})
+        body = resp.get_data(as_text=True)
+    assert json.loads(body) == {"posts": [{"id": i, "content": {"k": i}} for i in range(3)], "nextCursor": None}
+
+
+def test_api_returns_stored_content_unchanged(admin_client, site):
+    content = {"version": 1, "blocks": [{"type": "text", "props": {"text": "ćao ✓"}}]}
+    post = admin_client.post("/api/posts", json={"siteId": site["id"], "title": "T", "content": content})
+    post_id = post.get_json()["post"]["id"]
+
+    r = admin_client.get(f"/api/posts/{post_id}")
+    assert r.get_json()["post"]["content"] == content
+    listed = admin_client.get(f"/api/posts?siteId={site['id']}").get_json()["posts"][0]
+    assert listed["content"] == content
@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+from app.extensions import metrics
+from app.utils.metrics import Metrics
+
+
+def _line(text, prefix):
+    return next(line for line in text.splitlines() if line.startswith(prefix))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_requests_are_counted_per_endpoint(client):
+    client.get("/api/sites")
+    client.get("/api/sites")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert _line(text, 'http_requests_total{endpoint="sites.list_sites",method="GET",status="200"}').endswith(" 2")
+    assert _line(text, 'http_request_db_queries_count{endpoint="sites.list_sites",method="GET"}').endswith(" 2")
+    assert "metrics_processes" not in text
+
+
+def test_scrape_sums_all_workers(make_app, tmp_path):
+    directory = tmp_path / "metrics"
+    client = make_app(METRICS_DIR=directory).test_client()
+    client.get("/api/sites")
+
+    # drugi worker: isti endpoint i jedan koji ovaj proces nije video
+    other = Metrics()
+    other.merge(metrics.state())
+    other.requests[("pages.list_pages", "GET", 200)] += 5
+    (directory / "99999.json").write_text(json.dumps(other.state()))
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert _line(text, 'http_requests_total{endpoint="sites.list_sites",method="GET",status="200"}').endswith(" 2")
+    assert _line(text, 'http_requests_total{endpoint="pages.list_pages",method="GET",status="200"}').endswith(" 5")
+    assert _line(text, "metrics_processes").endswith(" 2")
+    assert os.path.exists(directory / f"{os.getpid()}.json")
+
+
+def test_pid_change_drops_inherited_counters(make_app, tmp_path, monkeypatch):
+    directory = tmp_path / "metrics"
+    client = make_app(METRICS_DIR=directory).test_client()
+    client.get("/api/sites")
+    metrics.flush()
+
+    # kao posle fork-a: nasleđeno stanje se odbacuje, proces nastavlja od svog <pid>.json
+    metrics.requests[("inherited", "GET", 200)] += 7
+    monkeypatch.setattr(metrics, "_pid", -1)
+    client.get("/api/sites")
+
+    assert dict(metrics.requests) == {("sites.list_sites", "GET", 200): 2}
+    merged = metrics.aggregate()
+    assert merged.requests[("sites.list_sites", "GET", 200)] == 2
@@ -0,0 +1,42 @@
+from app.utils.query_guard import capture_queries
+from tests.conftest import text_block
+
+
+def _post(client, site_id, title):
+    r = client.post("/api/posts", json={"siteId": site_id, "title": title, "content": text_block("long body")})
+    assert r.status_code == 201
+
+
+def test_fields_returns_only_requested_keys(admin_client, site):
+    _post(admin_client, site["id"], "Hello")
+
+    with capture_queries() as queries:
+        body = admin_client.get(f"/api/posts?siteId={site['id']}&fields=title,slug").get_json()
+
+    assert body["posts"] == [{"id": 1, "title": "Hello", "slug": "hello"}]
+    select = next(sql for sql, _, _ in queries.statements if sql.startswith("SELECT") and "FROM posts" in sql)
+    assert "posts.content" not in select
+
+
+def test_summary_view_skips_content(admin_client, site):
+    _post(admin_client, site["id"], "Hello")
+
+    post = admin_client.get(f"/api/posts?siteId={site['id']}&view=summary").get_json()["posts"][0]
+    assert "content" not in post
+    assert {"id", "title", "slug", "status", "siteId"} <= set(post)
+
+
+def test_projection_works_with_cursor_pages(admin_client, site):
+    for i in range(3):
+        _post(admin_client, site["id"], f"P{i}")
+
+    first = admin_client.get(f"/api/posts?siteId={site['id']}&fields=slug&limit=2").get_json()
+    rest = admin_client.get(f"/api/posts?siteId={site['id']}&fields=slug&limit=2&cursor={first['nextCursor']}").get_json()
+    assert [p["slug"] for p in first["posts"] + rest["posts"]] == ["p2", "p1", "p0"]
+
+
+def test_unknown_field_or_view_is_400(admin_client):
+    r = admin_client.get("/api/posts?fields=title,password")
+    assert r.status_code == 400
+    assert "Unknown fields: ['password']" in r.get_json()["error"]
+    assert admin_client.get("/api/posts?view=tiny").status_code == 400
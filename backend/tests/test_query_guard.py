@@ -0,0 +1,132 @@
+import pytest
+from flask import request
+
+from app.extensions import db, user_cache
+from app.models import User
+from app.utils.query_guard import QueryBudgetExceeded, _budget, capture_queries, query_budget
+from tests.conftest import USER, login, text_block
+
+
+HOT_PATHS = (
+    "/api/posts?siteId={site}&limit=20",
+    "/api/posts?siteId={site}&limit=20&view=summary",
+    "/api/posts?siteId={site}&limit=20&expand=site,template,author",
+    "/api/pages?siteId={site}&limit=20&expand=site,template,author",
+    "/api/posts/{post}",
+    "/api/posts/site/{site}/post-0",
+    "/api/pages/{page}",
+    "/api/pages/site/{site}/page-0",
+    "/api/sites",
+    "/api/sites/{site}",
+    "/api/templates",
+    "/api/templates/{template}",
+    "/api/sites/{site}/sitemap",
+    "/api/sites/{site}/sitemap.xml",
+    "/api/sites/demo/bundle/page-0",
+    "/api/render/site/{site}/page-0",
+    "/api/search?siteId={site}&q=post",
+    "/api/admin/users",
+    "/api/admin/overview",
+)
+
+
+@pytest.fixture
+def dataset(app, admin_client, site):
+    """
+    Više stavki od dva autora, da bi N+1 (upit po stavci) bio vidljiv.
+    """
+    user_client = login(app.test_client(), USER)
+    r = admin_client.post("/api/templates", json={"name": "Blog", "type": "both", "config": {}})
+    template = r.get_json()["template"]["id"]
+    ids = {"site": site["id"], "template": template}
+    for i in range(5):
+        for client in (admin_client, user_client):
+            body = {"siteId": site["id"], "templateId": template, "status": "published", "content": text_block("post body")}
+            r = client.post("/api/posts", json={**body, "title": f"Post {i}" if client is admin_client else f"Other {i}"})
+            assert r.status_code == 201, r.get_json()
+            ids.setdefault("post", r.get_json()["post"]["id"])
+        r = admin_client.post("/api/pages", json={
+            "siteId": site["id"], "templateId": template, "title": f"Page {i}", "status": "published",
+            "content": text_block("page body"),
+        })
+        assert r.status_code == 201, r.get_json()
+        ids.setdefault("page", r.get_json()["page"]["id"])
+    return ids
+
+
+@pytest.mark.parametrize("path", HOT_PATHS)
+def test_hot_endpoints_stay_within_budget(app, admin_client, dataset, path):
+    path = path.format(**dataset)
+    with app.test_request_context(path):
+        budget = _budget(app.view_functions[request.url_rule.endpoint])
+    assert budget is not None
+
+    with capture_queries() as queries:
+        r = admin_client.get(path)
+        r.get_data()
+    assert r.status_code == 200, r.get_data(as_text=True)
+    assert len(queries.statements) <= budget, queries.report(path, 3)
+
+
+def test_writes_are_not_reported_as_n_plus_one(app, admin_client, dataset):
+    # brojači po (vrsta, status) i isti SELECT iz user_loader-a i kontrolera nisu N+1
+    with app.app_context():
+        user_cache.invalidate(1)
+    r = admin_client.put("/api/admin/users/2/role", json={"role": "admin"})
+    assert r.status_code == 200
+    other = admin_client.post("/api/sites", json={"name": "Other", "slug": "other"}).get_json()["site"]["id"]
+    items = [
+        {"siteId": site_id, "title": f"Bulk {i}", "status": status}
+        for i, (site_id, status) in enumerate([(dataset["site"], "draft"), (dataset["site"], "published"), (other, "draft"), (other, "published")])
+    ]
+    r = admin_client.post("/api/pages/bulk", json={"items": items})
+    assert r.status_code == 200 and r.get_json()["failed"] == 0, r.get_json()
+    ids = [item["id"] for item in r.get_json()["results"]]
+    r = admin_client.post("/api/posts/bulk", json={"items": items})
+    assert r.status_code == 200 and r.get_json()["failed"] == 0, r.get_json()
+    assert admin_client.delete("/api/pages/bulk", json={"ids": ids}).status_code == 200
+
+
+def _route(app, name, view, budget=None):
+    if budget is not None:
+        view = query_budget(budget)(view)
+    app.add_url_rule(f"/_guard/{name}", name, view)
+    return app.test_client()
+
+
+def test_budget_overrun_raises(app):
+    def two_queries():
+        db.session.get(User, 1)
+        db.session.get(User, 2)
+        return "ok"
+
+    client = _route(app, "overrun", two_queries, budget=1)
+    with pytest.raises(QueryBudgetExceeded, match="query budget 1 exceeded"):
+        client.get("/_guard/overrun")
+
+
+def test_repeated_select_from_one_call_site_raises(app):
+    def n_plus_one():
+        for user_id in (1, 2, 1):
+            User.query.filter_by(id=user_id).first()
+        return "ok"
+
+    client = _route(app, "n_plus_one", n_plus_one)
+    with pytest.raises(QueryBudgetExceeded, match=r"possible N\+1: 1 statement\(s\) repeated 3x") as error:
+        client.get("/_guard/n_plus_one")
+    assert str(error.value).count("[N+1]") == 3
+
+
+def test_warn_mode_logs_instead_of_raising(make_app, caplog):
+    app = make_app(QUERY_GUARD="warn")
+
+    def two_queries():
+        db.session.get(User, 1)
+        db.session.get(User, 2)
+        return "ok"
+
+    client = _route(app, "warn", two_queries, budget=1)
+    r = client.get("/_guard/warn")
+    assert r.status_code == 200
+    assert r.headers["X-Query-Count"] == "2"
+    assert "query budget 1 exceeded" in caplog.text
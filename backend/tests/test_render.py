@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Page, Site
+from tests.conftest import text_block
+
+
+def _page(client, site_id, title, status="published", content=None):
+    r = client.post("/api/pages", json={
+        "siteId": site_id, "title": title, "status": status, "content": content or text_block("Hello <world>"),
+    })
+    return r.get_json()["page"]
+
+
+def test_renders_escaped_html_document(client, admin_client, site):
+    _page(admin_client, site["id"], "About us")
+
+    r = client.get(f"/api/render/site/{site['id']}/About-Us")
+    assert r.status_code == 200
+    assert r.mimetype == "text/html"
+    html = r.get_data(as_text=True)
+    assert "About us" in html and "Demo" in html
+    assert "Hello &lt;world&gt;" in html
+
+
+def test_drafts_are_visible_to_admins_only(client, admin_client, site):
+    _page(admin_client, site["id"], "Secret", status="draft")
+
+    assert client.get(f"/api/render/site/{site['id']}/secret").status_code == 404
+    assert admin_client.get(f"/api/render/site/{site['id']}/secret").status_code == 200
+    assert client.get(f"/api/render/site/{site['id']}/secret?kind=blog").status_code == 400
+
+
+def test_etag_follows_site_rename(app, client, admin_client, site):
+    page = _page(admin_client, site["id"], "Home")
+    # vremena se u SQLite-u čuvaju u sekundama, pa se pomeraju unazad da izmena promeni verziju
+    with app.app_context():
+        db.session.get(Site, site["id"]).updated_at = datetime(2020, 1, 1)
+        db.session.get(Page, page["id"]).updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+    url = f"/api/render/site/{site['id']}/home"
+
+    first = client.get(url)
+    assert client.get(url, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    admin_client.put(f"/api/sites/{site['id']}", json={"name": "Renamed"})
+
+    r = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert r.status_code == 200
+    assert "Renamed" in r.get_data(as_text=True)
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from app.extensions import db, replica_router
+from app.models import Site, User
+from tests.conftest import ADMIN, login
+
+
+@pytest.fixture
+def replicated(make_app, tmp_path):
+    """
+    Primarna i jedna replika sa različitim podacima (replika "kasni"), pa se vidi odakle je čitano.
+    """
+    app = make_app(
+        DATABASE_REPLICA_URLS=f"sqlite:///{tmp_path / 'replica.db'}",
+        REPLICA_STICKY_SECONDS="0.5",
+        REPLICA_CHECK_INTERVAL="999",
+    )
+    engine = replica_router.replicas[0].engine
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": 1, "name": "admin", "email": ADMIN[0], "password": "x", "role": "admin"}])
+        conn.execute(Site.__table__.insert(), [{"name": "On replica", "slug": "replica", "created_by_id": 1}])
+    return app
+
+
+def _site_names(client):
+    return [s["name"] for s in client.get("/api/sites").get_json()["sites"]]
+
+
+def test_reads_go_to_replica_and_writes_stick_to_primary(replicated):
+    admin = login(replicated.test_client(), ADMIN)
+    anonymous = replicated.test_client()
+    assert _site_names(anonymous) == ["On replica"]
+
+    assert admin.post("/api/sites", json={"name": "Primary", "slug": "primary"}).status_code == 201
+
+    # posle upisa isti klijent čita svoj upis sa primarne, ostali i dalje sa replike
+    assert _site_names(admin) == ["Primary"]
+    assert _site_names(anonymous) == ["On replica"]
+
+    time.sleep(0.6)
+    assert _site_names(admin) == ["On replica"]
+
+
+def test_unhealthy_replica_falls_back_to_primary(replicated):
+    client = replicated.test_client()
+    assert _site_names(client) == ["On replica"]
+
+    replica_router.replicas[0].healthy = False
+    assert _site_names(client) == []
+
+
+def test_cache_fill_reads_primary(replicated):
+    admin = login(replicated.test_client(), ADMIN)
+    site = admin.post("/api/sites", json={"name": "Primary", "slug": "primary"}).get_json()["site"]
+    admin.post("/api/pages", json={"siteId": site["id"], "title": "Fresh", "slug": "home", "status": "published"})
+
+    # stranica postoji samo na primarnoj; promašaj keša ne sme da je traži na replici
+    r = replicated.test_client().get(f"/api/pages/site/{site['id']}/home")
+    assert r.status_code == 200
+    assert r.get_json()["page"]["title"] == "Fresh"
+
+
+def test_replica_health_requires_admin(replicated):
+    assert replicated.test_client().get("/health/db/replicas").status_code == 401
+    r = login(replicated.test_client(), ADMIN).get("/health/db/replicas")
+    assert r.status_code == 200
+    assert len(r.get_json()["replicas"]) == 1
@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from app.utils.request_body import BodyError, _StructureScanner
+from tests.conftest import text_block
+
+
+def _feed(scanner, data, size):
+    for i in range(0, len(data), size):
+        scanner.feed(data[i:i + size])
+
+
+@pytest.mark.parametrize("size", [1, 7, 1000, 1 << 20])
+def test_scanner_ignores_brackets_in_strings_across_chunks(size):
+    doc = json.dumps({"x": '\\"[[{{' * 2000, "y": [[1], {"z": "]"}]}).encode()
+    scanner = _StructureScanner(max_depth=3, max_nodes=10)
+    _feed(scanner, doc, size)
+    assert (scanner.depth, scanner.nodes, scanner.in_string) == (0, 4, False)
+
+
+def test_scanner_limits_depth_and_nodes():
+    with pytest.raises(BodyError, match="deeper than 3"):
+        _StructureScanner(max_depth=3, max_nodes=100).feed(b"[[[[]]]]")
+
+    with pytest.raises(BodyError) as e:
+        _StructureScanner(max_depth=3, max_nodes=5).feed(b"[" + b"[]," * 10 + b"[]]")
+    assert e.value.status == 413
+
+
+def _chunked(client, url, payload):
+    return client.post(
+        url,
+        input_stream=io.BytesIO(json.dumps(payload).encode()),
+        content_type="application/json",
+        headers={"Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},
+    )
+
+
+def test_content_endpoint_limits(app, admin_client, site):
+    app.config["CONTENT_BODY_MAX_BYTES"] = 4000
+    small = {"siteId": site["id"], "title": "small", "content": text_block("x" * 100)}
+    large = {"siteId": site["id"], "title": "large", "content": text_block("x" * 5000)}
+
+    assert admin_client.post("/api/posts", json=small).status_code == 201
+    assert admin_client.post("/api/posts", json=large).status_code == 413
+    assert _chunked(admin_client, "/api/posts", large).status_code == 413
+    assert _chunked(admin_client, "/api/posts", {**small, "title": "chunked"}).status_code == 201
+
+
+def test_json_bomb_is_rejected(admin_client, site):
+    bomb = b'{"title":' + b"[" * 100 + b"]" * 100 + b"}"
+    r = admin_client.post("/api/posts", data=bomb, content_type="application/json")
+    assert r.status_code == 400
+    assert "nesting" in r.get_json()["error"]
+
+
+def test_default_limit_applies_to_get_json_endpoints(app, admin_client):
+    app.config["REQUEST_BODY_MAX_BYTES"] = 100
+    payload = {"name": "x" * 200, "slug": "big"}
+
+    assert admin_client.post("/api/sites", json=payload).status_code == 413
+    assert _chunked(admin_client, "/api/sites", payload).status_code == 413
+    assert admin_client.post("/api/sites", json={"name": "ok", "slug": "ok"}).status_code == 201
+
+
+@pytest.mark.parametrize("url, key", [("/api/posts", "CONTENT_BODY_MAX_BYTES"), ("/api/sites", "REQUEST_BODY_MAX_BYTES")])
+def test_chunked_body_of_exactly_the_limit_is_accepted(app, admin_client, site, url, key):
+    payload = {"siteId": site["id"], "name": "Exact", "slug": "exact", "title": "Exact"}
+    size = len(json.dumps(payload).encode())
+    app.config[key] = size
+
+    assert _chunked(admin_client, url, {**payload, "title": "Exactly", "name": "Exactly"}).status_code == 413
+    assert _chunked(admin_client, url, payload).status_code == 201
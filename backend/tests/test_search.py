@@ -0,0 +1,58 @@
+from tests.conftest import text_block
+
+
+def _post(client, site_id, title, body, status="published"):
+    r = client.post("/api/posts", json={"siteId": site_id, "title": title, "content": text_block(body), "status": status})
+    return r.get_json()["post"]
+
+
+def _search(client, site_id, query):
+    r = client.get(f"/api/search?siteId={site_id}&{query}")
+    assert r.status_code == 200, r.get_json()
+    return r.get_json()
+
+
+def test_title_matches_rank_above_body_matches(admin_client, site):
+    _post(admin_client, site["id"], "Notes", "all about gardening")
+    _post(admin_client, site["id"], "Gardening tips", "soil and water")
+    _post(admin_client, site["id"], "Cooking", "pasta")
+
+    results = _search(admin_client, site["id"], "q=gardening")["results"]
+    assert [r["title"] for r in results] == ["Gardening tips", "Notes"]
+    assert results[0]["rank"] > results[1]["rank"]
+
+
+def test_status_and_kind_filters(admin_client, site):
+    _post(admin_client, site["id"], "Alpha draft", "shared", status="draft")
+    _post(admin_client, site["id"], "Alpha live", "shared")
+    admin_client.post("/api/pages", json={"siteId": site["id"], "title": "Alpha page", "status": "published"})
+
+    assert [r["title"] for r in _search(admin_client, site["id"], "q=alpha&status=draft")["results"]] == ["Alpha draft"]
+    assert {r["title"] for r in _search(admin_client, site["id"], "q=alpha&kind=page")["results"]} == {"Alpha page"}
+    # svi termini moraju da se poklope
+    assert [r["title"] for r in _search(admin_client, site["id"], "q=alpha+live")["results"]] == ["Alpha live"]
+
+
+def test_cursor_pages_cover_all_results_once(admin_client, site):
+    for i in range(5):
+        _post(admin_client, site["id"], f"Topic {i}", "common word")
+
+    seen, cursor = [], None
+    while True:
+        body = _search(admin_client, site["id"], "q=common&limit=2" + (f"&cursor={cursor}" if cursor else ""))
+        seen += [r["id"] for r in body["results"]]
+        cursor = body["nextCursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+    assert admin_client.get(f"/api/search?siteId={site['id']}&q=x&cursor=bad").status_code == 400
+
+
+def test_index_follows_updates(admin_client, site):
+    post = _post(admin_client, site["id"], "Before", "old words")
+    assert _search(admin_client, site["id"], "q=old")["results"]
+
+    admin_client.put(f"/api/posts/{post['id']}", json={"title": "After", "content": text_block("new words")})
+
+    assert _search(admin_client, site["id"], "q=old")["results"] == []
+    assert [r["title"] for r in _search(admin_client, site["id"], "q=new")["results"]] == ["After"]
@@ -0,0 +1,109 @@
+import gzip
+import json
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Page
+from app.utils.query_guard import capture_queries
+from tests.conftest import text_block
+
+
+def _records(response):
+    return [json.loads(line) for line in response.get_data().decode().splitlines()]
+
+
+def _fill(app, admin_client, site):
+    t = admin_client.post("/api/templates", json={"name": "Blog", "type": "both", "config": {"x": 1}}).get_json()
+    template_id = (t.get("template") or t)["id"]
+    items = [
+        {"siteId": site["id"], "title": f"Page {i}", "templateId": template_id if i % 2 else None,
+         "status": "published" if i % 2 else "draft", "content": text_block(f"body {i} é")}
+        for i in range(5)
+    ]
+    assert admin_client.post("/api/pages/bulk", json={"items": items}).get_json()["succeeded"] == 5
+    admin_client.post("/api/posts", json={"siteId": site["id"], "title": "Hello", "content": text_block("post")})
+
+    with app.app_context():
+        page = db.session.get(Page, 1)
+        page.created_at = datetime(2020, 1, 2, 3, 4, 5)
+        db.session.commit()
+        db.session.execute(db.text("UPDATE pages SET updated_at = '2021-06-07 08:09:10' WHERE id = 1"))
+        db.session.commit()
+
+
+def _content(records):
+    # bez id-jeva šablona (uvoz ih mapira na postojeći šablon istog imena)
+    return [
+        (r["type"], {k: v for k, v in r["data"].items() if k != "templateId"}, r["data"].get("templateId") is None)
+        for r in records
+        if r["type"] in ("page", "post")
+    ]
+
+
+def test_export_import_round_trip(app, admin_client, site):
+    _fill(app, admin_client, site)
+
+    exported = admin_client.get(f"/api/sites/{site['id']}/export")
+    assert exported.status_code == 200
+    source = _records(exported)
+    assert source[0]["type"] == "site" and source[0]["data"]["config"] == {"theme": "light"}
+    assert [r["type"] for r in source].count("template") == 1
+
+    compressed = admin_client.get(f"/api/sites/{site['id']}/export?gzip=1").get_data()
+    assert gzip.decompress(compressed) == exported.get_data()
+
+    r = admin_client.post("/api/sites/import?slug=copy", data=compressed, content_type="application/gzip")
+    assert r.status_code == 201, r.get_json()
+    copy = r.get_json()["site"]
+    assert copy["slug"] == "copy"
+
+    copied = _records(admin_client.get(f"/api/sites/{copy['id']}/export"))
+    assert copied[0]["data"]["name"] == "Demo"
+    assert _content(copied) == _content(source)
+
+    page = next(r["data"] for r in copied if r["type"] == "page" and r["data"]["slug"] == "page-0")
+    assert (page["createdAt"], page["updatedAt"]) == ("2020-01-02T03:04:05", "2021-06-07T08:09:10")
+
+
+def test_import_writes_mixed_rows_with_one_insert(app, admin_client, site):
+    _fill(app, admin_client, site)
+    exported = admin_client.get(f"/api/sites/{site['id']}/export").get_data()
+
+    with capture_queries() as queries:
+        r = admin_client.post("/api/sites/import?slug=copy", data=exported, content_type="application/x-ndjson")
+
+    assert r.status_code == 201
+    assert r.get_json()["imported"] == {"pages": 5, "posts": 1}
+    inserts = [sql for sql, _, _ in queries.statements if sql.startswith("INSERT INTO pages")]
+    assert len(inserts) == 1
+
+
+def test_import_fills_missing_timestamps_and_converts_offsets(admin_client):
+    body = (
+        b'{"type":"site","data":{"name":"Bare"}}\n'
+        b'{"type":"page","data":{"title":"Old","updatedAt":"2022-01-01T02:00:00+02:00"}}\n'
+        b'{"type":"page","data":{"title":"New"}}\n'
+    )
+    r = admin_client.post("/api/sites/import", data=body, content_type="application/x-ndjson")
+    assert r.status_code == 201
+
+    pages = {x["data"]["slug"]: x["data"] for x in _records(admin_client.get(f"/api/sites/{r.get_json()['site']['id']}/export"))[1:]}
+    assert pages["old"]["createdAt"] == pages["old"]["updatedAt"] == "2022-01-01T00:00:00"
+    assert pages["new"]["createdAt"] is not None
+
+
+def test_import_errors_name_the_line(admin_client, site):
+    existing = admin_client.get(f"/api/sites/{site['id']}/export").get_data()
+    assert admin_client.post("/api/sites/import", data=existing, content_type="application/x-ndjson").status_code == 409
+
+    cases = [
+        (b'{"type":"page","data":{"title":"x"}}\n', "First line must be the site record"),
+        (b'{"type":"site","data":{"name":"B"}}\n{"type":"page","data":{"title":"x","status":"zzz"}}\n', "Line 2"),
+        (b'{"type":"site","data":{"name":"B"}}\nnot json\n', "Line 2: invalid JSON"),
+        (b'{"type":"site","data":{"name":"B"}}\n{"type":"page","data":{"title":"x","createdAt":"soon"}}\n', "Line 2"),
+    ]
+    for body, message in cases:
+        r = admin_client.post("/api/sites/import?slug=bad", data=body, content_type="application/x-ndjson")
+        assert r.status_code == 400
+        assert message in r.get_json()["error"]
+    assert [s["slug"] for s in admin_client.get("/api/sites").get_json()["sites"]] == ["demo"]
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import Page, Site, SitemapEntry, SitemapVersion
+from app.utils import sitemap
+
+
+def _page(client, site_id, title, status="published"):
+    r = client.post("/api/pages", json={"siteId": site_id, "title": title, "status": status})
+    assert r.status_code == 201, r.get_json()
+    return r.get_json()["page"]
+
+
+def _age(app, site_id):
+    # vremena se u SQLite-u čuvaju u sekundama; sve se pomera unazad da nova izmena bude kasnija
+    old = datetime(2020, 1, 1)
+    with app.app_context():
+        for model, column in ((Site, Site.id), (Page, Page.site_id), (SitemapEntry, SitemapEntry.site_id),
+                              (SitemapVersion, SitemapVersion.site_id)):
+            values = {"changed_at": old} if model is SitemapVersion else {"updated_at": old}
+            db.session.execute(update(model).where(column == site_id).values(values))
+        db.session.commit()
+
+
+def test_sitemap_lists_published_items(admin_client, client, site):
+    _page(admin_client, site["id"], "About")
+    _page(admin_client, site["id"], "Draft", status="draft")
+    body = client.get(f"/api/sites/{site['id']}/sitemap").get_json()
+    assert [e["slug"] for e in body["entries"]] == ["about"]
+    assert body["total"] == 1
+
+    xml = client.get(f"/api/sites/{site['id']}/sitemap.xml").get_data(as_text=True)
+    assert "/demo/pages/about</loc>" in xml and "draft" not in xml
+
+
+@pytest.mark.parametrize("path", ["/api/sites/{site}/sitemap", "/api/sites/{site}/sitemap.xml"])
+def test_unpublishing_older_item_moves_last_modified(app, admin_client, client, site, path):
+    older = _page(admin_client, site["id"], "Older")
+    _page(admin_client, site["id"], "Newer")
+    _age(app, site["id"])
+    with app.app_context():
+        # Newer ostaje najnoviji unos, pa max(updated_at) ne bi primetio uklanjanje
+        db.session.execute(update(SitemapEntry).where(SitemapEntry.slug == "newer").values(updated_at=datetime(2021, 1, 1)))
+        db.session.commit()
+
+    url = path.format(site=site["id"])
+    first = client.get(url)
+    last_modified = first.headers["Last-Modified"]
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    assert admin_client.put(f"/api/pages/{older['id']}", json={"status": "draft"}).status_code == 200
+
+    again = client.get(url, headers={"If-Modified-Since": last_modified})
+    assert again.status_code == 200
+    assert "older" not in again.get_data(as_text=True)
+    assert again.headers["Last-Modified"] != last_modified
+    assert again.headers["ETag"] != first.headers["ETag"]
+
+
+def test_title_edit_changes_etag(app, admin_client, client, site):
+    page = _page(admin_client, site["id"], "About")
+    _age(app, site["id"])
+    url = f"/api/sites/{site['id']}/sitemap"
+    etag = client.get(url).headers["ETag"]
+
+    assert admin_client.put(f"/api/pages/{page['id']}", json={"title": "About us"}).status_code == 200
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.get_json()["entries"][0]["title"] == "About us"
+
+
+def test_draft_edits_keep_version(app, admin_client, client, site):
+    _page(admin_client, site["id"], "About")
+    draft = _page(admin_client, site["id"], "Draft", status="draft")
+    _age(app, site["id"])
+    url = f"/api/sites/{site['id']}/sitemap"
+    etag = client.get(url).headers["ETag"]
+
+    assert admin_client.put(f"/api/pages/{draft['id']}", json={"title": "Still a draft"}).status_code == 200
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_rebuild_and_site_removal_maintain_versions(app, admin_client, site):
+    _page(admin_client, site["id"], "About")
+    with app.app_context():
+        db.session.execute(update(SitemapVersion).values(changed_at=datetime(2020, 1, 1)))
+        db.session.execute(SitemapEntry.__table__.delete())
+        db.session.commit()
+        sitemap.rebuild()
+        assert sitemap.version(site["id"])[0] == 1
+        assert db.session.get(SitemapVersion, site["id"]).changed_at > datetime(2020, 1, 1)
+
+    assert admin_client.delete(f"/api/sites/{site['id']}").status_code in (200, 204)
+    with app.app_context():
+        assert db.session.get(SitemapVersion, site["id"]) is None
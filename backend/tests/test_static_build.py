@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+
+from app.extensions import db
+from app.models import Page
+
+
+def _build(app, out_dir, *extra):
+    r = app.test_cli_runner().invoke(args=["cms", "build-site", "demo", "--out", str(out_dir), "--workers", "1", *extra])
+    assert r.exit_code == 0, r.output
+    return r.output
+
+
+def _age(app, model, row_id):
+    # vremena se u SQLite-u čuvaju u sekundama, pa se pomeraju unazad da izmena promeni verziju
+    with app.app_context():
+        db.session.get(model, row_id).updated_at = datetime(2020, 1, 1)
+        db.session.commit()
+
+
+def test_rebuild_renders_only_changed_items(app, admin_client, site, tmp_path):
+    out = tmp_path / "out"
+    ids = [
+        admin_client.post("/api/pages", json={"siteId": site["id"], "title": t, "status": "published"}).get_json()["page"]["id"]
+        for t in ("One", "Two")
+    ]
+    admin_client.post("/api/pages", json={"siteId": site["id"], "title": "Draft"})
+    _age(app, Page, ids[0])
+
+    assert "2 items, 2 rendered" in _build(app, out)
+    assert (out / "pages/one/index.html").read_text().count("One") >= 1
+    assert not (out / "pages/draft").exists()
+    assert "0 rendered (0 written), 2 unchanged" in _build(app, out)
+
+    admin_client.put(f"/api/pages/{ids[0]}", json={"title": "One again"})
+    assert "1 rendered (1 written), 1 unchanged" in _build(app, out)
+    assert "One again" in (out / "pages/one/index.html").read_text()
+
+    manifest = json.loads((out / "manifest.json").read_text())
+    assert set(manifest["items"]) == {f"page:{i}" for i in ids}
+
+
+def test_site_change_rerenders_and_removed_items_are_deleted(app, admin_client, site, tmp_path):
+    out = tmp_path / "out"
+    ids = [
+        admin_client.post("/api/pages", json={"siteId": site["id"], "title": t, "status": "published"}).get_json()["page"]["id"]
+        for t in ("One", "Two")
+    ]
+    _build(app, out)
+
+    admin_client.put(f"/api/sites/{site['id']}", json={"name": "Renamed"})
+    admin_client.delete(f"/api/pages/{ids[1]}")
+
+    output = _build(app, out)
+    assert "1 items, 1 rendered" in output and "1 removed" in output
+    assert "Renamed" in (out / "pages/one/index.html").read_text()
+    assert not (out / "pages/two").exists()
@@ -0,0 +1,29 @@
+from app.utils import stats
+from tests.conftest import text_block
+
+
+def _overview(client):
+    return client.get("/api/admin/overview").get_json()
+
+
+def test_incremental_counters_match_rebuild(app, admin_client):
+    with app.app_context():
+        stats.rebuild()
+
+    site = admin_client.post("/api/sites", json={"name": "Demo", "slug": "demo"}).get_json()["site"]
+    other = admin_client.post("/api/sites", json={"name": "Other", "slug": "other"}).get_json()["site"]
+    for i, status in enumerate(["draft", "published", "published"]):
+        admin_client.post("/api/pages", json={"siteId": site["id"], "title": f"P{i}", "status": status})
+    post = admin_client.post("/api/posts", json={"siteId": site["id"], "title": "Post", "content": text_block("x")})
+    admin_client.put(f"/api/posts/{post.get_json()['post']['id']}", json={"status": "published"})
+    admin_client.post("/api/posts", json={"siteId": other["id"], "title": "Gone"})
+    admin_client.delete(f"/api/sites/{other['id']}")
+    admin_client.put("/api/admin/users/2/role", json={"role": "admin"})
+
+    incremental = _overview(admin_client)
+    with app.app_context():
+        stats.rebuild()
+    rebuilt = _overview(admin_client)
+
+    assert incremental == rebuilt
+    assert rebuilt["totals"] == {"users": 2, "sites": 1, "pages": 3, "posts": 1}
@@ -0,0 +1,28 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db, user_cache
+from app.models import User, UserRole
+from app.utils.cache import FileBackend
+from tests.conftest import ADMIN, login
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_role_change_invalidates_user_cache(make_app, workers):
+    app = make_app(GUNICORN_WORKERS=workers)
+    with app.app_context():
+        db.session.add(User(name="b", email="b@example.com", password=generate_password_hash("b"), role=UserRole.ADMIN))
+        db.session.commit()
+    admin = login(app.test_client(), ADMIN)
+    other = login(app.test_client(), ("b@example.com", "b"))
+
+    assert other.get("/api/admin/users").status_code == 200
+    assert user_cache.backend.get(3) is not None
+
+    assert admin.put("/api/admin/users/3/role", json={"role": "user"}).status_code == 200
+
+    assert user_cache.backend.get(3) is None
+    if workers > 1:
+        # drugi worker vidi isti direktorijum keša
+        assert FileBackend.from_config(app.config, "USER_CACHE_").get(3) is None
+    assert other.get("/api/admin/users").status_code == 403
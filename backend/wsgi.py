@@ -0,0 +1,8 @@
+from dotenv import load_dotenv
+
+from app import create_app
+
+load_dotenv()
+
+# ulazna tačka za gunicorn (gunicorn -c gunicorn.conf.py wsgi:app); app.py ostaje za lokalni razvoj
+app = create_app()
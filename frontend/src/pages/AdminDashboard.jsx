@@ -27,11 +27,14 @@ function StatCard({ label, value }) {
 export default function AdminDashboard() {
   const overview = useAdminStore((s) => s.overview);
   const users = useAdminStore((s) => s.users);
+  const usersCursor = useAdminStore((s) => s.usersCursor);
+  const usersEstimatedTotal = useAdminStore((s) => s.usersEstimatedTotal);
   const loading = useAdminStore((s) => s.loading);
   const error = useAdminStore((s) => s.error);
 
   const fetchOverview = useAdminStore((s) => s.fetchOverview);
   const fetchUsers = useAdminStore((s) => s.fetchUsers);
+  const fetchMoreUsers = useAdminStore((s) => s.fetchMoreUsers);
   const setUserRole = useAdminStore((s) => s.setUserRole);
   const clearError = useAdminStore((s) => s.clearError);
 
@@ -45,6 +48,22 @@ export default function AdminDashboard() {
     fetchUsers({ sort: 'createdAt_desc' });
   }, [fetchOverview, fetchUsers, clearError]);
 
+  // typeahead: prefix pretraga posle kratke pauze u kucanju
+  useEffect(() => {
+    const term = q.trim();
+    if (!term) return undefined;
+
+    const t = setTimeout(() => {
+      fetchUsers({
+        q: term,
+        role: roleFilter || undefined,
+        sort,
+        mode: 'prefix',
+      }).catch(() => {});
+    }, 250);
+    return () => clearTimeout(t);
+  }, [q, roleFilter, sort, fetchUsers]);
+
   const totals = overview?.totals || { users: 0, sites: 0, pages: 0, posts: 0 };
   const usersByRole = overview?.usersByRole || [];
   const pagesByStatus = overview?.pagesByStatus || [];
@@ -207,6 +226,9 @@ export default function AdminDashboard() {
               <div className='text-sm font-medium'>Users</div>
               <div className='text-xs text-gray-500'>
                 Change user roles (admin/user)
+                {usersEstimatedTotal != null
+                  ? ` · ~${usersEstimatedTotal} matching`
+                  : ''}
               </div>
             </div>
 
@@ -310,6 +332,19 @@ export default function AdminDashboard() {
               </tbody>
             </table>
           )}
+
+          {usersCursor && (
+            <div className='mt-3 flex justify-center'>
+              <button
+                type='button'
+                onClick={() => fetchMoreUsers()}
+                disabled={loading}
+                className='px-4 py-2 rounded border hover:bg-gray-50 text-sm disabled:opacity-50'
+              >
+                Load more
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </div>
@@ -3,7 +3,6 @@ import { Link, useParams } from 'react-router-dom';
 
 import { useSitesStore } from '../stores/useSitesStore';
 import { usePagesStore } from '../stores/usePagesStore';
-import { useTemplatesStore } from '../stores/useTemplatesStore';
 import { useAuthStore } from '../stores/useAuthStore';
 
 import BlockRenderer from '../components/builder/BlockRenderer';
@@ -27,15 +26,9 @@ export default function PagePreview() {
   const clearPageError = usePagesStore((s) => s.clearError);
   const fetchPageBySlug = usePagesStore((s) => s.fetchPageBySlug);
 
-  // templates
-  const templates = useTemplatesStore((s) => s.templates);
-  const templatesLoading = useTemplatesStore((s) => s.loading);
-  const fetchTemplates = useTemplatesStore((s) => s.fetchTemplates);
-
   useEffect(() => {
     if (!sites.length) fetchSites();
-    if (!templates.length) fetchTemplates();
-  }, [sites.length, fetchSites, templates.length, fetchTemplates]);
+  }, [sites.length, fetchSites]);
 
   const site = useMemo(
     () => sites.find((x) => x.slug === siteSlug),
@@ -46,20 +39,17 @@ export default function PagePreview() {
   useEffect(() => {
     if (!site?.id) return;
     clearPageError?.();
-    fetchPageBySlug({ siteId: site.id, slug });
+    // šablon i autor dolaze uz page (expand), bez učitavanja svih šablona
+    fetchPageBySlug({ siteId: site.id, slug, expand: 'template,author' });
   }, [site?.id, slug, fetchPageBySlug, clearPageError]);
 
-  const template = useMemo(() => {
-    if (!currentPage?.templateId) return null;
-    return templates.find((t) => t.id === currentPage.templateId) || null;
-  }, [templates, currentPage?.templateId]);
+  const template = currentPage?.template || null;
 
   const layout = template?.config?.layout || {};
   const blocks = currentPage?.content?.blocks || [];
 
   const isLoading =
     (sitesLoading && !site) ||
-    (templatesLoading && !templates.length) ||
     (pagesLoading && (!currentPage || currentPage.slug !== slug));
 
   if (isLoading) return <div className='text-sm text-gray-500'>Loading...</div>;
@@ -3,7 +3,6 @@ import { Link, useParams } from 'react-router-dom';
 
 import { useSitesStore } from '../stores/useSitesStore';
 import { usePostsStore } from '../stores/usePostsStore';
-import { useTemplatesStore } from '../stores/useTemplatesStore';
 import { useAuthStore } from '../stores/useAuthStore';
 
 import BlockRenderer from '../components/builder/BlockRenderer';
@@ -27,15 +26,9 @@ export default function PostPreview() {
   const clearPostError = usePostsStore((s) => s.clearError);
   const fetchPostBySlug = usePostsStore((s) => s.fetchPostBySlug);
 
-  // templates
-  const templates = useTemplatesStore((s) => s.templates);
-  const templatesLoading = useTemplatesStore((s) => s.loading);
-  const fetchTemplates = useTemplatesStore((s) => s.fetchTemplates);
-
   useEffect(() => {
     if (!sites.length) fetchSites();
-    if (!templates.length) fetchTemplates();
-  }, [sites.length, fetchSites, templates.length, fetchTemplates]);
+  }, [sites.length, fetchSites]);
 
   const site = useMemo(
     () => sites.find((x) => x.slug === siteSlug),
@@ -46,20 +39,17 @@ export default function PostPreview() {
   useEffect(() => {
     if (!site?.id) return;
     clearPostError?.();
-    fetchPostBySlug({ siteId: site.id, slug });
+    // šablon i autor dolaze uz post (expand), bez učitavanja svih šablona
+    fetchPostBySlug({ siteId: site.id, slug, expand: 'template,author' });
   }, [site?.id, slug, fetchPostBySlug, clearPostError]);
 
-  const template = useMemo(() => {
-    if (!currentPost?.templateId) return null;
-    return templates.find((t) => t.id === currentPost.templateId) || null;
-  }, [templates, currentPost?.templateId]);
+  const template = currentPost?.template || null;
 
   const layout = template?.config?.layout || {};
   const blocks = currentPost?.content?.blocks || [];
 
   const isLoading =
     (sitesLoading && !site) ||
-    (templatesLoading && !templates.length) ||
     (postsLoading && (!currentPost || currentPost.slug !== slug));
 
   if (isLoading) return <div className='text-sm text-gray-500'>Loading...</div>;
@@ -141,7 +131,7 @@ export default function PostPreview() {
         </h1>
 
         <div className={layout.meta || 'text-sm text-gray-500 mb-6'}>
-          <span>Author ID: {currentPost.authorId}</span>
+          <span>Author: {currentPost.author?.name || `#${currentPost.authorId}`}</span>
           <span className='mx-2'>•</span>
           <span>Status: {currentPost.status}</span>
         </div>
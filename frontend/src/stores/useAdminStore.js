@@ -1,9 +1,17 @@
 import { create } from 'zustand';
 import { api } from '../lib/api';
 
+const USERS_PAGE_SIZE = 50;
+
+// redni broj poslednjeg zahteva za korisnike; stariji odgovori (typeahead) se odbacuju
+let usersRequestSeq = 0;
+
 export const useAdminStore = create((set, get) => ({
   overview: null,
   users: [],
+  usersQuery: {},
+  usersCursor: null,
+  usersEstimatedTotal: null,
 
   loading: false,
   error: null,
@@ -41,22 +49,42 @@ export const useAdminStore = create((set, get) => ({
     }
   },
 
-  fetchUsers: async ({ q, role, sort } = {}) => {
+  fetchUsers: async ({ q, role, sort, mode } = {}, { append = false } = {}) => {
+    const seq = ++usersRequestSeq;
+    const query = append ? get().usersQuery : { q, role, sort, mode };
+
     set({ loading: true, error: null });
     try {
       const params = new URLSearchParams();
-      if (q) params.set('q', q);
-      if (role) params.set('role', role);
-      if (sort) params.set('sort', sort);
+      if (query.q) params.set('q', query.q);
+      if (query.role) params.set('role', query.role);
+      if (query.sort) params.set('sort', query.sort);
+      if (query.mode) params.set('mode', query.mode);
+      params.set('limit', String(USERS_PAGE_SIZE));
+      if (append && get().usersCursor) params.set('cursor', get().usersCursor);
 
-      const qs = params.toString() ? `?${params.toString()}` : '';
-      const data = await api.get(`/api/admin/users${qs}`);
+      const data = await api.get(`/api/admin/users?${params.toString()}`);
+      if (seq !== usersRequestSeq) return get().users;
 
-      set({ users: data.users || [], loading: false });
-      return data.users || [];
+      const page = data.users || [];
+      set((s) => ({
+        users: append ? [...s.users, ...page] : page,
+        usersQuery: query,
+        usersCursor: data.nextCursor || null,
+        usersEstimatedTotal: append
+          ? s.usersEstimatedTotal
+          : (data.estimatedTotal ?? null),
+        loading: false,
+      }));
+      return get().users;
     } catch (e) {
-      set({ loading: false, error: e.message });
+      if (seq === usersRequestSeq) set({ loading: false, error: e.message });
       throw e;
     }
   },
+
+  fetchMoreUsers: async () => {
+    if (!get().usersCursor) return get().users;
+    return get().fetchUsers({}, { append: true });
+  },
 }));
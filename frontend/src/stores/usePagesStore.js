@@ -34,10 +34,12 @@ export const usePagesStore = create((set) => ({
     }
   },
 
-  fetchPageBySlug: async ({ siteId, slug }) => {
+  // expand: npr. 'template,author' -> šablon i autor stižu u istom odgovoru
+  fetchPageBySlug: async ({ siteId, slug, expand }) => {
     set({ loading: true, error: null });
     try {
-      const data = await api.get(`/api/pages/site/${siteId}/${slug}`);
+      const qs = expand ? `?expand=${encodeURIComponent(expand)}` : '';
+      const data = await api.get(`/api/pages/site/${siteId}/${slug}${qs}`);
       set({ current: data.page, loading: false });
       return data.page;
     } catch (e) {
@@ -39,10 +39,12 @@ export const usePostsStore = create((set) => ({
     }
   },
 
-  fetchPostBySlug: async ({ siteId, slug }) => {
+  // expand: npr. 'template,author' -> šablon i autor stižu u istom odgovoru
+  fetchPostBySlug: async ({ siteId, slug, expand }) => {
     set({ loading: true, error: null });
     try {
-      const data = await api.get(`/api/posts/site/${siteId}/${slug}`);
+      const qs = expand ? `?expand=${encodeURIComponent(expand)}` : '';
+      const data = await api.get(`/api/posts/site/${siteId}/${slug}${qs}`);
       set({ current: data.post, loading: false });
       return data.post;
     } catch (e) {